@@ -0,0 +1,109 @@
+"""Measures the time a whole build spends outside of Unity.
+
+Runs `BuildProcess` on a generated project with the fake Unity editor, and times
+each of its steps; the overhead is what is left of the build once the time the
+fake editor takes on its own is taken away.
+
+    python benchmarks/end_to_end.py [--files N] [--lines N] [--build-mb N]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from harness import (
+    FAKE_UNITY_PATH,
+    PROJECT_NAME,
+    benchmark_config,
+    fake_unity,
+    temporary_project,
+)
+
+from parallel_build.build_step import BuildStep
+from parallel_build.config import ProjectPostBuildAction, SnapshotMode
+from parallel_build.main import BuildProcess
+
+
+def time_editor(project_path: Path):
+    start_time = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            str(FAKE_UNITY_PATH),
+            "-projectpath",
+            str(project_path),
+            "-buildpath",
+            "Build/WebGL",
+        ],
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+    return time.perf_counter() - start_time
+
+
+def time_build(config):
+    steps: list[tuple[str, float]] = []
+    results = []
+
+    def on_start(name: str):
+        steps.append((name, time.perf_counter()))
+
+    BuildStep.start.set(on_start)
+    build_process = BuildProcess(
+        project_name=PROJECT_NAME,
+        on_build_end=results.append,
+        config=config,
+    )
+    start_time = time.perf_counter()
+    build_process.run(continuous=False)
+    end_time = time.perf_counter()
+    BuildStep.start.clear()
+    if results != [True]:
+        raise SystemExit("The build failed")
+
+    durations = {}
+    for (name, step_start), (_, step_end) in zip(steps, steps[1:] + [("", end_time)]):
+        durations[name] = durations.get(name, 0) + step_end - step_start
+    return end_time - start_time, durations
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    argument_parser.add_argument("--files", type=int, default=2000)
+    argument_parser.add_argument("--lines", type=int, default=20000)
+    argument_parser.add_argument("--build-mb", type=float, default=50)
+    argument_parser.add_argument(
+        "--snapshot", choices=[mode.value for mode in SnapshotMode], default="copy"
+    )
+    arguments = argument_parser.parse_args()
+
+    with temporary_project(
+        files=arguments.files
+    ) as project_path, tempfile.TemporaryDirectory() as target_dir, fake_unity(
+        lines=arguments.lines, build_mb=arguments.build_mb
+    ):
+        config = benchmark_config(
+            project_path,
+            snapshot=SnapshotMode(arguments.snapshot),
+            post_build=[
+                ProjectPostBuildAction(
+                    action="copy", params={"target": str(Path(target_dir) / "Build")}
+                )
+            ],
+        )
+        editor_elapsed = time_editor(project_path)
+        total, durations = time_build(config)
+
+    print(f"{'step':<24} {'seconds':>9}")
+    for name, duration in durations.items():
+        print(f"{name:<24} {duration:>9.3f}")
+    print(f"{'total':<24} {total:>9.3f}")
+    print(f"{'fake editor alone':<24} {editor_elapsed:>9.3f}")
+    print(f"{'overhead':<24} {total - editor_elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
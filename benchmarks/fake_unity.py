@@ -0,0 +1,146 @@
+"""A stand-in for the Unity editor in batchmode, to run builds without Unity.
+
+It accepts the arguments `UnityBuilder` passes to Unity, writes a build log to
+stdout and creates a build in the build path, like the real editor would. Point
+`PARALLEL_BUILD_UNITY_EDITOR` to it to use it instead of Unity:
+
+    export PARALLEL_BUILD_UNITY_EDITOR="python benchmarks/fake_unity.py"
+    parallelbuild build PROJECT_NAME
+
+The build is configured with environment variables:
+- `FAKE_UNITY_LOG`: a recorded log to replay, instead of a synthetic one;
+- `FAKE_UNITY_LINES`: the lines of the synthetic log (default 20000);
+- `FAKE_UNITY_RATE`: the lines written per second, 0 for as fast as possible
+  (default 0);
+- `FAKE_UNITY_EXIT_CODE`: the exit code, 0 for a successful build (default 0);
+- `FAKE_UNITY_BUILD_MB`: the size of the build, in megabytes (default 10).
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# (share of the lines, template) of each phase of a WebGL build, in order
+PHASES = [
+    (0.02, "[Package Manager] Registered {n} packages"),
+    (0.30, "Start importing Assets/Textures/texture_{n}.png using Guid(a1b2c3)"),
+    (0.05, "[ScriptCompilation] Compiling C# Assets/Scripts/Script{n}.cs"),
+    (0.25, 'Compiling shader "Universal Render Pipeline/Lit" pass "ForwardLit" ({n})'),
+    (0.25, "[{n}/{total}] Compiling WebAssembly (il2cpp) 0.{n}s"),
+    (0.08, "[BUSY    {n}s] Link_WebGL_wasm artifacts/WebGL/build/wasm.js"),
+    (0.05, "Brotli compressing Build/WebGL.data ({n})"),
+]
+NOISE = [
+    "UnityEngine.Debug:Log (object) at Assets/Scripts/Player.cs:{n}",
+    "Refreshing native plugins compatible for Editor in {n}.00 ms",
+    "",
+]
+SUCCESS_LINES = ["Build succeeded", "Exiting batchmode successfully now!"]
+FAILURE_LINES = [
+    "Assets/Scripts/Enemy.cs(12,3): error CS0103: The name 'x' does not exist",
+    "Aborting batchmode due to failure:",
+    "Build failed",
+]
+
+
+def parse_arguments(arguments: list[str]):
+    """Returns the Unity arguments, e.g. `-projectpath p` as `{"projectpath": "p"}`."""
+    options = {}
+    name = None
+    for argument in arguments:
+        if argument.startswith("-") and argument != "-":
+            name = argument[1:]
+            options[name] = None
+        elif name is not None:
+            options[name] = argument
+            name = None
+    return options
+
+
+def generate_log(line_count: int, success: bool, seed: int = 0):
+    random_generator = random.Random(seed)
+    for share, template in PHASES:
+        phase_lines = max(1, int(line_count * share))
+        for i in range(phase_lines):
+            if random_generator.random() < 0.2:
+                noise = random_generator.choice(NOISE)
+                yield noise.format(n=random_generator.randint(1, 5000))
+            else:
+                yield template.format(n=i + 1, total=phase_lines)
+    yield from SUCCESS_LINES if success else FAILURE_LINES
+
+
+def replay_log(log_path: Path, success: bool):
+    with open(log_path, encoding="utf-8", errors="replace") as file:
+        for line in file:
+            yield line.rstrip("\n")
+    yield from SUCCESS_LINES if success else FAILURE_LINES
+
+
+def write_log(lines, rate: float):
+    output = sys.stdout
+    start_time = time.perf_counter()
+    for count, line in enumerate(lines, start=1):
+        output.write(line + "\n")
+        if rate and count % max(1, int(rate / 100)) == 0:
+            # written in small bursts, as Unity does
+            output.flush()
+            delay = start_time + count / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    output.flush()
+
+
+def write_file(path: Path, size: int):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as file:
+        while size > 0:
+            chunk = os.urandom(min(size, 1024 * 1024))
+            file.write(chunk)
+            size -= len(chunk)
+
+
+def create_build(options: dict, project_path: Path, size: int):
+    """Creates a build with the files of the real one, and random content."""
+    for option in ("buildWindowsPlayer", "buildWindows64Player"):
+        if player_path := options.get(option):
+            player_path = project_path / player_path
+            write_file(player_path, 1024 * 1024)
+            write_file(player_path.parent / f"{player_path.stem}_Data" / "data", size)
+            return
+    for option in ("buildOSXUniversalPlayer", "buildLinux64Player"):
+        if player_path := options.get(option):
+            player_path = project_path / player_path
+            write_file(player_path / "Contents" / "data", size)
+            return
+    if build_path := options.get("buildpath"):
+        build_path = project_path / build_path
+        (build_path / "Build").mkdir(parents=True, exist_ok=True)
+        (build_path / "index.html").write_text("<html></html>\n")
+        write_file(build_path / "Build" / "WebGL.loader.js", 64 * 1024)
+        write_file(build_path / "Build" / "WebGL.wasm.br", size // 4)
+        write_file(build_path / "Build" / "WebGL.data.br", size - size // 4)
+
+
+def main():
+    options = parse_arguments(sys.argv[1:])
+    project_path = Path(options.get("projectpath") or ".")
+    exit_code = int(os.environ.get("FAKE_UNITY_EXIT_CODE", 0))
+    rate = float(os.environ.get("FAKE_UNITY_RATE", 0))
+    if log_path := os.environ.get("FAKE_UNITY_LOG"):
+        lines = replay_log(Path(log_path), success=exit_code == 0)
+    else:
+        line_count = int(os.environ.get("FAKE_UNITY_LINES", 20000))
+        lines = generate_log(line_count, success=exit_code == 0)
+
+    write_log(lines, rate)
+    if exit_code == 0:
+        build_size = int(float(os.environ.get("FAKE_UNITY_BUILD_MB", 10)) * 1024**2)
+        create_build(options, project_path, build_size)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Helpers shared by the benchmarks: fake Unity projects, the fake Unity editor and
+process statistics."""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from fake_unity import write_file
+
+from parallel_build.config import (
+    Config,
+    Project,
+    ProjectBuildConfig,
+    ProjectPostBuildAction,
+    ProjectSource,
+    ProjectSourceType,
+    SnapshotMode,
+)
+from parallel_build.trash import TEMP_DIR_PREFIX
+from parallel_build.unity_builder import EDITOR_PATH_VARIABLE
+
+FAKE_UNITY_PATH = Path(__file__).with_name("fake_unity.py")
+PROJECT_NAME = "parallel-build-benchmark"
+
+
+def fake_unity_command():
+    return f'"{sys.executable}" "{FAKE_UNITY_PATH}"'
+
+
+@contextmanager
+def fake_unity(
+    lines: int = 20000,
+    rate: float = 0,
+    exit_code: int = 0,
+    build_mb: float = 10,
+    log_path: Path | None = None,
+):
+    """Makes `UnityBuilder` run the fake Unity editor, with these settings."""
+    variables = {
+        EDITOR_PATH_VARIABLE: fake_unity_command(),
+        "FAKE_UNITY_LINES": str(lines),
+        "FAKE_UNITY_RATE": str(rate),
+        "FAKE_UNITY_EXIT_CODE": str(exit_code),
+        "FAKE_UNITY_BUILD_MB": str(build_mb),
+    }
+    if log_path:
+        variables["FAKE_UNITY_LOG"] = str(log_path)
+    previous_values = {name: os.environ.get(name) for name in variables}
+    os.environ.update(variables)
+    try:
+        yield
+    finally:
+        for name, value in previous_values.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def create_project(
+    project_path: Path,
+    files: int = 2000,
+    file_size: int = 16 * 1024,
+    large_files: int = 4,
+    large_file_size: int = 64 * 1024**2,
+):
+    """Creates a Unity project with many small assets and a few large ones, and a
+    `Library` folder that snapshots skip."""
+    settings_path = project_path / "ProjectSettings"
+    settings_path.mkdir(parents=True, exist_ok=True)
+    (settings_path / "ProjectVersion.txt").write_text("m_EditorVersion: 2022.3.10f1\n")
+    for i in range(files):
+        write_file(
+            project_path / "Assets" / f"Folder{i % 50}" / f"asset_{i}.asset",
+            file_size,
+        )
+    for i in range(large_files):
+        write_file(
+            project_path / "Assets" / "Large" / f"texture_{i}.psd", large_file_size
+        )
+    write_file(project_path / "Library" / "ArtifactDB", 1024 * 1024)
+    return project_path
+
+
+@contextmanager
+def temporary_project(**project_options):
+    with tempfile.TemporaryDirectory(prefix="parallel_build_benchmark_") as temp_dir:
+        yield create_project(Path(temp_dir) / "Project", **project_options)
+
+
+def benchmark_config(
+    project_path: Path,
+    snapshot: SnapshotMode = SnapshotMode.copy,
+    post_build: list[ProjectPostBuildAction] | None = None,
+    **config_options,
+):
+    return Config(
+        projects=[
+            Project(
+                name=PROJECT_NAME,
+                source=ProjectSource(
+                    type=ProjectSourceType.local,
+                    value=str(project_path),
+                    snapshot=snapshot,
+                ),
+                build=ProjectBuildConfig(path="Build/WebGL"),
+                post_build=post_build or [],
+            )
+        ],
+        **config_options,
+    )
+
+
+def get_rss():
+    """Returns the memory used by this process, in bytes, if known."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # the peak, in bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def get_open_files():
+    """Returns the number of files open by this process, if known."""
+    for fd_path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(fd_path))
+        except OSError:
+            pass
+    return None
+
+
+def get_temp_dirs():
+    """Returns the temporary directories of the builds left in the temp folder."""
+    return [
+        entry.path
+        for entry in os.scandir(tempfile.gettempdir())
+        if entry.is_dir() and entry.name.startswith(TEMP_DIR_PREFIX)
+    ]
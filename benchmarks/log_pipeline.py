@@ -0,0 +1,117 @@
+"""Measures how many log lines per second go through the build events and through
+`UnityBuilder`.
+
+First the `BuildStepEvent`s alone, with the kinds of subscribers the CLI and the
+GUI use; then whole Unity builds with the fake Unity editor writing the log as
+fast as it can, compared with reading the same log straight from the editor.
+
+    python benchmarks/log_pipeline.py [--lines N] [--repeat N]
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+from harness import FAKE_UNITY_PATH, fake_unity, temporary_project
+
+from parallel_build.build_step import BuildStep, BuildStepEvent, EventBatcher
+from parallel_build.config import BuildTarget
+from parallel_build.unity_builder import UnityBuilder
+
+
+def discard(value):
+    pass
+
+
+def benchmark_event(callbacks: list, lines: list[str], repeat: int):
+    event = BuildStepEvent(str)
+    event.set(*callbacks)
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for line in lines:
+            event.emit(line)
+        event.flush()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def benchmark_editor(project_path, lines: int, repeat: int):
+    """Reads the log of the fake editor without doing anything with it."""
+    best = float("inf")
+    with fake_unity(lines=lines, build_mb=0):
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            subprocess.run(
+                [sys.executable, str(FAKE_UNITY_PATH), "-projectpath", project_path],
+                stdout=subprocess.DEVNULL,
+                check=True,
+            )
+            best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def benchmark_builder(project_path, lines: int, repeat: int):
+    best = float("inf")
+    with fake_unity(lines=lines, build_mb=0), EventBatcher() as batcher:
+        BuildStep.long_message.set(batcher.batched(discard))
+        BuildStep.short_message.set(batcher.latest(discard))
+        for _ in range(repeat):
+            builder = UnityBuilder(
+                project_name="benchmark",
+                project_path=project_path,
+                build_target=BuildTarget.webgl,
+                build_method=None,
+                build_path="Build/WebGL",
+            )
+            start_time = time.perf_counter()
+            builder.run()
+            best = min(best, time.perf_counter() - start_time)
+        BuildStep.long_message.clear()
+        BuildStep.short_message.clear()
+    return best
+
+
+def print_row(name: str, lines: int, elapsed: float):
+    print(
+        f"{name:<36} {lines:>10,} {elapsed:>9.3f} "
+        f"{lines / max(elapsed, 1e-9):>12,.0f}"
+    )
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    argument_parser.add_argument("--lines", type=int, default=200_000)
+    argument_parser.add_argument("--repeat", type=int, default=3)
+    arguments = argument_parser.parse_args()
+
+    lines = [f"Log line {i}" for i in range(arguments.lines)]
+    batcher = EventBatcher()
+    print(f"{'pipeline':<36} {'lines':>10} {'seconds':>9} {'lines/s':>12}")
+    for name, callbacks in [
+        ("event, no subscribers", []),
+        ("event, one callback", [discard]),
+        ("event, batched", [batcher.batched(discard)]),
+        ("event, latest", [batcher.latest(discard)]),
+    ]:
+        elapsed = benchmark_event(callbacks, lines, arguments.repeat)
+        print_row(name, len(lines), elapsed)
+
+    with temporary_project(files=0, large_files=0) as project_path:
+        editor_elapsed = benchmark_editor(
+            project_path, arguments.lines, arguments.repeat
+        )
+        print_row("fake editor alone", arguments.lines, editor_elapsed)
+        builder_elapsed = benchmark_builder(
+            project_path, arguments.lines, arguments.repeat
+        )
+        print_row("UnityBuilder with fake editor", arguments.lines, builder_elapsed)
+    print(
+        f"UnityBuilder overhead: {builder_elapsed - editor_elapsed:.3f} seconds, "
+        f"{(builder_elapsed - editor_elapsed) / arguments.lines * 1e6:.2f} µs/line"
+    )
+
+
+if __name__ == "__main__":
+    main()
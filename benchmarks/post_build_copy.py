@@ -0,0 +1,75 @@
+"""Measures how fast builds are copied by the `copy` post build action.
+
+Copies a build made by the fake Unity editor with `CopyBuild`, in plain and sync
+mode: the first sync copies the whole build, the following ones only what
+changed, here nothing.
+
+    python benchmarks/post_build_copy.py [--build-mb N] [--repeat N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from harness import fake_unity, temporary_project
+
+from parallel_build.config import BuildTarget
+from parallel_build.copier import format_size
+from parallel_build.post_build import CopyBuild
+from parallel_build.unity_builder import UnityBuilder
+from parallel_build.utils import get_directory_size
+
+
+def benchmark(build_path: Path, target_path: Path, sync: bool, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        copy_build = CopyBuild(build_path, str(target_path), sync=sync)
+        start_time = time.perf_counter()
+        copy_build.run()
+        timings.append(time.perf_counter() - start_time)
+    return timings
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    argument_parser.add_argument("--build-mb", type=float, default=200)
+    argument_parser.add_argument("--repeat", type=int, default=3)
+    arguments = argument_parser.parse_args()
+
+    with temporary_project(files=0, large_files=0) as project_path, fake_unity(
+        lines=100, build_mb=arguments.build_mb
+    ):
+        builder = UnityBuilder(
+            project_name="benchmark",
+            project_path=project_path,
+            build_target=BuildTarget.webgl,
+            build_method=None,
+            build_path="Build/WebGL",
+        )
+        builder.run()
+        size = get_directory_size(builder.build_path)
+        print(f"Build: {format_size(size)}")
+        print(f"{'mode':<16} {'seconds':>9} {'throughput':>12}")
+        for sync in (False, True):
+            with tempfile.TemporaryDirectory() as target_dir:
+                timings = benchmark(
+                    builder.build_path,
+                    Path(target_dir) / "Build",
+                    sync,
+                    arguments.repeat,
+                )
+            rows = (
+                [("sync, first", timings[0]), ("sync, unchanged", min(timings[1:]))]
+                if sync and len(timings) > 1
+                else [("sync" if sync else "copy", min(timings))]
+            )
+            for name, elapsed in rows:
+                print(
+                    f"{name:<16} {elapsed:>9.3f} "
+                    f"{format_size(size / max(elapsed, 1e-9)) + '/s':>12}"
+                )
+
+
+if __name__ == "__main__":
+    main()
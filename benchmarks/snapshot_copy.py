@@ -0,0 +1,56 @@
+"""Measures how fast the project snapshots of local sources are taken.
+
+Takes snapshots of a generated Unity project with `LocalSource`, the way every
+build does, in each snapshot mode.
+
+    python benchmarks/snapshot_copy.py [--repeat N] [--files N] [--large-files N]
+"""
+
+import argparse
+import time
+
+from harness import temporary_project
+
+from parallel_build.config import SnapshotMode
+from parallel_build.copier import format_size
+from parallel_build.source import LocalSource
+from parallel_build.utils import get_directory_size
+
+
+def benchmark(project_path, snapshot_mode: SnapshotMode, repeat: int):
+    best = float("inf")
+    with LocalSource(
+        "benchmark", str(project_path), snapshot_mode=snapshot_mode
+    ) as source:
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            with source.temporary_project():
+                best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    argument_parser.add_argument("--repeat", type=int, default=3)
+    argument_parser.add_argument("--files", type=int, default=5000)
+    argument_parser.add_argument("--large-files", type=int, default=4)
+    arguments = argument_parser.parse_args()
+
+    with temporary_project(
+        files=arguments.files, large_files=arguments.large_files
+    ) as project_path:
+        size = get_directory_size(project_path / "Assets")
+        files = arguments.files + arguments.large_files
+        print(f"Project: {files:,} files, {format_size(size)}")
+        print(f"{'mode':<8} {'seconds':>9} {'throughput':>12} {'files/s':>10}")
+        for snapshot_mode in SnapshotMode:
+            elapsed = benchmark(project_path, snapshot_mode, arguments.repeat)
+            print(
+                f"{snapshot_mode.value:<8} {elapsed:>9.3f} "
+                f"{format_size(size / max(elapsed, 1e-9)) + '/s':>12} "
+                f"{files / max(elapsed, 1e-9):>10,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Runs continuous builds for a long time, to find what grows from a build to the
+next.
+
+Builds a generated project in continuous mode with the fake Unity editor, and
+samples the memory used by the process, its open files and the temporary
+directories left on disk, printing how much they grew since the first build.
+
+    python benchmarks/soak.py [--duration SECONDS] [--builds N] [--interval SECONDS]
+"""
+
+import argparse
+import threading
+import time
+
+from harness import (
+    PROJECT_NAME,
+    benchmark_config,
+    fake_unity,
+    get_open_files,
+    get_rss,
+    get_temp_dirs,
+    temporary_project,
+)
+
+from parallel_build.build_step import BuildStep
+from parallel_build.config import SnapshotMode
+from parallel_build.copier import format_size
+from parallel_build.main import BuildProcess
+
+
+def format_optional_size(size: int | None):
+    return format_size(size) if size is not None else "n/a"
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    argument_parser.add_argument("--duration", type=float, default=600)
+    argument_parser.add_argument("--builds", type=int, help="Stop after N builds")
+    argument_parser.add_argument("--interval", type=float, default=10)
+    argument_parser.add_argument("--files", type=int, default=500)
+    argument_parser.add_argument("--lines", type=int, default=20000)
+    argument_parser.add_argument("--rate", type=float, default=0)
+    argument_parser.add_argument(
+        "--snapshot", choices=[mode.value for mode in SnapshotMode], default="copy"
+    )
+    arguments = argument_parser.parse_args()
+
+    finished_builds = []
+
+    def on_end(name: str):
+        if name.startswith("Build #"):
+            finished_builds.append(name)
+
+    BuildStep.end.set(on_end)
+    BuildStep.error.set(print)
+
+    with temporary_project(
+        files=arguments.files, large_files=1
+    ) as project_path, fake_unity(
+        lines=arguments.lines, rate=arguments.rate, build_mb=5
+    ):
+        build_process = BuildProcess(
+            project_name=PROJECT_NAME,
+            config=benchmark_config(
+                project_path, snapshot=SnapshotMode(arguments.snapshot)
+            ),
+        )
+        build_thread = threading.Thread(
+            target=build_process.run, args=(True,), daemon=True
+        )
+        build_thread.start()
+
+        print(f"{'seconds':>8} {'builds':>7} {'rss':>12} {'files':>6} {'temp dirs':>9}")
+        start_time = time.monotonic()
+        baseline = None
+        sample = None
+        while build_thread.is_alive():
+            time.sleep(arguments.interval)
+            sample = (
+                len(finished_builds),
+                get_rss(),
+                get_open_files(),
+                len(get_temp_dirs()),
+            )
+            builds, rss, open_files, temp_dirs = sample
+            print(
+                f"{time.monotonic() - start_time:>8.0f} {builds:>7} "
+                f"{format_optional_size(rss):>12} {open_files or 'n/a':>6} "
+                f"{temp_dirs:>9}"
+            )
+            if baseline is None and builds > 0:
+                baseline = sample
+            if time.monotonic() - start_time >= arguments.duration or (
+                arguments.builds and builds >= arguments.builds
+            ):
+                break
+        build_process.stop()
+        build_thread.join()
+
+    BuildStep.end.clear()
+    BuildStep.error.clear()
+    if baseline is None or sample is None or sample[0] == baseline[0]:
+        print("Not enough builds to compare")
+        return
+    builds = sample[0] - baseline[0]
+    if baseline[1] is not None and sample[1] is not None:
+        print(
+            f"Memory growth: {format_size(max(0, sample[1] - baseline[1]))} "
+            f"in {builds} builds"
+        )
+    if baseline[2] is not None and sample[2] is not None:
+        print(f"Open files growth: {sample[2] - baseline[2]} in {builds} builds")
+    print(f"Temporary directories growth: {sample[3] - baseline[3]} in {builds} builds")
+    print(f"Temporary directories left after stopping: {len(get_temp_dirs())}")
+
+
+if __name__ == "__main__":
+    main()
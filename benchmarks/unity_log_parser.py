@@ -0,0 +1,86 @@
+"""Measures how many Unity log lines per second the build log parser handles.
+
+Replays Unity logs through `UnityLogParser`, the same way `UnityBuilder.run` does.
+Recorded logs (e.g. saved with `-logFile`) can be passed as arguments; without
+arguments, synthetic logs of several sizes are generated, mixing the kinds of lines
+of a real WebGL build.
+
+    python benchmarks/unity_log_parser.py [--repeat N] [LOG_FILE ...]
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from parallel_build.unity_log import UnityLogParser
+
+SYNTHETIC_SIZES = [10_000, 100_000, 1_000_000]
+
+LINE_TEMPLATES = [
+    (60, "Refreshing native plugins compatible for Editor in {n:.2f} ms"),
+    (60, "UnityEngine.Debug:Log (object) at Assets/Scripts/Player.cs:{n}"),
+    (40, 'Compiling shader "Universal Render Pipeline/Lit" pass "ForwardLit" ({n})'),
+    (20, "Start importing Assets/Textures/texture_{n}.png using Guid(a1b2c3)"),
+    (15, "DisplayProgressbar: Building Player - Compiling shader variants {n}"),
+    (15, "[{n}/5000] Compiling WebAssembly (il2cpp) 0.{n}s"),
+    (5, "[BUSY    {n}s] Link_WebGL_wasm artifacts/WebGL/build/wasm.js"),
+    (10, ""),
+    (1, "Assets/Scripts/Enemy.cs({n},12): error CS0103: The name 'x' does not exist"),
+]
+
+
+def generate_log(line_count: int, seed: int = 0):
+    random_generator = random.Random(seed)
+    weights = [weight for weight, _ in LINE_TEMPLATES]
+    templates = [template for _, template in LINE_TEMPLATES]
+    lines = [
+        template.format(n=random_generator.randint(1, 5000))
+        for template in random_generator.choices(templates, weights, k=line_count)
+    ]
+    lines += ["Aborting batchmode due to failure:", "Build failed", ""]
+    return lines
+
+
+def load_log(log_path: Path):
+    with open(log_path, encoding="utf-8", errors="replace") as file:
+        return [line.strip() for line in file]
+
+
+def benchmark(lines: list[str], repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        parser = UnityLogParser()
+        parse = parser.parse
+        start_time = time.perf_counter()
+        for line in lines:
+            parse(line)
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    argument_parser.add_argument("log_files", nargs="*", type=Path)
+    argument_parser.add_argument("--repeat", type=int, default=5)
+    arguments = argument_parser.parse_args()
+
+    if arguments.log_files:
+        logs = [(str(path), load_log(path)) for path in arguments.log_files]
+    else:
+        logs = [
+            (f"synthetic {size:,} lines", generate_log(size))
+            for size in SYNTHETIC_SIZES
+        ]
+
+    print(f"{'log':<32} {'lines':>10} {'seconds':>9} {'lines/s':>12}")
+    for name, lines in logs:
+        elapsed = benchmark(lines, arguments.repeat)
+        print(
+            f"{name:<32} {len(lines):>10,} {elapsed:>9.3f} "
+            f"{len(lines) / max(elapsed, 1e-9):>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
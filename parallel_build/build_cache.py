@@ -0,0 +1,239 @@
+import hashlib
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import msgspec
+
+from parallel_build.build_step import BuildStep
+from parallel_build.config import BuildTarget, ProjectBuildConfig
+from parallel_build.copier import format_size, get_default_workers
+from parallel_build.disk_budget import disk_budget, register_evictor
+from parallel_build.exceptions import BuildProcessInterrupt
+from parallel_build.mirror import MirrorEntry, file_digest, scan_tree
+from parallel_build.source import ignore_patterns
+from parallel_build.unity_builder import (
+    WEBGL_BUILDER,
+    get_build_path,
+    get_editor_version,
+)
+from parallel_build.utils import (
+    FileLock,
+    better_rmtree,
+    clone_or_copy,
+    get_app_dir,
+    get_directory_size,
+    link_or_copy,
+)
+
+BUILD_CACHE_PATH = Path(get_app_dir("ParallelBuild")) / "build_cache"
+ENTRIES_PATH = BUILD_CACHE_PATH / "entries"
+HASHES_PATH = BUILD_CACHE_PATH / "hashes"
+ENTRY_NAME = "entry.json"
+BUILD_NAME = "Build"
+LOCK_PATH = BUILD_CACHE_PATH / "cache.lock"
+DISK_BUDGET_KIND = "cached build"
+
+
+class BuildCacheEntry(msgspec.Struct):
+    project_name: str
+    build_target: BuildTarget
+    size: int
+    last_used: float
+
+
+def get_builder_script(build_target: BuildTarget):
+    """Returns the builder script injected in the project for the target, if any."""
+    if build_target == BuildTarget.webgl:
+        return WEBGL_BUILDER
+    return ""
+
+
+def write_entry(entry_path: Path, entry: BuildCacheEntry):
+    temp_path = entry_path / f"{ENTRY_NAME}.tmp-{uuid.uuid4().hex}"
+    with open(temp_path, "wb") as file:
+        file.write(msgspec.json.encode(entry))
+    os.replace(temp_path, entry_path / ENTRY_NAME)
+
+
+def evict_entry(entry_path: Path):
+    try:
+        with FileLock(LOCK_PATH, blocking=False):
+            better_rmtree(path=entry_path)
+    except BlockingIOError:
+        return False
+    return True
+
+
+register_evictor(DISK_BUDGET_KIND, evict_entry)
+
+
+class BuildCache(BuildStep):
+    """Keeps the output of successful builds, keyed by a fingerprint of their input."""
+
+    name = "Build cache"
+
+    def __init__(
+        self,
+        project_name: str,
+        project_path: Path,
+        build_config: ProjectBuildConfig,
+    ):
+        self.project_name = project_name
+        self.project_path = Path(project_path)
+        self.build_config = build_config
+        self.build_path = get_build_path(self.project_path, build_config.path)
+        self.hashes_path = HASHES_PATH / f"{project_name}.json"
+        self.fingerprint: str | None = None
+        self.interrupt = False
+
+    @property
+    def entry_path(self):
+        return ENTRIES_PATH / self.fingerprint
+
+    def lock(self):
+        BUILD_CACHE_PATH.mkdir(parents=True, exist_ok=True)
+        return FileLock(LOCK_PATH)
+
+    def ignore(self, path, names):
+        ignored = list(ignore_patterns(self.project_path)(path, names))
+        path = Path(path)
+        if path == self.build_path.parent and self.build_path.name in names:
+            ignored.append(self.build_path.name)
+        if path == self.project_path / "Assets" / "Editor":
+            ignored += [name for name in names if name.startswith("WebGLBuilder.cs")]
+        return ignored
+
+    def load_hashes(self) -> dict[str, MirrorEntry]:
+        try:
+            with open(self.hashes_path, "rb") as file:
+                return msgspec.json.decode(file.read(), type=dict[str, MirrorEntry])
+        except (FileNotFoundError, msgspec.DecodeError):
+            return {}
+
+    def save_hashes(self, hashes: dict[str, MirrorEntry]):
+        HASHES_PATH.mkdir(parents=True, exist_ok=True)
+        temp_path = self.hashes_path.with_name(
+            f"{self.hashes_path.name}.tmp-{uuid.uuid4().hex}"
+        )
+        with open(temp_path, "wb") as file:
+            file.write(msgspec.json.encode(hashes))
+        os.replace(temp_path, self.hashes_path)
+
+    def compute_fingerprint(self):
+        files = scan_tree(self.project_path, ignore=self.ignore)
+        cached_hashes = self.load_hashes()
+        hashes = {}
+        to_hash = []
+        for relative_path, (size, mtime_ns) in files.items():
+            cached = cached_hashes.get(relative_path)
+            if cached and cached.size == size and cached.mtime_ns == mtime_ns:
+                hashes[relative_path] = cached
+            else:
+                to_hash.append(relative_path)
+
+        def digest(relative_path: str):
+            if self.interrupt:
+                raise BuildProcessInterrupt
+            return file_digest(self.project_path / relative_path)
+
+        with ThreadPoolExecutor(max_workers=get_default_workers()) as executor:
+            for relative_path, file_hash in zip(to_hash, executor.map(digest, to_hash)):
+                size, mtime_ns = files[relative_path]
+                hashes[relative_path] = MirrorEntry(size, mtime_ns, file_hash)
+        self.save_hashes(hashes)
+
+        fingerprint = hashlib.sha256()
+        for value in (
+            get_editor_version(self.project_path),
+            self.build_config.target.value,
+            self.build_config.method or "",
+            get_builder_script(self.build_config.target),
+        ):
+            fingerprint.update(value.encode("utf-8") + b"\0")
+        for relative_path in sorted(hashes):
+            fingerprint.update(
+                f"{relative_path}\0{hashes[relative_path].digest}\n".encode("utf-8")
+            )
+        return fingerprint.hexdigest(), len(to_hash), len(files)
+
+    @BuildStep.start_method
+    @BuildStep.end_method
+    def restore(self):
+        """Copies the cached build in the build path, returns whether it was cached."""
+        self.fingerprint, hashed_count, file_count = self.compute_fingerprint()
+        self.message.emit(
+            f"Fingerprint {self.fingerprint[:12]} "
+            f"({hashed_count} of {file_count} files hashed)"
+        )
+        with self.lock():
+            try:
+                with open(self.entry_path / ENTRY_NAME, "rb") as file:
+                    entry = msgspec.json.decode(file.read(), type=BuildCacheEntry)
+            except (FileNotFoundError, msgspec.DecodeError):
+                self.message.emit("No cached build for this fingerprint")
+                return False
+
+            self.message.emit(f"Restoring cached build in {self.build_path}...")
+            if self.build_path.exists():
+                better_rmtree(path=self.build_path)
+            self.build_path.parent.mkdir(parents=True, exist_ok=True)
+            with disk_budget.using(self.entry_path):
+                shutil.copytree(
+                    self.entry_path / BUILD_NAME,
+                    self.build_path,
+                    copy_function=self.interruptable_copy_function(clone_or_copy),
+                )
+            entry.last_used = time.time()
+            write_entry(self.entry_path, entry)
+            disk_budget.touch(self.entry_path)
+        self.message.emit(f"Skipped Unity build, restored {format_size(entry.size)}")
+        return True
+
+    @BuildStep.start_method
+    @BuildStep.end_method
+    def store(self, disposable_project: bool = False):
+        if not self.fingerprint or not self.build_path.exists():
+            return
+        self.message.emit(f"Storing build in the cache as {self.fingerprint[:12]}...")
+        ENTRIES_PATH.mkdir(parents=True, exist_ok=True)
+        staging_path = ENTRIES_PATH / f"{self.fingerprint}.tmp-{uuid.uuid4().hex}"
+        link = disposable_project and self.build_path.is_relative_to(self.project_path)
+        try:
+            shutil.copytree(
+                self.build_path,
+                staging_path / BUILD_NAME,
+                copy_function=self.interruptable_copy_function(
+                    link_or_copy if link else clone_or_copy
+                ),
+            )
+            entry = BuildCacheEntry(
+                project_name=self.project_name,
+                build_target=self.build_config.target,
+                size=get_directory_size(staging_path / BUILD_NAME),
+                last_used=time.time(),
+            )
+            write_entry(staging_path, entry)
+            with self.lock():
+                if self.entry_path.exists():
+                    better_rmtree(path=self.entry_path)
+                os.replace(staging_path, self.entry_path)
+            disk_budget.track(self.entry_path, DISK_BUDGET_KIND, entry.size)
+        finally:
+            if staging_path.exists():
+                better_rmtree(path=staging_path)
+
+    def interruptable_copy_function(self, copy_function):
+        def _interruptable_copy(src, dst, *, follow_symlinks=True):
+            if self.interrupt:
+                self.message.emit("\nBuild cache copy stopped")
+                raise BuildProcessInterrupt
+            return copy_function(src, dst, follow_symlinks=follow_symlinks)
+
+        return _interruptable_copy
+
+    def stop(self):
+        self.interrupt = True
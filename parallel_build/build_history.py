@@ -0,0 +1,177 @@
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+
+import msgspec
+
+from parallel_build.unity_log import LineKind, ParsedLine
+from parallel_build.unity_timeline import UnityPhaseTimeline
+from parallel_build.utils import get_app_dir
+
+BUILD_HISTORY_PATH = Path(get_app_dir("ParallelBuild")) / "build_history"
+MIN_SMOOTHING = 0.3
+MAX_PROGRESS = 0.99
+CONTIGUOUS_SHARE = 0.5
+
+COUNTER_PATTERN = re.compile(r"\[\s*(\d+)\s*/\s*(\d+)")
+
+
+class PhaseHistory(msgspec.Struct, array_like=True):
+    # fractions of the build duration
+    start: float
+    end: float
+    duration: float
+    lines: float
+
+    @property
+    def is_contiguous(self):
+        return self.duration >= (self.end - self.start) * CONTIGUOUS_SHARE
+
+
+class BuildHistory(msgspec.Struct):
+    """Statistics of the past builds of a project target."""
+
+    builds: int = 0
+    duration: float = 0
+    lines: float = 0
+    phases: dict[str, PhaseHistory] = {}
+
+    @staticmethod
+    def get_path(project_name: str, build_target: str):
+        return BUILD_HISTORY_PATH / f"{project_name}_{build_target}.json"
+
+    @classmethod
+    def load(cls, project_name: str, build_target: str):
+        try:
+            with open(cls.get_path(project_name, build_target), "rb") as file:
+                return msgspec.json.decode(file.read(), type=cls)
+        except (FileNotFoundError, msgspec.DecodeError):
+            return cls()
+
+    def save(self, project_name: str, build_target: str):
+        BUILD_HISTORY_PATH.mkdir(parents=True, exist_ok=True)
+        path = self.get_path(project_name, build_target)
+        temp_path = path.with_name(f"{path.name}.tmp-{uuid.uuid4().hex}")
+        with open(temp_path, "wb") as file:
+            file.write(msgspec.json.encode(self))
+        os.replace(temp_path, path)
+
+    def add_build(self, timeline: UnityPhaseTimeline, line_count: int):
+        duration = timeline.spans[-1].end - timeline.start_time
+        if duration <= 0:
+            return
+        self.builds += 1
+        weight = max(1 / self.builds, MIN_SMOOTHING)
+
+        def smooth(old_value: float, new_value: float):
+            return old_value + (new_value - old_value) * weight
+
+        phases = {}
+        for span in timeline.spans:
+            start = (span.start - timeline.start_time) / duration
+            phase = phases.setdefault(span.phase, PhaseHistory(start, start, 0, 0))
+            phase.end = (span.end - timeline.start_time) / duration
+            phase.duration += span.duration / duration
+            phase.lines += span.lines
+        for name, phase in phases.items():
+            old_phase = self.phases.get(name)
+            if old_phase is None or self.builds == 1:
+                self.phases[name] = phase
+                continue
+            self.phases[name] = PhaseHistory(
+                start=smooth(old_phase.start, phase.start),
+                end=smooth(old_phase.end, phase.end),
+                duration=smooth(old_phase.duration, phase.duration),
+                lines=smooth(old_phase.lines, phase.lines),
+            )
+        self.duration = smooth(self.duration, duration)
+        self.lines = smooth(self.lines, line_count)
+
+
+class ProgressEstimate(msgspec.Struct):
+    progress: float
+    remaining: float | None
+
+    @property
+    def percent(self):
+        return int(self.progress * 100)
+
+    def __str__(self):
+        if self.remaining is None:
+            return f"{self.percent}%"
+        return f"{self.percent}%, about {format_duration(self.remaining)} left"
+
+
+def format_duration(seconds: float):
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02}m"
+
+
+class BuildProgressEstimator:
+    """Estimates how far a build is from the logs of the past builds."""
+
+    def __init__(self, history: BuildHistory, start_time: float | None = None):
+        self.history = history
+        self.start_time = start_time or time.time()
+        self.line_count = 0
+        self.phase: str | None = None
+        self.phase_lines: dict[str, int] = {}
+        self.counter: float | None = None
+        self.progress = 0.0
+        self.percent = -1
+
+    @property
+    def available(self):
+        return self.history.builds > 0
+
+    def add_line(self, line: str, parsed_line: ParsedLine, phase: str):
+        """Returns a `ProgressEstimate` when the estimated percentage changes."""
+        self.line_count += 1
+        if phase != self.phase:
+            self.phase = phase
+            self.counter = None
+        self.phase_lines[phase] = self.phase_lines.get(phase, 0) + 1
+        if parsed_line.kind == LineKind.bracketed_progress:
+            if match := COUNTER_PATTERN.match(line):
+                done, total = int(match.group(1)), int(match.group(2))
+                if total:
+                    self.counter = done / total
+        if not self.available:
+            return None
+
+        phase_history = self.history.phases.get(phase)
+        if phase_history is not None and phase_history.is_contiguous:
+            if self.counter is not None:
+                within_phase = self.counter
+            else:
+                within_phase = min(
+                    1, self.phase_lines[phase] / max(phase_history.lines, 1)
+                )
+            progress = phase_history.start + within_phase * (
+                phase_history.end - phase_history.start
+            )
+        else:
+            progress = self.line_count / max(self.history.lines, 1)
+        self.progress = max(self.progress, min(progress, MAX_PROGRESS))
+
+        percent = int(self.progress * 100)
+        if percent == self.percent:
+            return None
+        self.percent = percent
+        return self.estimate()
+
+    def estimate(self):
+        elapsed = time.time() - self.start_time
+        from_history = max(0.0, self.history.duration * (1 - self.progress))
+        if self.progress > 0:
+            from_pace = elapsed / self.progress * (1 - self.progress)
+            remaining = self.progress * from_pace + (1 - self.progress) * from_history
+        else:
+            remaining = from_history
+        return ProgressEstimate(progress=self.progress, remaining=remaining)
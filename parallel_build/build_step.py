@@ -1,3 +1,6 @@
+import threading
+from typing import Callable
+
 from parallel_build.command import CommandExecutor
 
 
@@ -11,10 +14,145 @@ class BuildStepEvent:
     def clear(self):
         self._callbacks = []
 
+    def add(self, callback):
+        self._callbacks = (*self._callbacks, callback)
+
+    def remove(self, callback):
+        self._callbacks = tuple(
+            existing_callback
+            for existing_callback in self._callbacks
+            if existing_callback != callback
+        )
+
     def emit(self, *args, **kwargs):
         for callback in self._callbacks:
             callback(*args, **kwargs)
 
+    def flush(self):
+        for callback in self._callbacks:
+            if flush := getattr(callback, "flush", None):
+                flush()
+
+
+class EventBatcher:
+    """Delivers the values emitted by events to their callbacks in batches."""
+
+    def __init__(self, interval: float = 0.1, max_lines: int = 1000):
+        self.interval = interval
+        self.max_lines = max_lines
+        self.lock = threading.RLock()
+        self.pending: list[tuple] = []
+        self.pending_count = 0
+        self.latest_values = {}
+        self.closed = threading.Event()
+        self.timer = None
+
+    def batched(self, callback):
+        def _batched(value):
+            with self.lock:
+                if self.pending and self.pending[-1][0] is callback:
+                    self.pending[-1][1].append(value)
+                else:
+                    self.pending.append((callback, [value]))
+                self.pending_count += 1
+                if self.pending_count >= self.max_lines:
+                    self.flush()
+
+        _batched.flush = self.flush
+        return _batched
+
+    def latest(self, callback):
+        def _latest(value):
+            with self.lock:
+                self.latest_values[callback] = value
+
+        _latest.flush = self.flush
+        return _latest
+
+    def immediate(self, callback):
+        def _immediate(*args, **kwargs):
+            with self.lock:
+                self.flush()
+                callback(*args, **kwargs)
+
+        return _immediate
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending, self.pending_count = self.pending, [], 0
+            latest_values, self.latest_values = self.latest_values, {}
+            for callback, values in pending:
+                callback(values)
+            for callback, value in latest_values.items():
+                callback(value)
+
+    def run_timer(self):
+        while not self.closed.wait(self.interval):
+            self.flush()
+
+    def start(self):
+        self.closed.clear()
+        self.timer = threading.Thread(target=self.run_timer, daemon=True)
+        self.timer.start()
+
+    def close(self):
+        self.closed.set()
+        if self.timer:
+            self.timer.join()
+            self.timer = None
+        self.flush()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class PeriodicTask:
+    """Runs `function` every `interval` seconds until it returns `True`."""
+
+    def __init__(self, function: Callable[[], bool | None], interval: float):
+        self.function = function
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.done = False
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def run_once(self):
+        with self.lock:
+            if not self.done:
+                self.done = bool(self.function())
+            return self.done
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            if self.run_once():
+                return
+
+    def start(self):
+        self.stopped.clear()
+        self.thread = threading.Thread(
+            target=self.run, name=threading.current_thread().name, daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        self.run_once()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
 
 class BuildStep:
     start = BuildStepEvent(str)
@@ -22,12 +160,23 @@ class BuildStep:
     short_message = BuildStepEvent(str)
     error = BuildStepEvent(str)
     end = BuildStepEvent(str)
-    command_executor = CommandExecutor(
-        stdout_function=long_message.emit, stderr_function=error.emit
-    )
+    progress_estimate = BuildStepEvent()
+    git_polling_metrics = BuildStepEvent()
 
     name: str
 
+    @property
+    def command_executor(self):
+        if "_command_executor" not in self.__dict__:
+            self._command_executor = CommandExecutor(
+                stdout_function=self.long_message.emit,
+                stderr_function=self.error.emit,
+            )
+        return self._command_executor
+
+    def periodic_task(self, function: Callable[[], bool | None], interval: float):
+        return PeriodicTask(function, interval)
+
     @staticmethod
     def start_method(method):
         def _start_method(self, *args, **kwargs):
@@ -40,6 +189,8 @@ class BuildStep:
     def end_method(method):
         def _end_method(self, *args, **kwargs):
             output = method(self, *args, **kwargs)
+            self.long_message.flush()
+            self.short_message.flush()
             self.end.emit(self.name)
             return output
 
@@ -1,7 +1,14 @@
+import threading
+
 import click
 
-from parallel_build.build_step import BuildStep
+from parallel_build.build_history import ProgressEstimate
+from parallel_build.build_step import BuildStep, EventBatcher
+from parallel_build.config import Config
+from parallel_build.disk_budget import disk_budget
 from parallel_build.main import BuildProcess
+from parallel_build.scheduler import BuildScheduler
+from parallel_build.trash import trash
 
 
 def start_echo(name: str):
@@ -12,20 +19,109 @@ def error_echo(error: str):
     click.secho(error, fg="red")
 
 
+def lines_echo(lines: list[str]):
+    click.echo("\n".join(lines))
+
+
+def progress_status(echo_function, step: int = 5):
+    shown_steps = {}
+
+    def _progress_status(estimate: ProgressEstimate):
+        thread_name = threading.current_thread().name
+        if shown_steps.get(thread_name) == estimate.percent // step:
+            return
+        shown_steps[thread_name] = estimate.percent // step
+        echo_function(click.style(f"[{estimate}]", fg="cyan"))
+
+    return _progress_status
+
+
+def set_echo_callbacks(batcher: EventBatcher):
+    BuildStep.start.set(batcher.immediate(with_project_prefix(start_echo)))
+    BuildStep.long_message.set(with_project_prefix(batcher.batched(lines_echo)))
+    BuildStep.error.set(batcher.immediate(with_project_prefix(error_echo)))
+    BuildStep.progress_estimate.set(
+        progress_status(with_project_prefix(batcher.batched(lines_echo)))
+    )
+
+
 @click.command()
 @click.argument("project_name")
 @click.option("--continuous", "-c", is_flag=True)
 def build(project_name: str, continuous: bool):
-    BuildStep.start.set(start_echo)
-    BuildStep.long_message.set(click.echo)
-    BuildStep.error.set(error_echo)
-
     click.secho("// Parallel Build", fg="green", bold=True)
+    trash.start()
+    config = Config.load()
+    disk_budget.configure(config.disk_budget_mb, config.min_free_disk_mb)
 
-    build_process = BuildProcess(
-        project_name=project_name,
-    )
+    with EventBatcher() as batcher:
+        set_echo_callbacks(batcher)
+        build_process = BuildProcess(
+            project_name=project_name,
+            config=config,
+        )
+        try:
+            build_process.run(continuous)
+        except KeyboardInterrupt:
+            build_process.stop()
+    empty_trash()
+
+
+def empty_trash():
+    if not trash.pending:
+        return
+    click.secho("\nDeleting temporary files...", fg="green")
     try:
-        build_process.run(continuous)
+        trash.close()
     except KeyboardInterrupt:
-        build_process.stop()
+        trash.close(wait=False)
+
+
+def with_project_prefix(echo_function):
+    def _with_project_prefix(text: str):
+        thread = threading.current_thread()
+        if thread is threading.main_thread():
+            return echo_function(text)
+        return echo_function(
+            "\n".join(f"[{thread.name}] {line}" for line in text.split("\n"))
+        )
+
+    if hasattr(echo_function, "flush"):
+        _with_project_prefix.flush = echo_function.flush
+    return _with_project_prefix
+
+
+@click.command(name="build-all")
+@click.option("--project", "-p", "project_names", multiple=True)
+@click.option("--jobs", "-j", type=int, help="Maximum number of parallel builds")
+def build_all(project_names: tuple[str], jobs: int | None):
+    click.secho("// Parallel Build", fg="green", bold=True)
+
+    trash.start()
+    scheduler = BuildScheduler(max_workers=jobs)
+    config = scheduler.config
+    disk_budget.configure(config.disk_budget_mb, config.min_free_disk_mb)
+    for project_name in project_names or [project.name for project in config.projects]:
+        scheduler.submit(project_name)
+    click.secho(
+        f"Building {len(scheduler.jobs)} projects, "
+        f"up to {scheduler.max_workers} at a time",
+        fg="green",
+    )
+    with EventBatcher() as batcher:
+        set_echo_callbacks(batcher)
+        try:
+            finished_jobs = scheduler.run()
+        except KeyboardInterrupt:
+            scheduler.stop()
+            scheduler.join()
+            empty_trash()
+            return
+    empty_trash()
+
+    click.secho("\n// Summary", fg="green")
+    for job in finished_jobs:
+        if job.finished_with_success:
+            click.secho(f"[✓] {job.project_name}", fg="green")
+        else:
+            click.secho(f"[✘] {job.project_name}", fg="red")
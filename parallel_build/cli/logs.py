@@ -0,0 +1,106 @@
+import re
+import time
+
+import click
+
+from parallel_build.copier import format_size
+from parallel_build.log_store import BuildLog
+
+
+def format_time(timestamp: float):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+
+def find_build_log(project_name: str, build_id: str | None):
+    build_log = BuildLog.find(project_name, build_id)
+    if build_log is None:
+        raise click.ClickException(f"No build log found for '{project_name}'")
+    return build_log
+
+
+@click.group()
+def logs():
+    ...
+
+
+@logs.command(name="list")
+@click.argument("project_name", required=False)
+@click.option("--count", "-n", default=20, help="Number of builds to list")
+def list_logs(project_name: str | None, count: int):
+    for build_log in BuildLog.list_all(project_name)[-count:]:
+        index = build_log.index
+        if not index:
+            continue
+        end = index[-1] if index[-1].kind == "end" else None
+        if end is None:
+            status = click.style("running", fg="yellow")
+        elif end.success:
+            status = click.style("success", fg="green")
+        else:
+            status = click.style("failed", fg="red")
+        errors = len([entry for entry in index if entry.kind == "error"])
+        click.echo(
+            f"{build_log.project_name} {build_log.build_id}: "
+            f"{format_time(index[0].time)}, {status}, "
+            f"{(end or index[-1]).line} lines, {errors} errors "
+            f"({format_size(build_log.size)})"
+        )
+
+
+@logs.command()
+@click.argument("project_name")
+@click.argument("build_id", required=False)
+@click.option("--lines", "-n", default=50, help="Number of lines to show")
+def tail(project_name: str, build_id: str | None, lines: int):
+    build_log = find_build_log(project_name, build_id)
+    index = build_log.index
+    line_count = index[-1].line if index else 0
+    for _, text in build_log.read_lines(from_line=max(0, line_count - lines)):
+        click.echo(text)
+
+
+@logs.command()
+@click.argument("pattern")
+@click.option("--project", "-p", "project_name", help="Only search this project")
+@click.option("--build", "-b", "build_id", help="Only search this build")
+@click.option(
+    "--phase", help="Only search the phases with this name, e.g. 'Unity build'"
+)
+@click.option("--errors", is_flag=True, help="Only search the errors")
+@click.option("--ignore-case", "-i", is_flag=True)
+def search(
+    pattern: str,
+    project_name: str | None,
+    build_id: str | None,
+    phase: str | None,
+    errors: bool,
+    ignore_case: bool,
+):
+    regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    if build_id:
+        if not project_name:
+            raise click.UsageError("--build requires --project")
+        build_logs = [find_build_log(project_name, build_id)]
+    else:
+        build_logs = BuildLog.list_all(project_name)
+
+    for build_log in build_logs:
+        prefix = f"{build_log.project_name} {build_log.build_id}"
+        if errors:
+            for entry in build_log.index:
+                if entry.kind == "error" and regex.search(entry.text):
+                    click.echo(f"{prefix}:{entry.line}: {entry.text}")
+            continue
+
+        if phase:
+            ranges = [
+                (first_line, end_line)
+                for name, first_line, end_line in build_log.phases()
+                if name == phase
+            ]
+        else:
+            ranges = [(0, None)]
+        for first_line, end_line in ranges:
+            for line_number, text in build_log.read_lines(first_line, end_line):
+                if regex.search(text):
+                    click.echo(f"{prefix}:{line_number}: {text}")
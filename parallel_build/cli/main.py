@@ -1,8 +1,10 @@
 import click
 
-from parallel_build.cli.build import build
+from parallel_build.cli.build import build, build_all
 from parallel_build.cli.check import check
 from parallel_build.cli.config import config
+from parallel_build.cli.logs import logs
+from parallel_build.cli.mirrors import mirrors
 
 
 @click.group()
@@ -11,8 +13,11 @@ def cli():
 
 
 cli.add_command(build)
+cli.add_command(build_all)
 cli.add_command(check)
 cli.add_command(config)
+cli.add_command(logs)
+cli.add_command(mirrors)
 
 if __name__ == "__main__":
     cli()
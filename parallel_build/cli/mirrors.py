@@ -0,0 +1,49 @@
+import time
+
+import click
+
+from parallel_build.config import Config, ProjectSourceType
+from parallel_build.copier import format_size
+from parallel_build.git_mirror import GitMirror
+from parallel_build.utils import get_directory_size
+
+
+@click.group()
+def mirrors():
+    ...
+
+
+@mirrors.command(name="list")
+def list_mirrors():
+    for mirror in GitMirror.list_all():
+        info = mirror.info
+        last_fetch = (
+            time.strftime("%Y-%m-%d %H:%M", time.localtime(info.last_fetch))
+            if info.last_fetch
+            else "never"
+        )
+        in_use = f", {len(mirror.worktrees)} sessions" if mirror.worktrees else ""
+        click.echo(
+            f"{mirror.name}: {info.repository} "
+            f"({format_size(get_directory_size(mirror.path))}, "
+            f"last fetch {last_fetch}{in_use})"
+        )
+
+
+@mirrors.command()
+@click.option("--all", "prune_all", is_flag=True, help="Also prune configured mirrors")
+@click.option("--force", is_flag=True, help="Also prune mirrors in use")
+def prune(prune_all: bool, force: bool):
+    configured_repositories = {
+        project.source.value
+        for project in Config.load().projects
+        if project.source.type == ProjectSourceType.git and project.source.mirror
+    }
+    for mirror in GitMirror.list_all():
+        if not prune_all and mirror.git_repository in configured_repositories:
+            continue
+        if mirror.worktrees and not force:
+            click.secho(f"Skipping {mirror.name}, still in use", fg="yellow")
+            continue
+        click.echo(f"Removing {mirror.name} ({mirror.git_repository})")
+        mirror.delete()
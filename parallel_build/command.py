@@ -1,9 +1,115 @@
+import codecs
+import collections
+import os
+import queue
+import selectors
 import subprocess
+import threading
+from enum import Enum
 from os import PathLike
+from typing import Callable, NamedTuple
 
 from parallel_build.exceptions import BuildProcessError
 from parallel_build.utils import OperatingSystem
 
+READ_SIZE = 64 * 1024
+MAX_LINE_LENGTH = 64 * 1024
+MAX_RETAINED_OUTPUT = 64 * 1024
+MAX_QUEUED_CHUNKS = 64
+
+
+class Origin(Enum):
+    stdout = "stdout"
+    stderr = "stderr"
+
+
+class OutputLine(NamedTuple):
+    origin: Origin
+    text: str
+
+
+class LineSplitter:
+    """Turns the binary chunks read from a pipe into text lines."""
+
+    def __init__(self, origin: Origin):
+        self.origin = origin
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.buffer = ""
+
+    def feed(self, chunk: bytes):
+        self.buffer += self.decoder.decode(chunk)
+        *lines, self.buffer = self.buffer.split("\n")
+        while len(self.buffer) > MAX_LINE_LENGTH:
+            lines.append(self.buffer[:MAX_LINE_LENGTH])
+            self.buffer = self.buffer[MAX_LINE_LENGTH:]
+        return [OutputLine(self.origin, line.rstrip("\r")) for line in lines]
+
+    def close(self):
+        self.buffer += self.decoder.decode(b"", final=True)
+        if not self.buffer:
+            return []
+        lines = [OutputLine(self.origin, self.buffer.rstrip("\r"))]
+        self.buffer = ""
+        return lines
+
+
+class OutputTail:
+    def __init__(self, max_size: int = MAX_RETAINED_OUTPUT):
+        self.max_size = max_size
+        self.lines = collections.deque()
+        self.size = 0
+        self.truncated = False
+
+    def append(self, line: str):
+        self.lines.append(line)
+        self.size += len(line) + 1
+        while self.size > self.max_size and len(self.lines) > 1:
+            self.size -= len(self.lines.popleft()) + 1
+            self.truncated = True
+
+    def __str__(self):
+        text = "\n".join(self.lines)
+        return f"[...]\n{text}" if self.truncated else text
+
+
+def read_pipes_with_selector(pipes: dict[Origin, object]):
+    splitters = {origin: LineSplitter(origin) for origin in pipes}
+    with selectors.DefaultSelector() as selector:
+        for origin, pipe in pipes.items():
+            selector.register(pipe, selectors.EVENT_READ, origin)
+        while selector.get_map():
+            for key, _ in selector.select():
+                chunk = os.read(key.fd, READ_SIZE)
+                if chunk:
+                    yield from splitters[key.data].feed(chunk)
+                else:
+                    selector.unregister(key.fileobj)
+                    yield from splitters[key.data].close()
+
+
+def read_pipes_with_threads(pipes: dict[Origin, object]):
+    chunks = queue.Queue(maxsize=MAX_QUEUED_CHUNKS)
+
+    def read(origin: Origin, pipe):
+        try:
+            while chunk := pipe.read1(READ_SIZE):
+                chunks.put((origin, chunk))
+        finally:
+            chunks.put((origin, None))
+
+    for origin, pipe in pipes.items():
+        threading.Thread(target=read, args=(origin, pipe), daemon=True).start()
+
+    splitters = {origin: LineSplitter(origin) for origin in pipes}
+    open_pipes = len(pipes)
+    while open_pipes:
+        origin, chunk = chunks.get()
+        if chunk is None:
+            open_pipes -= 1
+            yield from splitters[origin].close()
+        else:
+            yield from splitters[origin].feed(chunk)
+
 
 class Command:
     def __init__(self, command: str | list[str], **extra_params):
@@ -18,8 +124,6 @@ class Command:
             self.command,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
-            encoding="UTF-8",
             **self.extra_params,
         )
 
@@ -34,15 +138,21 @@ class Command:
         self.process.kill()
 
     @property
-    def output_lines(self):
+    def tagged_output_lines(self):
         if not self.process:
             raise Exception(f"Command {self.command} not started")
-        for line in self.process.stdout:
-            line = line.strip()
-            yield line
+        pipes = {Origin.stdout: self.process.stdout, Origin.stderr: self.process.stderr}
+        if OperatingSystem.current == OperatingSystem.windows:
+            yield from read_pipes_with_threads(pipes)
+        else:
+            yield from read_pipes_with_selector(pipes)
+        for pipe in pipes.values():
+            pipe.close()
 
-    def communicate(self):
-        return self.process.communicate()
+    @property
+    def output_lines(self):
+        for line in self.tagged_output_lines:
+            yield line.text.strip()
 
     @property
     def return_value(self):
@@ -64,26 +174,38 @@ class CommandExecutor:
         error_message: str | None = None,
         not_found_error_message: str | None = None,
         redirect_stderr_to_stdout: bool = False,
+        on_line: Callable[[OutputLine], None] | None = None,
     ):
         self.current_command = Command(command, cwd=cwd)
+        output = []
+        stdout_tail = OutputTail()
+        stderr_tail = OutputTail()
         try:
             self.current_command.start()
-            stdout, stderr = self.current_command.communicate()
+            for line in self.current_command.tagged_output_lines:
+                if on_line:
+                    on_line(line)
+                to_stdout = line.origin == Origin.stdout or redirect_stderr_to_stdout
+                if to_stdout and return_output:
+                    output.append(line.text)
+                    stdout_tail.append(line.text)
+                elif to_stdout:
+                    self.stdout_function(line.text)
+                else:
+                    stderr_tail.append(line.text)
         except FileNotFoundError as e:
             raise BuildProcessError(
                 not_found_error_message if not_found_error_message else str(e)
             )
-        if redirect_stderr_to_stdout:
-            stdout = stdout + stderr
         if self.current_command.return_value == 0:
             if return_output:
-                return stdout
-            else:
-                self.stdout_function(stdout)
+                return "\n".join(output) + "\n" if output else ""
         else:
             self.stderr_function(
-                stdout + stderr
-            )  # sometimes commands write errors to stdout
+                "\n".join(
+                    str(tail) for tail in (stdout_tail, stderr_tail) if tail.lines
+                )
+            )
             raise BuildProcessError(
                 f"Error running '{self._pretty_command(command)}'"
                 if not error_message
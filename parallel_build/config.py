@@ -29,9 +29,23 @@ class ProjectSourceType(str, Enum):
                 return "Git repository"
 
 
+class SnapshotMode(str, Enum):
+    copy = "copy"
+    clone = "clone"
+    link = "link"
+
+
 class ProjectSource(Base):
     type: ProjectSourceType
     value: str
+    mirror: bool = False
+    mirror_checksum: bool = False
+    snapshot: SnapshotMode = SnapshotMode.copy
+    clone_depth: int | None = None
+    clone_filter: str | None = None
+    sparse_checkout: list[str] = []
+    workspace_root: str | None = None
+    ram_disk: bool = False
 
 
 class BuildTarget(str, Enum):
@@ -47,11 +61,24 @@ class ProjectBuildConfig(Base):
     target: BuildTarget = BuildTarget.webgl
     method: str | None = None
     path: str = "Build/WebGL"
+    library_cache: bool = False
+    build_cache: bool = False
 
 
 class ProjectPostBuildAction(Base):
     action: Literal["copy", "publish-itch"]
     params: dict[str, str] | None
+    name: str | None = None
+    # by default, after the previous action
+    after: list[str] | None = None
+
+    @property
+    def display_name(self):
+        return self.name or self.action
+
+
+class ProjectTargetConfig(ProjectBuildConfig):
+    post_build: list[ProjectPostBuildAction] | None = None
 
 
 class Project(Base):
@@ -59,12 +86,41 @@ class Project(Base):
     source: ProjectSource
     build: ProjectBuildConfig = msgspec.field(default_factory=ProjectBuildConfig)
     post_build: list[ProjectPostBuildAction] = []
+    targets: list[ProjectTargetConfig] = []
+    priority: int = 0
+
+    @property
+    def build_targets(self) -> list[tuple[ProjectBuildConfig, list]]:
+        if not self.targets:
+            return [(self.build, self.post_build)]
+        return [
+            (
+                target,
+                target.post_build if target.post_build is not None else self.post_build,
+            )
+            for target in self.targets
+        ]
 
 
 class Config(Base):
     projects: list[Project] = []
     git_polling_interval: int = 30
+    git_polling_max_interval: int = 300
     default_project: int = 0
+    copy_workers: int | None = None
+    max_parallel_builds: int | None = None
+    build_cpus: int = 4
+    build_memory_mb: int = 4096
+    max_parallel_targets: int = 2
+    max_parallel_post_build_actions: int = 2
+    pipelined_continuous_builds: bool = False
+    max_pending_post_builds: int = 1
+    disk_budget_mb: int | None = None
+    min_free_disk_mb: int = 2048
+    workspace_root: str | None = None
+    # by default /dev/shm on Linux
+    ram_disk_path: str | None = None
+    gui_log_max_lines: int = 10000
 
     @classmethod
     def load(cls):
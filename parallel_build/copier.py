@@ -0,0 +1,220 @@
+import os
+import queue
+import shutil
+import threading
+import time
+from typing import Callable, Iterable
+
+from parallel_build.exceptions import BuildProcessInterrupt
+
+LARGE_FILE_THRESHOLD = 256 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024 * 1024
+BUFFER_SIZE = 1024 * 1024
+
+_STOP = object()
+
+
+def get_default_workers():
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def format_size(size: float):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.2f} {unit}"
+        size /= 1024
+    return f"{size:.2f} TB"
+
+
+class CopyStats:
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.start_time = time.perf_counter()
+        self.end_time = None
+        self.lock = threading.Lock()
+
+    def add(self, size: int):
+        with self.lock:
+            self.files += 1
+            self.bytes += size
+
+    def finish(self):
+        self.end_time = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return (self.end_time or time.perf_counter()) - self.start_time
+
+    def __str__(self):
+        elapsed = max(self.elapsed, 1e-6)
+        return (
+            f"Copied {self.files} files ({format_size(self.bytes)}) in {elapsed:.2f} seconds: "
+            f"{format_size(self.bytes / elapsed)}/s, {self.files / elapsed:.1f} files/s"
+        )
+
+
+class ChunkedFile:
+    def __init__(self, src: str, dst: str, size: int, chunks: int):
+        self.src = src
+        self.dst = dst
+        self.size = size
+        self.remaining_chunks = chunks
+        self.lock = threading.Lock()
+
+    def copy_chunk(self, offset: int, length: int):
+        with open(self.src, "rb") as src_file, open(self.dst, "r+b") as dst_file:
+            src_file.seek(offset)
+            dst_file.seek(offset)
+            while length > 0:
+                buffer = src_file.read(min(BUFFER_SIZE, length))
+                if not buffer:
+                    break
+                dst_file.write(buffer)
+                length -= len(buffer)
+        with self.lock:
+            self.remaining_chunks -= 1
+            return self.remaining_chunks == 0
+
+
+class ParallelCopier:
+    """Copies files with a pool of worker threads."""
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        copy_function: Callable = shutil.copy2,
+        is_interrupted: Callable[[], bool] = lambda: False,
+        on_copy: Callable[[str, str], None] | None = None,
+        chunk_large_files: bool = True,
+        large_file_threshold: int = LARGE_FILE_THRESHOLD,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        self.workers = workers or get_default_workers()
+        self.copy_function = copy_function
+        self.is_interrupted = is_interrupted
+        self.on_copy = on_copy
+        self.chunk_large_files = chunk_large_files
+        self.large_file_threshold = large_file_threshold
+        self.chunk_size = chunk_size
+
+    def copytree(
+        self,
+        src,
+        dst,
+        ignore: Callable | None = None,
+        dirs_exist_ok: bool = False,
+    ):
+        """Same as `shutil.copytree`, but in parallel. Returns a `CopyStats`."""
+        directories = []
+
+        def walk():
+            os.makedirs(dst, exist_ok=dirs_exist_ok)
+            directories.append((src, dst))
+            stack = [(os.fspath(src), os.fspath(dst))]
+            while stack:
+                src_directory, dst_directory = stack.pop()
+                with os.scandir(src_directory) as iterator:
+                    entries = list(iterator)
+                ignored = (
+                    set(ignore(src_directory, [entry.name for entry in entries]))
+                    if ignore
+                    else ()
+                )
+                for entry in entries:
+                    if entry.name in ignored:
+                        continue
+                    target = os.path.join(dst_directory, entry.name)
+                    if entry.is_dir():
+                        os.makedirs(target, exist_ok=True)
+                        directories.append((entry.path, target))
+                        stack.append((entry.path, target))
+                    else:
+                        yield entry.path, target, entry.stat().st_size
+
+        stats = self.copy_files(walk())
+        for src_directory, dst_directory in reversed(directories):
+            shutil.copystat(src_directory, dst_directory)
+        return stats
+
+    def copy_files(
+        self,
+        files: Iterable[tuple[str, str, int]],
+        on_done: Callable[[str, str], None] | None = None,
+    ):
+        stats = CopyStats()
+        tasks = queue.Queue(maxsize=self.workers * 4)
+        errors = []
+        failed = threading.Event()
+
+        def file_done(src, dst, size):
+            stats.add(size)
+            if on_done:
+                on_done(src, dst)
+
+        def copy_file(src, dst, size):
+            self.copy_function(src, dst)
+            file_done(src, dst, size)
+
+        def copy_chunk(chunked_file: ChunkedFile, offset: int, length: int):
+            if chunked_file.copy_chunk(offset, length):
+                shutil.copystat(chunked_file.src, chunked_file.dst)
+                file_done(chunked_file.src, chunked_file.dst, chunked_file.size)
+
+        def work():
+            while True:
+                task = tasks.get()
+                if task is _STOP:
+                    return
+                if failed.is_set():
+                    continue
+                if self.is_interrupted():
+                    failed.set()
+                    continue
+                function, *args = task
+                try:
+                    function(*args)
+                except BaseException as e:
+                    errors.append(e)
+                    failed.set()
+
+        workers = [
+            threading.Thread(target=work, daemon=True) for _ in range(self.workers)
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for src, dst, size in files:
+                if failed.is_set() or self.is_interrupted():
+                    failed.set()
+                    break
+                if self.on_copy:
+                    self.on_copy(src, dst)
+                if self.chunk_large_files and size >= self.large_file_threshold:
+                    chunks = range(0, size, self.chunk_size)
+                    with open(dst, "wb") as dst_file:
+                        dst_file.truncate(size)
+                    chunked_file = ChunkedFile(src, dst, size, len(chunks))
+                    for offset in chunks:
+                        tasks.put(
+                            (
+                                copy_chunk,
+                                chunked_file,
+                                offset,
+                                min(self.chunk_size, size - offset),
+                            )
+                        )
+                else:
+                    tasks.put((copy_file, src, dst, size))
+        finally:
+            for _ in workers:
+                tasks.put(_STOP)
+            for worker in workers:
+                worker.join()
+            stats.finish()
+
+        if errors:
+            raise errors[0]
+        if failed.is_set():
+            raise BuildProcessInterrupt
+        return stats
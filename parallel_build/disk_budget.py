@@ -0,0 +1,197 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+import msgspec
+
+from parallel_build.build_step import BuildStep
+from parallel_build.copier import format_size
+from parallel_build.exceptions import BuildProcessError
+from parallel_build.utils import FileLock, better_rmtree, get_app_dir
+
+DISK_BUDGET_PATH = Path(get_app_dir("ParallelBuild")) / "disk_budget.json"
+DISK_BUDGET_LOCK_PATH = DISK_BUDGET_PATH.with_suffix(".lock")
+
+
+class DiskBudgetEntry(msgspec.Struct):
+    kind: str
+    size: int
+    last_used: float
+
+
+class DiskBudgetState(msgspec.Struct):
+    entries: dict[str, DiskBudgetEntry] = {}
+    size_estimates: dict[str, int] = {}
+
+
+def remove_cache(path: Path):
+    better_rmtree(path=path)
+    return True
+
+
+evictors: dict[str, Callable[[Path], bool]] = {}
+
+
+def register_evictor(kind: str, evictor: Callable[[Path], bool]):
+    evictors[kind] = evictor
+
+
+def get_existing_parent(path: Path):
+    path = Path(path).absolute()
+    while not path.exists() and path != path.parent:
+        path = path.parent
+    return path
+
+
+def get_device(path: Path):
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return None
+
+
+class DiskBudget:
+    """Keeps the disk used by the caches, snapshots and builds in check."""
+
+    def __init__(self, max_size_mb: int | None = None, min_free_mb: int = 0):
+        self.configure(max_size_mb, min_free_mb)
+        self.in_use: Counter[str] = Counter()
+        self.in_use_lock = threading.Lock()
+
+    def configure(self, max_size_mb: int | None, min_free_mb: int):
+        self.max_size = max_size_mb * 1024 * 1024 if max_size_mb is not None else None
+        self.min_free = min_free_mb * 1024 * 1024
+
+    def read_state(self):
+        try:
+            return msgspec.json.decode(
+                DISK_BUDGET_PATH.read_bytes(), type=DiskBudgetState
+            )
+        except (FileNotFoundError, msgspec.DecodeError):
+            return DiskBudgetState()
+
+    @contextmanager
+    def state(self):
+        DISK_BUDGET_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(DISK_BUDGET_LOCK_PATH):
+            state = self.read_state()
+            state.entries = {
+                path: entry
+                for path, entry in state.entries.items()
+                if os.path.exists(path)
+            }
+            yield state
+            temp_path = DISK_BUDGET_PATH.with_name(
+                f"{DISK_BUDGET_PATH.name}.tmp-{uuid.uuid4().hex}"
+            )
+            temp_path.write_bytes(msgspec.json.encode(state))
+            os.replace(temp_path, DISK_BUDGET_PATH)
+
+    def track(self, path: Path, kind: str, size: int):
+        path = str(path)
+        with self.state() as state:
+            state.entries[path] = DiskBudgetEntry(
+                kind=kind, size=size, last_used=time.time()
+            )
+        if self.max_size is not None:
+            self.evict(protected=path)
+
+    def touch(self, path: Path):
+        with self.state() as state:
+            entry = state.entries.get(str(path))
+            if entry:
+                entry.last_used = time.time()
+
+    def use(self, path: Path):
+        with self.in_use_lock:
+            self.in_use[str(path)] += 1
+
+    def release(self, path: Path):
+        with self.in_use_lock:
+            self.in_use[str(path)] -= 1
+            if not self.in_use[str(path)]:
+                del self.in_use[str(path)]
+
+    @contextmanager
+    def using(self, path: Path):
+        self.use(path)
+        try:
+            yield
+        finally:
+            self.release(path)
+
+    def size_estimate(self, key: str):
+        return self.read_state().size_estimates.get(key, 0)
+
+    def remember_size(self, key: str, size: int):
+        with self.state() as state:
+            state.size_estimates[key] = max(0, size)
+
+    def missing_space(self, state: DiskBudgetState, path: Path, size: int):
+        missing_free = self.min_free + size - shutil.disk_usage(path).free
+        over_budget = 0
+        if self.max_size is not None:
+            total_size = sum(entry.size for entry in state.entries.values())
+            over_budget = total_size - self.max_size
+        return missing_free, over_budget
+
+    def evict(
+        self,
+        protected: str | None = None,
+        path: Path | None = None,
+        size: int = 0,
+    ):
+        path = get_existing_parent(path or DISK_BUDGET_PATH)
+        device = get_device(path)
+        skipped = {protected}
+        while True:
+            with self.state() as state:
+                missing_free, over_budget = self.missing_space(state, path, size)
+                if missing_free <= 0 and over_budget <= 0:
+                    return missing_free
+                with self.in_use_lock:
+                    in_use = set(self.in_use)
+                candidates = [
+                    (entry_path, entry)
+                    for entry_path, entry in state.entries.items()
+                    if entry_path not in skipped
+                    and entry_path not in in_use
+                    and (over_budget > 0 or get_device(entry_path) == device)
+                ]
+                if not candidates:
+                    return missing_free
+                entry_path, entry = min(
+                    candidates, key=lambda candidate: candidate[1].last_used
+                )
+                del state.entries[entry_path]
+
+            BuildStep.message.emit(
+                f"Evicting {entry.kind} {entry_path} ({format_size(entry.size)})"
+            )
+            if evictors.get(entry.kind, remove_cache)(Path(entry_path)):
+                continue
+            BuildStep.message.emit(f"{entry_path} is in use, not evicted")
+            skipped.add(entry_path)
+            with self.state() as state:
+                if os.path.exists(entry_path):
+                    state.entries.setdefault(entry_path, entry)
+
+    def check(self, path: Path, size: int, description: str):
+        path = get_existing_parent(path)
+        missing_free = self.evict(path=path, size=size)
+        if missing_free > 0:
+            free = shutil.disk_usage(path).free
+            raise BuildProcessError(
+                f"Not enough disk space for {description} in {path}: "
+                f"about {format_size(size)} needed, {format_size(free)} free, "
+                f"keeping at least {format_size(self.min_free)} free"
+            )
+
+
+disk_budget = DiskBudget()
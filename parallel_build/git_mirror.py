@@ -0,0 +1,182 @@
+import hashlib
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Callable
+
+import msgspec
+
+from parallel_build.disk_budget import disk_budget, register_evictor
+from parallel_build.utils import (
+    FileLock,
+    better_rmtree,
+    get_app_dir,
+    get_directory_size,
+)
+
+GIT_MIRRORS_PATH = Path(get_app_dir("ParallelBuild")) / "git_mirrors"
+DISK_BUDGET_KIND = "git mirror"
+
+
+class GitMirrorInfo(msgspec.Struct):
+    repository: str
+    last_fetch: float | None = None
+
+
+def get_mirror_name(git_repository: str):
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", git_repository).strip("-")[-40:]
+    digest = hashlib.sha1(git_repository.encode("utf-8")).hexdigest()[:10]
+    return f"{slug}-{digest}"
+
+
+class GitMirror:
+    """A bare mirror of a git repository, checked out in worktrees."""
+
+    def __init__(self, git_repository: str, name: str | None = None):
+        self.git_repository = git_repository
+        self.name = name or get_mirror_name(git_repository)
+        self.path = GIT_MIRRORS_PATH / f"{self.name}.git"
+        self.info_path = GIT_MIRRORS_PATH / f"{self.name}.json"
+        self.lock_path = GIT_MIRRORS_PATH / f"{self.name}.lock"
+
+    @classmethod
+    def list_all(cls):
+        if not GIT_MIRRORS_PATH.exists():
+            return []
+        mirrors = []
+        for info_path in sorted(GIT_MIRRORS_PATH.glob("*.json")):
+            try:
+                info = msgspec.json.decode(info_path.read_bytes(), type=GitMirrorInfo)
+            except msgspec.DecodeError:
+                continue
+            mirror = cls(info.repository, name=info_path.stem)
+            if not mirror.path.exists():
+                info_path.unlink(missing_ok=True)
+                continue
+            mirrors.append(mirror)
+        return mirrors
+
+    def lock(self):
+        GIT_MIRRORS_PATH.mkdir(parents=True, exist_ok=True)
+        return FileLock(self.lock_path)
+
+    @property
+    def info(self):
+        try:
+            return msgspec.json.decode(self.info_path.read_bytes(), type=GitMirrorInfo)
+        except (FileNotFoundError, msgspec.DecodeError):
+            return GitMirrorInfo(repository=self.git_repository)
+
+    @property
+    def worktrees(self):
+        worktrees_path = self.path / "worktrees"
+        if not worktrees_path.exists():
+            return []
+        worktrees = []
+        for worktree_path in worktrees_path.iterdir():
+            try:
+                git_file_path = (worktree_path / "gitdir").read_text().strip()
+            except OSError:
+                continue
+            if os.path.exists(git_file_path):
+                worktrees.append(worktree_path)
+        return worktrees
+
+    def git_command(self, *git_command):
+        return ["--git-dir", str(self.path), *git_command]
+
+    def update(
+        self,
+        run_git: Callable,
+        clone_options: list[str] | None = None,
+        fetch_options: list[str] | None = None,
+    ):
+        with self.lock():
+            if self.path.exists():
+                run_git(
+                    self.git_command(
+                        "fetch", *(fetch_options or []), "--prune", "origin"
+                    ),
+                    error_message=f"Cannot fetch {self.git_repository}",
+                    redirect_stderr_to_stdout=True,
+                )
+            else:
+                clone_path = self.path.with_name(
+                    f"{self.path.name}.tmp-{uuid.uuid4().hex}"
+                )
+                try:
+                    run_git(
+                        [
+                            "clone",
+                            "--mirror",
+                            *(clone_options or []),
+                            self.git_repository,
+                            str(clone_path),
+                        ],
+                        error_message=f"Cannot clone {self.git_repository}",
+                        redirect_stderr_to_stdout=True,
+                    )
+                    os.replace(clone_path, self.path)
+                finally:
+                    if clone_path.exists():
+                        better_rmtree(path=clone_path)
+            info = GitMirrorInfo(repository=self.git_repository, last_fetch=time.time())
+            self.info_path.write_bytes(msgspec.json.encode(info))
+        disk_budget.track(self.path, DISK_BUDGET_KIND, get_directory_size(self.path))
+
+    def default_branch(self, run_git: Callable):
+        return run_git(
+            self.git_command("symbolic-ref", "HEAD"), return_output=True
+        ).strip()
+
+    def add_worktree(
+        self, run_git: Callable, worktree_path: Path, no_checkout: bool = False
+    ):
+        with self.lock():
+            run_git(
+                self.git_command(
+                    "worktree",
+                    "add",
+                    "--detach",
+                    "--force",
+                    *(["--no-checkout"] if no_checkout else []),
+                    str(worktree_path),
+                    "HEAD",
+                ),
+                error_message=f"Cannot create a worktree in {worktree_path}",
+                redirect_stderr_to_stdout=True,
+            )
+
+    def remove_worktree(self, run_git: Callable, worktree_path: Path):
+        with self.lock():
+            if worktree_path.exists():
+                run_git(
+                    self.git_command(
+                        "worktree", "remove", "--force", str(worktree_path)
+                    ),
+                    redirect_stderr_to_stdout=True,
+                )
+            run_git(self.git_command("worktree", "prune"))
+
+    def delete(self):
+        with self.lock():
+            better_rmtree(path=self.path)
+            self.info_path.unlink(missing_ok=True)
+
+
+def evict_mirror(mirror_path: Path):
+    mirror = GitMirror(git_repository="", name=mirror_path.stem)
+    try:
+        with FileLock(mirror.lock_path, blocking=False):
+            if mirror.worktrees:
+                return False
+            better_rmtree(path=mirror.path)
+            mirror.info_path.unlink(missing_ok=True)
+    except BlockingIOError:
+        return False
+    return True
+
+
+register_evictor(DISK_BUDGET_KIND, evict_mirror)
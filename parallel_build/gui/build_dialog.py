@@ -2,7 +2,7 @@ import time
 from threading import Thread
 
 from PySide6.QtCore import Slot
-from PySide6.QtGui import QCloseEvent, QFont
+from PySide6.QtGui import QCloseEvent
 from PySide6.QtWidgets import (
     QDialog,
     QDialogButtonBox,
@@ -10,16 +10,15 @@ from PySide6.QtWidgets import (
     QLabel,
     QProgressBar,
     QPushButton,
-    QTextEdit,
     QVBoxLayout,
 )
 
+from parallel_build.config import Config
 from parallel_build.gui.build_thread import BuildThread
 from parallel_build.gui.elided_label import QElidedLabel
+from parallel_build.gui.log_view import RED_COLOR, LineType, LogView
 from parallel_build.utils import OperatingSystem
 
-RED_COLOR = "#ef4e40"
-
 
 class BuildDialog(QDialog):
     def __init__(self, parent):
@@ -38,9 +37,7 @@ class BuildDialog(QDialog):
         labels_layout.addWidget(self.build_step_label, stretch=0)
         labels_layout.addWidget(self.build_message_label, stretch=1)
 
-        self.output_text_area = QTextEdit()
-        self.output_text_area.setReadOnly(True)
-        self.output_text_area.setFont(QFont(OperatingSystem.monospace_font))
+        self.output_log_view = LogView(max_lines=Config.load().gui_log_max_lines)
 
         self.button_box = QDialogButtonBox()
         self.cancel_button = QPushButton("Cancel")
@@ -52,7 +49,7 @@ class BuildDialog(QDialog):
         layout = QVBoxLayout()
         layout.addWidget(self.progress_bar)
         layout.addLayout(labels_layout)
-        layout.addWidget(self.output_text_area)
+        layout.addWidget(self.output_log_view)
         layout.addWidget(self.button_box)
 
         self.setLayout(layout)
@@ -63,28 +60,12 @@ class BuildDialog(QDialog):
 
         self.should_close = False
 
-    def append_output_text(
-        self,
-        text: str,
-        bold: bool = False,
-        color: str | None = None,
-        add_space_before: bool = False,
-    ):
-        text = text.replace("\n", "<br />")
-        if bold:
-            text = f"<b>{text}</b>"
-        if color:
-            text = f"<span style='color: {color};'>{text}</span>"
-        if add_space_before:
-            text = f"<br />{text}"
-        self.output_text_area.append(text)
-
     def start_build_process(self, continuous: bool, project_name: str):
         self.thread.configure(continuous, project_name)
         self.thread.start()
 
     def on_build_start(self):
-        self.output_text_area.clear()
+        self.output_log_view.clear()
         self.progress_bar.setMinimum(0)
         self.progress_bar.setMaximum(0)
 
@@ -95,6 +76,7 @@ class BuildDialog(QDialog):
         self.progress_bar.setMinimum(0)
         self.progress_bar.setMaximum(100)
         self.progress_bar.setValue(100)
+        self.progress_bar.setTextVisible(False)
         self.cancel_button.setText("Close")
 
     def on_build_end(self, finished_with_success: bool):
@@ -111,10 +93,13 @@ class BuildDialog(QDialog):
         if self.should_close:
             return
         self.build_step_label.setText(build_step_name)
-        self.append_output_text(
-            f"// {build_step_name}",
-            bold=True,
-            add_space_before=self.output_text_area.toPlainText() != "",
+        self.progress_bar.setMaximum(0)
+        self.progress_bar.setTextVisible(False)
+        self.output_log_view.append_lines(
+            [f"// {build_step_name}"]
+            if self.output_log_view.is_empty
+            else ["", f"// {build_step_name}"],
+            LineType.step,
         )
 
     @Slot(str)
@@ -123,17 +108,26 @@ class BuildDialog(QDialog):
             return
         self.update_build_message_label_text(short_message.strip())
 
-    @Slot(str)
-    def on_build_progress(self, message: str):
+    @Slot(float, str)
+    def on_build_progress_estimate(self, progress: float, description: str):
+        if self.should_close:
+            return
+        self.progress_bar.setMaximum(100)
+        self.progress_bar.setValue(int(progress * 100))
+        self.progress_bar.setFormat(description)
+        self.progress_bar.setTextVisible(True)
+
+    @Slot(list)
+    def on_build_progress(self, messages: list[str]):
         if self.should_close:
             return
-        self.append_output_text(message)
+        self.output_log_view.append_lines(messages)
 
     @Slot(str)
     def on_build_error(self, error_message: str):
         if self.should_close:
             return
-        self.append_output_text(error_message, color=RED_COLOR)
+        self.output_log_view.append_lines([error_message], LineType.error)
         self.update_build_message_label_text(error_message.strip())
         self.build_message_label.setStyleSheet(f"color: {RED_COLOR};")
 
@@ -142,6 +136,7 @@ class BuildDialog(QDialog):
 
     def closeEvent(self, event: QCloseEvent):
         if self.thread.isFinished():
+            self.output_log_view.log_model.close_spill_file()
             return
 
         if self.should_close:
@@ -1,14 +1,18 @@
 from PySide6.QtCore import QObject, QThread, Signal
 
-from parallel_build.build_step import BuildStep
+from parallel_build.build_history import ProgressEstimate
+from parallel_build.build_step import BuildStep, EventBatcher
+from parallel_build.config import Config
+from parallel_build.disk_budget import disk_budget
 from parallel_build.main import BuildProcess
 
 
 class BuildSignals(QObject):
     build_step = Signal(str)
     build_short_progress = Signal(str)
-    build_progress = Signal(str)
+    build_progress = Signal(list)
     build_error = Signal(str)
+    build_progress_estimate = Signal(float, str)
     build_end = Signal(bool)
 
 
@@ -20,28 +24,47 @@ class BuildThread(QThread):
         self.signals.build_short_progress.connect(parent.on_build_short_progress)
         self.signals.build_progress.connect(parent.on_build_progress)
         self.signals.build_error.connect(parent.on_build_error)
+        self.signals.build_progress_estimate.connect(parent.on_build_progress_estimate)
         self.signals.build_end.connect(parent.on_build_end)
         self.build_process = None
         self.continuous = False
 
-        BuildStep.start.set(self.signals.build_step.emit)
-        BuildStep.short_message.set(self.signals.build_short_progress.emit)
-        BuildStep.long_message.set(self.signals.build_progress.emit)
-        BuildStep.error.set(self.signals.build_error.emit)
+        self.batcher = EventBatcher()
+        BuildStep.start.set(self.batcher.immediate(self.signals.build_step.emit))
+        BuildStep.short_message.set(
+            self.batcher.latest(self.signals.build_short_progress.emit)
+        )
+        BuildStep.long_message.set(
+            self.batcher.batched(self.signals.build_progress.emit)
+        )
+        BuildStep.error.set(self.batcher.immediate(self.signals.build_error.emit))
+        BuildStep.progress_estimate.set(
+            self.batcher.latest(self.emit_progress_estimate)
+        )
+
+    def emit_progress_estimate(self, estimate: ProgressEstimate):
+        self.signals.build_progress_estimate.emit(estimate.progress, str(estimate))
 
     def configure(self, continuous, project_name):
+        config = Config.load()
+        disk_budget.configure(config.disk_budget_mb, config.min_free_disk_mb)
         self.build_process = BuildProcess(
             project_name=project_name,
-            on_build_end=self.signals.build_end.emit,
+            config=config,
+            on_build_end=self.batcher.immediate(self.signals.build_end.emit),
         )
         self.continuous = continuous
 
     def run(self):
+        self.batcher.start()
         try:
             self.build_process.run(continuous=self.continuous)
         except Exception as e:
+            self.batcher.flush()
             self.signals.build_error.emit(str(e))
             self.signals.build_error.emit("Generic error")
+        finally:
+            self.batcher.close()
 
     def stop(self):
         if self.build_process:
@@ -0,0 +1,109 @@
+import collections
+import time
+from enum import IntEnum
+from pathlib import Path
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PySide6.QtGui import QColor, QFont
+from PySide6.QtWidgets import QAbstractItemView, QListView
+
+from parallel_build.utils import OperatingSystem, get_app_dir
+
+LOGS_PATH = Path(get_app_dir("ParallelBuild")) / "logs"
+RED_COLOR = "#ef4e40"
+
+
+class LineType(IntEnum):
+    message = 0
+    step = 1
+    error = 2
+
+
+class LogModel(QAbstractListModel):
+    def __init__(self, max_lines: int, parent=None):
+        super().__init__(parent)
+        self.max_lines = max(1, max_lines)
+        self.lines: collections.deque[tuple[LineType, str]] = collections.deque()
+        self.spill_path: Path | None = None
+        self.spill_file = None
+        self.error_color = QColor(RED_COLOR)
+        self.step_font = QFont(OperatingSystem.monospace_font)
+        self.step_font.setBold(True)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.lines)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        line_type, text = self.lines[index.row()]
+        match role:
+            case Qt.ItemDataRole.DisplayRole:
+                return text
+            case Qt.ItemDataRole.ForegroundRole if line_type == LineType.error:
+                return self.error_color
+            case Qt.ItemDataRole.FontRole if line_type == LineType.step:
+                return self.step_font
+        return None
+
+    def append_lines(self, texts: list[str], line_type: LineType = LineType.message):
+        lines = [(line_type, line) for text in texts for line in text.split("\n")]
+        if len(lines) > self.max_lines:
+            self.spill(lines[: -self.max_lines])
+            lines = lines[-self.max_lines :]
+
+        overflow = len(self.lines) + len(lines) - self.max_lines
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            self.spill([self.lines.popleft() for _ in range(overflow)])
+            self.endRemoveRows()
+
+        first_row = len(self.lines)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(lines) - 1)
+        self.lines.extend(lines)
+        self.endInsertRows()
+
+    def spill(self, lines: list[tuple[LineType, str]]):
+        if self.spill_file is None:
+            LOGS_PATH.mkdir(parents=True, exist_ok=True)
+            self.spill_path = LOGS_PATH / time.strftime("gui-%Y%m%d-%H%M%S.log")
+            self.spill_file = open(self.spill_path, "a", encoding="utf-8")
+        self.spill_file.write("".join(f"{text}\n" for _, text in lines))
+        self.spill_file.flush()
+
+    def clear(self):
+        self.beginResetModel()
+        self.lines.clear()
+        self.endResetModel()
+        self.close_spill_file()
+
+    def close_spill_file(self):
+        if self.spill_file:
+            self.spill_file.close()
+            self.spill_file = None
+
+
+class LogView(QListView):
+    def __init__(self, max_lines: int, parent=None):
+        super().__init__(parent)
+        self.log_model = LogModel(max_lines, self)
+        self.setModel(self.log_model)
+        self.setUniformItemSizes(True)
+        self.setFont(QFont(OperatingSystem.monospace_font))
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+
+    @property
+    def is_empty(self):
+        return self.log_model.rowCount() == 0
+
+    def append_lines(self, texts: list[str], line_type: LineType = LineType.message):
+        scroll_bar = self.verticalScrollBar()
+        follow = scroll_bar.value() >= scroll_bar.maximum()
+        self.log_model.append_lines(texts, line_type)
+        if follow:
+            self.scrollToBottom()
+
+    def clear(self):
+        self.log_model.clear()
@@ -23,6 +23,7 @@ from parallel_build.gui.project_dialogs import (
     EditGitProjectDialog,
     EditLocalProjectDialog,
 )
+from parallel_build.trash import trash
 from parallel_build.utils import OperatingSystem
 
 
@@ -162,6 +163,7 @@ def show_gui():
         myappid = "mycompany.myproduct.subproduct.version"
         ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
 
+    trash.start()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -0,0 +1,220 @@
+import hashlib
+import os
+import uuid
+from pathlib import Path
+
+import msgspec
+
+from parallel_build.build_step import BuildStep
+from parallel_build.config import BuildTarget
+from parallel_build.copier import ParallelCopier, format_size
+from parallel_build.disk_budget import disk_budget, register_evictor
+from parallel_build.exceptions import BuildProcessInterrupt
+from parallel_build.mirror import file_digest, scan_tree
+from parallel_build.snapshot import CopyStrategy, probe_strategies
+from parallel_build.unity_builder import get_editor_version
+from parallel_build.utils import (
+    FileLock,
+    better_rmtree,
+    clone_or_copy,
+    get_app_dir,
+    get_directory_size,
+    link_or_copy,
+)
+
+LIBRARY_CACHE_PATH = Path(get_app_dir("ParallelBuild")) / "library_cache"
+KEY_NAME = "key.json"
+STATE_NAME = "state.json"
+DISK_BUDGET_KIND = "Library cache"
+
+
+class LibraryCacheKey(msgspec.Struct):
+    editor_version: str
+    manifest_digest: str | None
+
+
+class LibraryState(msgspec.Struct):
+    digest: str
+    size: int
+
+
+def get_library_state(library_path: Path):
+    files = scan_tree(library_path)
+    digest = hashlib.sha256()
+    for relative_path in sorted(files):
+        size, mtime_ns = files[relative_path]
+        digest.update(f"{relative_path}\0{size}\0{mtime_ns}\n".encode("utf-8"))
+    return LibraryState(
+        digest=digest.hexdigest(), size=sum(size for size, _ in files.values())
+    )
+
+
+def get_manifest_digest(project_path: Path):
+    manifest_path = project_path / "Packages" / "manifest.json"
+    if not manifest_path.exists():
+        return None
+    return file_digest(manifest_path)
+
+
+def get_lock_path(cache_path: Path):
+    return cache_path.with_name(f"{cache_path.name}.lock")
+
+
+def evict_library_cache(cache_path: Path):
+    try:
+        with FileLock(get_lock_path(cache_path), blocking=False):
+            better_rmtree(path=cache_path)
+    except BlockingIOError:
+        return False
+    return True
+
+
+register_evictor(DISK_BUDGET_KIND, evict_library_cache)
+
+
+class LibraryCache(BuildStep):
+    """Keeps the `Library` folder of a project for each editor and target."""
+
+    name = "Library cache"
+
+    def __init__(
+        self,
+        project_name: str,
+        project_path: Path,
+        build_target: BuildTarget,
+        copy_workers: int | None = None,
+    ):
+        self.project_path = Path(project_path)
+        self.key = LibraryCacheKey(
+            editor_version=get_editor_version(self.project_path),
+            manifest_digest=get_manifest_digest(self.project_path),
+        )
+        self.cache_path = (
+            LIBRARY_CACHE_PATH
+            / project_name
+            / f"{self.key.editor_version}_{build_target.value}"
+        )
+        self.interrupt = False
+        self.copier = ParallelCopier(
+            workers=copy_workers, is_interrupted=lambda: self.interrupt
+        )
+
+    def lock(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        return FileLock(get_lock_path(self.cache_path))
+
+    def copy(self, src: Path, dst: Path, size: int, link: bool = False):
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        strategies = probe_strategies(src, dst.parent)
+        avoids_byte_copies = CopyStrategy.reflink in strategies or (
+            link and CopyStrategy.hardlink in strategies
+        )
+        if not avoids_byte_copies:
+            disk_budget.check(dst.parent, size, "the Library folder")
+        self.copier.copy_function = link_or_copy if link else clone_or_copy
+        self.copier.chunk_large_files = not avoids_byte_copies
+        try:
+            return self.copier.copytree(src, dst)
+        except BuildProcessInterrupt:
+            self.message.emit("\nLibrary cache copy stopped")
+            raise
+
+    def load_key(self):
+        try:
+            with open(self.cache_path / KEY_NAME, "rb") as file:
+                return msgspec.json.decode(file.read(), type=LibraryCacheKey)
+        except (FileNotFoundError, msgspec.DecodeError):
+            return None
+
+    def load_state(self):
+        try:
+            with open(self.cache_path / STATE_NAME, "rb") as file:
+                return msgspec.json.decode(file.read(), type=LibraryState)
+        except (FileNotFoundError, msgspec.DecodeError):
+            return None
+
+    @BuildStep.start_method
+    @BuildStep.end_method
+    def seed(self):
+        library_path = self.project_path / "Library"
+        if library_path.exists():
+            self.message.emit("Project already has a Library folder, nothing to seed")
+            return
+        with self.lock():
+            if not self.cache_path.exists():
+                self.message.emit("No cached Library folder yet")
+                return
+            if self.load_key() != self.key:
+                self.message.emit(
+                    "Packages or editor version changed, discarding cache"
+                )
+                better_rmtree(path=self.cache_path)
+                return
+
+            self.message.emit(f"Seeding Library folder from {self.cache_path}...")
+            seed_path = self.project_path / "Library.parallelbuild-seed"
+            if seed_path.exists():
+                better_rmtree(path=seed_path)
+            with disk_budget.using(self.cache_path):
+                disk_budget.touch(self.cache_path)
+                state = self.load_state()
+                copy_stats = self.copy(
+                    self.cache_path / "Library",
+                    seed_path,
+                    state.size
+                    if state
+                    else get_directory_size(self.cache_path / "Library"),
+                )
+        os.replace(seed_path, library_path)
+        self.message.emit(str(copy_stats))
+
+    @BuildStep.start_method
+    @BuildStep.end_method
+    def store(self, disposable_project: bool = False):
+        library_path = self.project_path / "Library"
+        if not library_path.exists():
+            return
+        state = get_library_state(library_path)
+        if self.load_key() == self.key and self.load_state() == state:
+            self.message.emit("Library folder unchanged, nothing to store")
+            disk_budget.touch(self.cache_path)
+            return
+
+        self.message.emit(
+            f"Storing Library folder ({format_size(state.size)}) in "
+            f"{self.cache_path}..."
+        )
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        staging_path = self.cache_path.with_name(
+            f"{self.cache_path.name}.tmp-{uuid.uuid4().hex}"
+        )
+        try:
+            copy_stats = self.copy(
+                library_path,
+                staging_path / "Library",
+                state.size,
+                link=disposable_project,
+            )
+            with open(staging_path / KEY_NAME, "wb") as file:
+                file.write(msgspec.json.encode(self.key))
+            with open(staging_path / STATE_NAME, "wb") as file:
+                file.write(msgspec.json.encode(state))
+        except BaseException:
+            better_rmtree(path=staging_path)
+            raise
+
+        old_cache_path = None
+        with self.lock():
+            if self.cache_path.exists():
+                old_cache_path = self.cache_path.with_name(
+                    f"{self.cache_path.name}.old-{uuid.uuid4().hex}"
+                )
+                os.replace(self.cache_path, old_cache_path)
+            os.replace(staging_path, self.cache_path)
+        if old_cache_path:
+            better_rmtree(path=old_cache_path)
+        self.message.emit(str(copy_stats))
+        disk_budget.track(self.cache_path, DISK_BUDGET_KIND, state.size)
+
+    def stop(self):
+        self.interrupt = True
@@ -0,0 +1,249 @@
+import gzip
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Iterator, Literal
+
+import msgspec
+
+from parallel_build.build_step import BuildStep
+from parallel_build.utils import get_app_dir
+
+BUILD_LOGS_PATH = Path(get_app_dir("ParallelBuild")) / "build_logs"
+BLOCK_LINES = 1000
+BLOCK_SIZE = 1024 * 1024
+COMPRESSION_LEVEL = 6
+thread_logs = threading.local()
+
+
+class LogIndexEntry(msgspec.Struct, omit_defaults=True):
+    kind: Literal["start", "block", "phase", "error", "end"]
+    line: int
+    offset: int
+    time: float
+    text: str | None = None
+    success: bool | None = None
+
+
+class BuildLog:
+    """A gzip compressed build log, with an index of its phases and errors."""
+
+    def __init__(self, log_path: Path):
+        self.log_path = Path(log_path)
+        self.index_path = self.log_path.with_name(
+            self.log_path.name.removesuffix(".log.gz") + ".index.jsonl"
+        )
+
+    @property
+    def project_name(self):
+        return self.log_path.parent.name
+
+    @property
+    def build_id(self):
+        return self.log_path.name.removesuffix(".log.gz")
+
+    @property
+    def size(self):
+        try:
+            return os.path.getsize(self.log_path)
+        except FileNotFoundError:
+            return 0
+
+    @classmethod
+    def list_all(cls, project_name: str | None = None):
+        if not BUILD_LOGS_PATH.exists():
+            return []
+        pattern = f"{project_name}/*.log.gz" if project_name else "*/*.log.gz"
+        return sorted(
+            (cls(log_path) for log_path in BUILD_LOGS_PATH.glob(pattern)),
+            key=lambda build_log: build_log.build_id,
+        )
+
+    @classmethod
+    def find(cls, project_name: str, build_id: str | None = None):
+        build_logs = cls.list_all(project_name)
+        if build_id is None:
+            return build_logs[-1] if build_logs else None
+        for build_log in build_logs:
+            if build_log.build_id == build_id:
+                return build_log
+
+    @property
+    def index(self) -> list[LogIndexEntry]:
+        decoder = msgspec.json.Decoder(LogIndexEntry)
+        entries = []
+        try:
+            with open(self.index_path, "rb") as file:
+                for line in file:
+                    try:
+                        entries.append(decoder.decode(line))
+                    except msgspec.DecodeError:
+                        break  # the build is still writing it
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def read_lines(
+        self, from_line: int = 0, to_line: int | None = None
+    ) -> Iterator[tuple[int, str]]:
+        offset, line_number = 0, 0
+        for entry in self.index:
+            if entry.kind in ("block", "phase") and entry.line <= from_line:
+                offset, line_number = entry.offset, entry.line
+        with open(self.log_path, "rb") as file:
+            file.seek(offset)
+            with gzip.GzipFile(fileobj=file) as log_file:
+                try:
+                    for raw_line in log_file:
+                        if to_line is not None and line_number >= to_line:
+                            return
+                        if line_number >= from_line:
+                            yield line_number, raw_line.decode(
+                                "utf-8", errors="replace"
+                            ).rstrip("\n")
+                        line_number += 1
+                except EOFError:
+                    return  # the last member is still being written
+
+    def phases(self):
+        index = self.index
+        phase_entries = [entry for entry in index if entry.kind == "phase"]
+        end_line = next((entry.line for entry in index if entry.kind == "end"), None)
+        return [
+            (
+                entry.text,
+                entry.line,
+                phase_entries[i + 1].line if i + 1 < len(phase_entries) else end_line,
+            )
+            for i, entry in enumerate(phase_entries)
+        ]
+
+
+class BuildLogWriter:
+    def __init__(self, project_name: str):
+        project_logs_path = BUILD_LOGS_PATH / project_name
+        project_logs_path.mkdir(parents=True, exist_ok=True)
+        build_id = time.strftime("%Y%m%d-%H%M%S")
+        log_path = project_logs_path / f"{build_id}.log.gz"
+        count = 1
+        while log_path.exists():
+            count += 1
+            log_path = project_logs_path / f"{build_id}-{count}.log.gz"
+        self.build_log = BuildLog(log_path)
+        self.log_file = open(self.build_log.log_path, "wb")
+        self.index_file = open(self.build_log.index_path, "wb")
+        self.encoder = msgspec.json.Encoder()
+        self.lock = threading.Lock()
+        self.block: list[bytes] = []
+        self.block_size = 0
+        self.block_offset = 0
+        self.line_count = 0
+        self.holds = 0
+        self.closing = False
+        self.success = True
+        self.write_index("start")
+        self.add_thread()
+
+    def add_thread(self):
+        thread_logs.writer = self
+
+    @property
+    def is_writing_thread(self):
+        return getattr(thread_logs, "writer", None) is self
+
+    def subscribe(self):
+        BuildStep.start.add(self.on_phase)
+        BuildStep.long_message.add(self.on_message)
+        BuildStep.error.add(self.on_error)
+
+    def unsubscribe(self):
+        BuildStep.start.remove(self.on_phase)
+        BuildStep.long_message.remove(self.on_message)
+        BuildStep.error.remove(self.on_error)
+
+    def write_index(self, kind: str, text: str | None = None, **fields):
+        entry = LogIndexEntry(
+            kind=kind,
+            line=self.line_count,
+            offset=self.block_offset,
+            time=time.time(),
+            text=text,
+            **fields,
+        )
+        self.index_file.write(self.encoder.encode(entry) + b"\n")
+        self.index_file.flush()
+
+    def write_lines(self, text: str):
+        for line in text.split("\n"):
+            encoded_line = line.encode("utf-8") + b"\n"
+            self.block.append(encoded_line)
+            self.block_size += len(encoded_line)
+            self.line_count += 1
+            if len(self.block) >= BLOCK_LINES or self.block_size >= BLOCK_SIZE:
+                self.flush_block()
+                self.write_index("block")
+
+    def flush_block(self):
+        if not self.block:
+            return
+        compressor = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, 31)
+        self.log_file.write(
+            compressor.compress(b"".join(self.block)) + compressor.flush()
+        )
+        self.log_file.flush()
+        self.block_offset = self.log_file.tell()
+        self.block = []
+        self.block_size = 0
+
+    def on_phase(self, name: str):
+        if not self.is_writing_thread:
+            return
+        with self.lock:
+            self.flush_block()
+            self.write_index("phase", name)
+            self.write_lines(f"// {name}")
+
+    def on_message(self, text: str):
+        if not self.is_writing_thread:
+            return
+        with self.lock:
+            self.write_lines(text)
+
+    def on_error(self, text: str):
+        if not self.is_writing_thread:
+            return
+        with self.lock:
+            self.write_index("error", text)
+            self.write_lines(text)
+
+    def hold(self):
+        with self.lock:
+            self.holds += 1
+
+    def release(self, success: bool):
+        with self.lock:
+            self.holds -= 1
+            self.success = self.success and success
+            should_close = self.holds == 0 and self.closing
+        if should_close:
+            self._close()
+
+    def close(self, success: bool):
+        with self.lock:
+            self.closing = True
+            self.success = self.success and success
+            if self.is_writing_thread:
+                thread_logs.writer = None
+            should_close = self.holds == 0
+        if should_close:
+            self._close()
+
+    def _close(self):
+        self.unsubscribe()
+        with self.lock:
+            self.flush_block()
+            self.write_index("end", success=self.success)
+            self.log_file.close()
+            self.index_file.close()
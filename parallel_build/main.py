@@ -1,12 +1,25 @@
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
 from typing import Callable
 
+from parallel_build.build_cache import BuildCache
 from parallel_build.build_step import BuildStep
-from parallel_build.config import Config
+from parallel_build.config import Config, ProjectBuildConfig, ProjectPostBuildAction
+from parallel_build.disk_budget import disk_budget
 from parallel_build.exceptions import BuildProcessError, BuildProcessInterrupt
-from parallel_build.post_build import get_post_build_action
+from parallel_build.library_cache import LibraryCache
+from parallel_build.log_store import BuildLogWriter
+from parallel_build.matrix import TargetResult, TargetWorkspace
+from parallel_build.pipeline import PostBuildPipeline, stage_build
+from parallel_build.post_build import get_post_build_action, get_post_build_dependencies
 from parallel_build.source import get_source
-from parallel_build.unity_builder import UnityBuilder
+from parallel_build.trash import trash
+from parallel_build.unity_builder import UnityBuilder, get_build_path
 from parallel_build.unity_hub import UnityRecentlyUsedProjectsObserver
+from parallel_build.utils import get_directory_size
+from parallel_build.workspace import WorkspaceRoot
 
 
 def get_project(config: Config, project_name: str):
@@ -17,82 +30,392 @@ def get_project(config: Config, project_name: str):
 
 class BuildProcess:
     def __init__(
-        self, project_name: str, on_build_end: Callable[[bool], None] | None = None
+        self,
+        project_name: str,
+        on_build_end: Callable[[bool], None] | None = None,
+        config: Config | None = None,
     ):
-        config = Config.load()
+        config = config or Config.load()
         project = get_project(config, project_name)
         if project is None:
             raise Exception(f"Project '{project_name}' not found")
+        targets = [build_config.target for build_config, _ in project.build_targets]
+        for target in set(targets):
+            if targets.count(target) > 1:
+                raise Exception(
+                    f"Project '{project_name}' has the {target.value} target "
+                    "more than once"
+                )
+        for _, post_build in project.build_targets:
+            get_post_build_dependencies(post_build)
         self.project = project
         self.git_polling_interval = config.git_polling_interval
-        self.current_build_step: BuildStep = None
+        self.git_polling_max_interval = config.git_polling_max_interval
+        self.copy_workers = config.copy_workers
+        self.max_parallel_targets = config.max_parallel_targets
+        self.max_parallel_post_build_actions = config.max_parallel_post_build_actions
+        self.pipelined_continuous_builds = config.pipelined_continuous_builds
+        self.max_pending_post_builds = config.max_pending_post_builds
+        self.post_build_pipeline: PostBuildPipeline | None = None
+        self.build_number = 0
+        build_targets = self.project.build_targets
+        self.workspace_root = WorkspaceRoot(
+            path=project.source.workspace_root or config.workspace_root,
+            ram_disk=project.source.ram_disk,
+            ram_disk_path=config.ram_disk_path,
+            build_memory_mb=config.build_memory_mb,
+            copies=1 + min(len(build_targets) - 1, max(1, self.max_parallel_targets)),
+            size_estimate_keys=[
+                self.build_size_key(build_config) for build_config, _ in build_targets
+            ],
+        )
+        self.current_build_steps: dict[int, BuildStep] = {}
+        self.log_writer: BuildLogWriter | None = None
         self.interrupt = False
         self.on_build_end = on_build_end
 
+    @property
+    def current_build_step(self):
+        return self.current_build_steps.get(threading.get_ident())
+
+    @current_build_step.setter
+    def current_build_step(self, build_step: BuildStep):
+        self.current_build_steps[threading.get_ident()] = build_step
+
     def run(self, continuous: bool):
         self.interrupt = False
         finished_with_success = True
         build_count = 0
+        self.post_build_pipeline = (
+            PostBuildPipeline(
+                self.run_post_build,
+                max_pending=self.max_pending_post_builds,
+                is_interrupted=lambda: self.interrupt,
+                staging_root=self.workspace_root.persistent_path,
+            )
+            if continuous and self.pipelined_continuous_builds
+            else None
+        )
         try:
-            with get_source(
+            with self.post_build_pipeline or nullcontext(), get_source(
                 self.project.name,
-                self.project.source.type,
-                self.project.source.value,
+                self.project.source,
                 git_polling_interval=self.git_polling_interval,
+                git_polling_max_interval=self.git_polling_max_interval,
+                copy_workers=self.copy_workers,
+                build_path=self.project.build.path,
+                workspace_root=self.workspace_root,
             ) as source:
                 while not self.interrupt:
-                    try:
-                        BuildStep.start.emit(f"Build #{build_count+1}")
-                        self.current_build_step = source
-
-                        with source.temporary_project() as temp_project_path:
-                            if self.interrupt:
-                                raise BuildProcessInterrupt
-
-                            builder = UnityBuilder(
-                                project_name=self.project.name,
-                                project_path=temp_project_path,
-                                build_target=self.project.build.target,
-                                build_method=self.project.build.method,
-                                build_path=self.project.build.path,
-                            )
-                            self.current_build_step = builder
-                            observer = UnityRecentlyUsedProjectsObserver(
-                                temp_project_path
-                            )
-                            builder.progress.set(observer.find_and_remove)
-                            return_value = builder.run()
-                            if return_value != 0:
-                                print("\a")
-                                finished_with_success = False
-                                raise BuildProcessError(
-                                    f"Unity build error ({return_value})"
-                                )
+                    if self.post_build_pipeline:
+                        self.post_build_pipeline.check()
+                    with self.build_log():
+                        try:
+                            self.build_number = build_count + 1
+                            BuildStep.start.emit(f"Build #{build_count+1}")
+                            self.current_build_step = source
 
-                            for build_action in self.project.post_build:
+                            with source.temporary_project() as temp_project_path:
                                 if self.interrupt:
                                     raise BuildProcessInterrupt
-                                post_build_action = get_post_build_action(
-                                    build_action, builder.build_path
-                                )
-                                self.current_build_step = post_build_action
-                                post_build_action.run()
 
+                                build_targets = self.project.build_targets
+                                if len(build_targets) == 1:
+                                    build_config, post_build = build_targets[0]
+                                    self.build_target(
+                                        temp_project_path,
+                                        build_config,
+                                        post_build,
+                                        disposable_project=source.disposable_snapshots,
+                                    )
+                                else:
+                                    self.build_matrix(temp_project_path, build_targets)
+
+                                print("\a")
+                            BuildStep.end.emit(f"Build #{build_count + 1}")
+                            build_count += 1
+                            if not continuous:
+                                break
+                        except BuildProcessError as e:
                             print("\a")
-                        BuildStep.end.emit(f"Build #{build_count + 1}")
-                        build_count += 1
-                        if not continuous:
-                            break
-                    except BuildProcessError as e:
-                        BuildStep.error.emit(str(e))
-                        raise BuildProcessInterrupt
+                            BuildStep.error.emit(str(e))
+                            raise BuildProcessInterrupt
         except BuildProcessInterrupt:
             finished_with_success = False
+        if self.post_build_pipeline and self.post_build_pipeline.errors:
+            finished_with_success = False
 
         if self.on_build_end:
             self.on_build_end(finished_with_success)
 
+    @contextmanager
+    def build_log(self):
+        log_writer = BuildLogWriter(self.project.name)
+        log_writer.subscribe()
+        self.log_writer = log_writer
+        success = False
+        try:
+            yield log_writer
+            success = True
+        finally:
+            log_writer.close(success)
+
+    def build_target(
+        self,
+        project_path: Path,
+        build_config: ProjectBuildConfig,
+        post_build: list[ProjectPostBuildAction],
+        disposable_project: bool,
+    ):
+        build_cache = None
+        if build_config.build_cache:
+            build_cache = BuildCache(
+                project_name=self.project.name,
+                project_path=project_path,
+                build_config=build_config,
+            )
+            self.current_build_step = build_cache
+            if build_cache.restore():
+                self.finish_build(
+                    post_build,
+                    get_build_path(project_path, build_config.path),
+                    project_path,
+                )
+                return
+
+        library_cache = None
+        if build_config.library_cache:
+            library_cache = LibraryCache(
+                project_name=self.project.name,
+                project_path=project_path,
+                build_target=build_config.target,
+                copy_workers=self.copy_workers,
+            )
+            self.current_build_step = library_cache
+            library_cache.seed()
+
+        builder = UnityBuilder(
+            project_name=self.project.name,
+            project_path=project_path,
+            build_target=build_config.target,
+            build_method=build_config.method,
+            build_path=build_config.path,
+        )
+        self.current_build_step = builder
+        size_estimate_key = self.build_size_key(build_config)
+        disk_budget.check(
+            project_path,
+            disk_budget.size_estimate(size_estimate_key),
+            f"the {build_config.target.value} build",
+        )
+        library_size = get_directory_size(project_path / "Library")
+        observer = UnityRecentlyUsedProjectsObserver(project_path)
+        with builder.periodic_task(observer.find_and_remove, observer.interval):
+            return_value = builder.run()
+        if return_value != 0:
+            raise BuildProcessError(f"Unity build error ({return_value})")
+        build_path = builder.build_path
+        build_dir = build_path.parent if build_path.is_file() else build_path
+        disk_budget.remember_size(
+            size_estimate_key,
+            get_directory_size(build_dir)
+            + get_directory_size(project_path / "Library")
+            - library_size,
+        )
+
+        if library_cache:
+            self.current_build_step = library_cache
+            library_cache.store(disposable_project=disposable_project)
+
+        if build_cache:
+            self.current_build_step = build_cache
+            build_cache.store(disposable_project=disposable_project)
+
+        self.finish_build(post_build, builder.build_path, project_path)
+
+    def build_size_key(self, build_config: ProjectBuildConfig):
+        return f"{self.project.name}/{build_config.target.value}/build"
+
+    def finish_build(
+        self,
+        post_build: list[ProjectPostBuildAction],
+        build_path: Path,
+        project_path: Path,
+    ):
+        if not post_build:
+            return
+        if not self.post_build_pipeline:
+            if not self.workspace_root.is_in_ram(project_path):
+                self.run_post_build(post_build, build_path)
+                return
+            staging_dir, staged_build_path = stage_build(
+                build_path, project_path, self.workspace_root.persistent_path
+            )
+            BuildStep.message.emit(f"Build moved out of the RAM disk to {staging_dir}")
+            try:
+                self.run_post_build(post_build, staged_build_path)
+            finally:
+                trash.delete(staging_dir)
+            return
+        name = f"Build #{self.build_number}"
+        parent_thread = threading.current_thread()
+        if parent_thread is not threading.main_thread():
+            name = f"{parent_thread.name}/{name}"
+        self.post_build_pipeline.submit(
+            name, post_build, build_path, project_path, log_writer=self.log_writer
+        )
+
+    def run_post_build(
+        self, post_build: list[ProjectPostBuildAction], build_path: Path
+    ):
+        if not post_build:
+            return
+        dependencies = get_post_build_dependencies(post_build)
+        parent_thread = threading.current_thread()
+
+        def run_action(index: int):
+            build_action = post_build[index]
+            thread_name = build_action.display_name
+            if parent_thread is not threading.main_thread():
+                thread_name = f"{parent_thread.name}/{thread_name}"
+            threading.current_thread().name = thread_name
+            if self.log_writer:
+                self.log_writer.add_thread()
+            post_build_action = get_post_build_action(
+                build_action,
+                build_path,
+                copy_workers=self.copy_workers,
+            )
+            self.current_build_step = post_build_action
+            try:
+                if self.interrupt:
+                    raise BuildProcessInterrupt
+                post_build_action.run()
+            finally:
+                self.current_build_steps.pop(threading.get_ident(), None)
+
+        waiting = set(range(len(post_build)))
+        succeeded: set[int] = set()
+        errors: dict[int, str] = {}
+        running = {}
+        with ThreadPoolExecutor(
+            max_workers=max(1, self.max_parallel_post_build_actions)
+        ) as executor:
+            while waiting or running:
+                for index in sorted(waiting):
+                    if self.interrupt:
+                        break
+                    if not dependencies[index] <= succeeded:
+                        continue
+                    waiting.discard(index)
+                    running[executor.submit(run_action, index)] = index
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    try:
+                        future.result()
+                        succeeded.add(index)
+                    except BuildProcessInterrupt:
+                        pass
+                    except BuildProcessError as e:
+                        errors[index] = str(e)
+                        BuildStep.error.emit(f"{post_build[index].display_name}: {e}")
+                failed = set(errors)
+                while skipped := {
+                    index for index in waiting if dependencies[index] & failed
+                }:
+                    waiting -= skipped
+                    failed |= skipped
+
+        if self.interrupt:
+            raise BuildProcessInterrupt
+        if errors:
+            skipped_count = len(post_build) - len(succeeded) - len(errors)
+            raise BuildProcessError(
+                f"{len(errors)} of {len(post_build)} post build actions failed"
+                + (f", {skipped_count} skipped" if skipped_count else "")
+            )
+
+    def build_matrix(
+        self,
+        snapshot_path: Path,
+        build_targets: list[tuple[ProjectBuildConfig, list[ProjectPostBuildAction]]],
+    ):
+        results = [
+            TargetResult(build_config.target) for build_config, _ in build_targets
+        ]
+        workspaces_created = [threading.Event() for _ in build_targets]
+        parent_thread = threading.current_thread()
+
+        def wait_for_workspaces():
+            BuildStep.message.emit("Waiting for the workspaces of the other targets...")
+            for workspace_created in workspaces_created[1:]:
+                while not workspace_created.wait(0.5):
+                    if self.interrupt:
+                        raise BuildProcessInterrupt
+
+        def build(index: int):
+            build_config, post_build = build_targets[index]
+            thread_name = build_config.target.value
+            if parent_thread is not threading.main_thread():
+                thread_name = f"{parent_thread.name}/{thread_name}"
+            threading.current_thread().name = thread_name
+            self.log_writer.add_thread()
+            results[index].start()
+            workspace = None
+            try:
+                project_path = snapshot_path
+                if index > 0:
+                    workspace = TargetWorkspace(
+                        snapshot_path, build_config.target, self.copy_workers
+                    )
+                    self.current_build_step = workspace
+                    try:
+                        project_path = workspace.create()
+                    finally:
+                        workspaces_created[index].set()
+                else:
+                    wait_for_workspaces()
+                if self.interrupt:
+                    raise BuildProcessInterrupt
+                self.build_target(
+                    project_path,
+                    build_config,
+                    post_build,
+                    disposable_project=workspace is not None,
+                )
+                results[index].finish()
+            except BuildProcessInterrupt:
+                results[index].finish("Stopped")
+            except BuildProcessError as e:
+                results[index].finish(str(e))
+                BuildStep.error.emit(f"{build_config.target.value}: {e}")
+            finally:
+                workspaces_created[index].set()
+                self.current_build_steps.pop(threading.get_ident(), None)
+                if workspace:
+                    workspace.delete()
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, self.max_parallel_targets),
+            thread_name_prefix=self.project.name,
+        ) as executor:
+            list(executor.map(build, [*range(1, len(build_targets)), 0]))
+
+        BuildStep.start.emit("Build summary")
+        for result in results:
+            BuildStep.long_message.emit(str(result))
+        if self.interrupt:
+            raise BuildProcessInterrupt
+        failed_count = len([result for result in results if not result.success])
+        if failed_count:
+            raise BuildProcessError(
+                f"{failed_count} of {len(results)} targets failed to build"
+            )
+
     def stop(self):
         self.interrupt = True
-        if self.current_build_step:
-            self.current_build_step.stop()
+        for build_step in list(self.current_build_steps.values()):
+            build_step.stop()
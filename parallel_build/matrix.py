@@ -0,0 +1,99 @@
+import time
+from pathlib import Path
+
+from parallel_build.build_step import BuildStep
+from parallel_build.config import BuildTarget, SnapshotMode
+from parallel_build.copier import ParallelCopier
+from parallel_build.disk_budget import disk_budget
+from parallel_build.exceptions import BuildProcessError, BuildProcessInterrupt
+from parallel_build.mirror import scan_tree
+from parallel_build.snapshot import SnapshotCopy, probe_strategies
+from parallel_build.source import ignore_patterns
+from parallel_build.trash import trash
+
+
+class TargetWorkspace(BuildStep):
+    name = "Target workspace"
+
+    def __init__(
+        self,
+        snapshot_path: Path,
+        build_target: BuildTarget,
+        copy_workers: int | None = None,
+    ):
+        self.snapshot_path = Path(snapshot_path)
+        self.path = self.snapshot_path.with_name(
+            f"{self.snapshot_path.name}_{build_target.value}"
+        )
+        self.interrupt = False
+        self.copier = ParallelCopier(
+            workers=copy_workers, is_interrupted=lambda: self.interrupt
+        )
+
+    @BuildStep.start_method
+    @BuildStep.end_method
+    def create(self):
+        trash.delete(self.path)
+        self.message.emit(f"Copying {self.snapshot_path} to {self.path}...")
+        snapshot_copy = SnapshotCopy(
+            self.snapshot_path,
+            SnapshotMode.clone,
+            probe_strategies(self.snapshot_path, self.path.parent),
+        )
+        self.copier.copy_function = snapshot_copy
+        self.copier.chunk_large_files = not snapshot_copy.avoids_byte_copies
+        if not snapshot_copy.avoids_byte_copies:
+            files = scan_tree(
+                self.snapshot_path, ignore=ignore_patterns(self.snapshot_path)
+            )
+            disk_budget.check(
+                self.path,
+                sum(size for size, _ in files.values()),
+                f"the {self.path.name} workspace",
+            )
+        try:
+            copy_stats = self.copier.copytree(
+                self.snapshot_path,
+                self.path,
+                ignore=ignore_patterns(self.snapshot_path),
+            )
+        except BuildProcessInterrupt:
+            self.message.emit("\nTarget workspace copy stopped")
+            raise
+        except FileNotFoundError as e:
+            raise BuildProcessError(e)
+        self.message.emit(str(copy_stats))
+        self.message.emit(snapshot_copy.report())
+        return self.path
+
+    def delete(self):
+        trash.delete(self.path)
+
+    def stop(self):
+        self.interrupt = True
+
+
+class TargetResult:
+    def __init__(self, build_target: BuildTarget):
+        self.build_target = build_target
+        self.start_time = time.time()
+        self.duration: float | None = None
+        self.error: str | None = None
+
+    def start(self):
+        self.start_time = time.time()
+
+    @property
+    def success(self):
+        return self.duration is not None and self.error is None
+
+    def finish(self, error: str | None = None):
+        self.duration = time.time() - self.start_time
+        self.error = error
+
+    def __str__(self):
+        if self.success:
+            return (
+                f"[✓] {self.build_target.value}: built in {self.duration:.2f} seconds"
+            )
+        return f"[✘] {self.build_target.value}: {self.error or 'not finished'}"
@@ -0,0 +1,258 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable
+
+import msgspec
+
+from parallel_build.copier import ParallelCopier
+from parallel_build.disk_budget import disk_budget, register_evictor
+from parallel_build.utils import FileLock, better_rmtree, get_app_dir
+
+WORKSPACES_PATH = Path(get_app_dir("ParallelBuild")) / "workspaces"
+MANIFEST_NAME = "manifest.json"
+DISK_BUDGET_KIND = "workspace mirror"
+
+
+class MirrorEntry(msgspec.Struct, array_like=True):
+    size: int
+    mtime_ns: int
+    digest: str | None = None
+
+
+def file_digest(path: str | Path):
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def scan_tree(root: Path, ignore: Callable | None = None):
+    """Returns `{relative path: (size, mtime_ns)}` for the files in `root`."""
+    files = {}
+    stack = [(str(root), "")]
+    while stack:
+        directory, relative_directory = stack.pop()
+        with os.scandir(directory) as iterator:
+            entries = list(iterator)
+        ignored = (
+            set(ignore(directory, [entry.name for entry in entries])) if ignore else ()
+        )
+        for entry in entries:
+            if entry.name in ignored:
+                continue
+            relative_path = f"{relative_directory}{entry.name}"
+            if entry.is_dir():
+                stack.append((entry.path, f"{relative_path}/"))
+            else:
+                stat = entry.stat()
+                files[relative_path] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def get_lock_path(workspace_path: Path):
+    return workspace_path.with_name(f"{workspace_path.name}.lock")
+
+
+def evict_workspace(workspace_path: Path):
+    try:
+        with FileLock(get_lock_path(workspace_path), blocking=False):
+            better_rmtree(path=workspace_path)
+    except BlockingIOError:
+        return False
+    return True
+
+
+register_evictor(DISK_BUDGET_KIND, evict_workspace)
+
+
+class WorkspaceMirror:
+    """A copy of a project, kept in sync with it incrementally."""
+
+    def __init__(
+        self,
+        project_name: str,
+        project_path: Path,
+        ignore: Callable | None = None,
+        checksum: bool = False,
+    ):
+        self.source_path = Path(project_path)
+        self.workspace_path = WORKSPACES_PATH / project_name
+        self.project_path = self.workspace_path / project_name
+        self.manifest_path = self.workspace_path / MANIFEST_NAME
+        self.ignore = ignore
+        self.checksum = checksum
+
+    def lock(self):
+        WORKSPACES_PATH.mkdir(parents=True, exist_ok=True)
+        return FileLock(get_lock_path(self.workspace_path))
+
+    def workspace_ignore(self, path, names):
+        if self.ignore is None:
+            return []
+        relative_path = Path(path).relative_to(self.project_path)
+        return self.ignore(str(self.source_path / relative_path), names)
+
+    def load_manifest(self) -> dict[str, MirrorEntry]:
+        if not self.manifest_path.exists() or not self.project_path.exists():
+            return {}
+        with open(self.manifest_path, "rb") as file:
+            try:
+                return msgspec.json.decode(file.read(), type=dict[str, MirrorEntry])
+            except msgspec.DecodeError:
+                return {}
+
+    def save_manifest(self, manifest: dict[str, MirrorEntry]):
+        temp_manifest_path = self.manifest_path.with_suffix(".tmp")
+        with open(temp_manifest_path, "wb") as file:
+            file.write(msgspec.json.encode(manifest))
+        os.replace(temp_manifest_path, self.manifest_path)
+
+    def is_in_sync(self, entry: MirrorEntry | None, size: int, mtime_ns: int, path):
+        if entry is None or (entry.size, entry.mtime_ns) != (size, mtime_ns):
+            return False
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == (entry.size, entry.mtime_ns)
+
+    def sync(
+        self,
+        copier: ParallelCopier,
+        is_interrupted: Callable[[], bool] = lambda: False,
+        check_space: Callable[[int], None] | None = None,
+    ):
+        self.project_path.mkdir(parents=True, exist_ok=True)
+        manifest = self.load_manifest()
+        source_files = scan_tree(self.source_path, self.ignore)
+
+        to_copy = []
+        for relative_path, (size, mtime_ns) in source_files.items():
+            entry = manifest.get(relative_path)
+            if not self.is_in_sync(
+                entry, size, mtime_ns, self.project_path / relative_path
+            ):
+                to_copy.append(relative_path)
+        removed = {
+            relative_path: manifest[relative_path]
+            for relative_path in manifest.keys() - source_files.keys()
+        }
+        untracked = (
+            scan_tree(self.project_path, self.workspace_ignore).keys()
+            - source_files.keys()
+            - manifest.keys()
+        )
+
+        deleted_count = 0
+        try:
+            renamed = self._apply_renames(manifest, source_files, to_copy, removed)
+            pending = {}
+            for relative_path in to_copy:
+                if relative_path in renamed:
+                    continue
+                source_path = self.source_path / relative_path
+                size, mtime_ns = source_files[relative_path]
+                target_path = self.project_path / relative_path
+                entry = manifest.get(relative_path)
+                digest = None
+                if self.checksum:
+                    digest = file_digest(source_path)
+                    if (
+                        entry is not None
+                        and entry.digest == digest
+                        and target_path.exists()
+                    ):
+                        os.utime(target_path, ns=(mtime_ns, mtime_ns))
+                        manifest[relative_path] = MirrorEntry(size, mtime_ns, digest)
+                        continue
+                target_path.parent.mkdir(parents=True, exist_ok=True)
+                pending[str(target_path)] = (
+                    relative_path,
+                    MirrorEntry(size, mtime_ns, digest),
+                )
+
+            if check_space:
+                check_space(sum(entry.size for _, entry in pending.values()))
+
+            def on_done(src, dst):
+                relative_path, entry = pending[dst]
+                manifest[relative_path] = entry
+
+            copy_stats = copier.copy_files(
+                (
+                    (str(self.source_path / relative_path), target_path, entry.size)
+                    for target_path, (relative_path, entry) in pending.items()
+                ),
+                on_done=on_done,
+            )
+
+            for relative_path in removed:
+                if is_interrupted():
+                    break
+                self._remove(relative_path)
+                del manifest[relative_path]
+                deleted_count += 1
+            for relative_path in untracked:
+                if is_interrupted():
+                    break
+                self._remove(relative_path)
+                deleted_count += 1
+        finally:
+            self.save_manifest(manifest)
+            disk_budget.track(
+                self.workspace_path,
+                DISK_BUDGET_KIND,
+                sum(entry.size for entry in manifest.values()),
+            )
+        return len(pending), len(renamed), deleted_count, copy_stats
+
+    def _apply_renames(self, manifest, source_files, to_copy, removed):
+        removed_by_stat = {}
+        for relative_path, entry in removed.items():
+            removed_by_stat.setdefault((entry.size, entry.mtime_ns), []).append(
+                relative_path
+            )
+        renamed = set()
+        for relative_path in to_copy:
+            if relative_path in manifest:
+                continue
+            candidates = removed_by_stat.get(source_files[relative_path])
+            if not candidates:
+                continue
+            old_relative_path = candidates.pop()
+            old_entry = removed.pop(old_relative_path)
+            old_path = self.project_path / old_relative_path
+            if not self.is_in_sync(
+                old_entry, old_entry.size, old_entry.mtime_ns, old_path
+            ):
+                removed[old_relative_path] = old_entry
+                continue
+            if self.checksum and old_entry.digest != file_digest(
+                self.source_path / relative_path
+            ):
+                removed[old_relative_path] = old_entry
+                continue
+            new_path = self.project_path / relative_path
+            new_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(old_path, new_path)
+            del manifest[old_relative_path]
+            manifest[relative_path] = old_entry
+            self._remove_empty_parents(old_path)
+            renamed.add(relative_path)
+        return renamed
+
+    def _remove(self, relative_path: str):
+        path = self.project_path / relative_path
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        self._remove_empty_parents(path)
+
+    def _remove_empty_parents(self, path: Path):
+        parent = path.parent
+        while parent != self.project_path:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
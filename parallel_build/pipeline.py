@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable
+
+from parallel_build.build_step import BuildStep
+from parallel_build.config import ProjectPostBuildAction
+from parallel_build.exceptions import BuildProcessError, BuildProcessInterrupt
+from parallel_build.log_store import BuildLogWriter
+from parallel_build.trash import trash
+from parallel_build.utils import better_rmtree, clone_or_copy
+from parallel_build.workspace import PROCESS_TEMP_DIR_PREFIX
+
+
+def stage_build(build_path: Path, project_path: Path, staging_root: Path | None = None):
+    build_path = Path(build_path)
+    build_dir = build_path.parent if build_path.is_file() else build_path
+    staging_dir = Path(
+        tempfile.mkdtemp(prefix=PROCESS_TEMP_DIR_PREFIX, dir=staging_root)
+    )
+    staged_dir = staging_dir / build_dir.name
+    try:
+        if build_dir.is_relative_to(project_path):
+            try:
+                os.replace(build_dir, staged_dir)
+            except OSError:
+                shutil.move(build_dir, staged_dir)
+        else:
+            shutil.copytree(build_dir, staged_dir, copy_function=clone_or_copy)
+    except (OSError, shutil.Error) as e:
+        better_rmtree(path=staging_dir)
+        raise BuildProcessError(f"Cannot stage the build {build_path}: {e}")
+    if build_dir != build_path:
+        return staging_dir, staged_dir / build_path.name
+    return staging_dir, staged_dir
+
+
+class PostBuildPipeline:
+    """Runs the post builds of continuous builds in the background."""
+
+    def __init__(
+        self,
+        run_post_build: Callable[[list[ProjectPostBuildAction], Path], None],
+        max_pending: int = 1,
+        is_interrupted: Callable[[], bool] = lambda: False,
+        staging_root: Path | None = None,
+    ):
+        self.run_post_build = run_post_build
+        self.max_pending = max(1, max_pending)
+        self.is_interrupted = is_interrupted
+        self.staging_root = staging_root
+        self.slots = threading.BoundedSemaphore(self.max_pending)
+        self.lock = threading.Lock()
+        self.threads: list[threading.Thread] = []
+        self.errors: list[str] = []
+
+    def acquire_slot(self):
+        if self.slots.acquire(blocking=False):
+            return
+        BuildStep.message.emit("Waiting for the post build of a previous build...")
+        while not self.slots.acquire(timeout=0.5):
+            if self.is_interrupted():
+                raise BuildProcessInterrupt
+
+    def submit(
+        self,
+        name: str,
+        post_build: list[ProjectPostBuildAction],
+        build_path: Path,
+        project_path: Path,
+        log_writer: BuildLogWriter | None = None,
+    ):
+        self.acquire_slot()
+        try:
+            staging_dir, staged_build_path = stage_build(
+                build_path, project_path, self.staging_root
+            )
+        except BaseException:
+            self.slots.release()
+            raise
+        BuildStep.message.emit(
+            f"Build moved to {staged_build_path}, post build goes on in the background"
+        )
+        if log_writer:
+            log_writer.hold()
+        thread = threading.Thread(
+            target=self.run,
+            args=(post_build, staging_dir, staged_build_path, log_writer),
+            name=name,
+            daemon=True,
+        )
+        with self.lock:
+            self.threads = [thread for thread in self.threads if thread.is_alive()]
+            self.threads.append(thread)
+        thread.start()
+
+    def run(
+        self,
+        post_build: list[ProjectPostBuildAction],
+        staging_dir: Path,
+        staged_build_path: Path,
+        log_writer: BuildLogWriter | None,
+    ):
+        if log_writer:
+            log_writer.add_thread()
+        success = False
+        try:
+            BuildStep.start.emit("Post build")
+            self.run_post_build(post_build, staged_build_path)
+            success = True
+        except BuildProcessInterrupt:
+            pass
+        except BuildProcessError as e:
+            BuildStep.error.emit(str(e))
+            with self.lock:
+                self.errors.append(str(e))
+        finally:
+            trash.delete(staging_dir)
+            if log_writer:
+                log_writer.release(success)
+            self.slots.release()
+
+    def check(self):
+        with self.lock:
+            if self.errors:
+                raise BuildProcessInterrupt
+
+    def close(self):
+        with self.lock:
+            threads = list(self.threads)
+        for thread in threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
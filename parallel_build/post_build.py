@@ -1,17 +1,30 @@
-import shutil
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import msgspec
+
 from parallel_build.build_step import BuildStep
 from parallel_build.config import ProjectPostBuildAction
+from parallel_build.copier import ParallelCopier, format_size
 from parallel_build.exceptions import BuildProcessError, BuildProcessInterrupt
+from parallel_build.mirror import MirrorEntry, file_digest, scan_tree
 
 
-def get_post_build_action(action: ProjectPostBuildAction, build_path: str):
+def get_post_build_action(
+    action: ProjectPostBuildAction, build_path: str, copy_workers: int | None = None
+):
     build_path = Path(build_path)
     if build_path.is_file():
         build_path = build_path.parent
     if action.action == "copy":
-        return CopyBuild(build_path, action.params["target"])
+        return CopyBuild(
+            build_path,
+            action.params["target"],
+            copy_workers=copy_workers,
+            sync=action.params.get("mode") == "sync",
+        )
     elif action.action == "publish-itch":
         return PublishItch(
             build_path,
@@ -21,23 +34,84 @@ def get_post_build_action(action: ProjectPostBuildAction, build_path: str):
         )
 
 
+def get_post_build_dependencies(
+    post_build: list[ProjectPostBuildAction],
+) -> list[set[int]]:
+    indexes_by_name: dict[str, list[int]] = {}
+    for index, action in enumerate(post_build):
+        indexes_by_name.setdefault(action.display_name, []).append(index)
+
+    dependencies = []
+    for index, action in enumerate(post_build):
+        if action.after is None:
+            dependencies.append({index - 1} if index > 0 else set())
+            continue
+        action_dependencies = set()
+        for name in action.after:
+            if name not in indexes_by_name:
+                raise BuildProcessError(
+                    f"Post build action '{action.display_name}' comes after "
+                    f"'{name}', which does not exist"
+                )
+            action_dependencies.update(indexes_by_name[name])
+        dependencies.append(action_dependencies)
+
+    pending = {index: set(deps) for index, deps in enumerate(dependencies)}
+    while pending:
+        ready = [index for index, deps in pending.items() if not deps]
+        if not ready:
+            names = ", ".join(sorted({post_build[i].display_name for i in pending}))
+            raise BuildProcessError(f"Post build actions wait for each other: {names}")
+        for index in ready:
+            del pending[index]
+        for deps in pending.values():
+            deps.difference_update(ready)
+    return dependencies
+
+
 class CopyBuild(BuildStep):
     name = "Copy build"
 
-    def __init__(self, build_path: Path, target_path: str, verbose: bool = False):
+    def __init__(
+        self,
+        build_path: Path,
+        target_path: str,
+        verbose: bool = False,
+        copy_workers: int | None = None,
+        sync: bool = False,
+    ):
         self.build_path = build_path
         self.target_path = target_path
         self.verbose = verbose
+        self.sync = sync
+        self.copier = ParallelCopier(
+            workers=copy_workers,
+            is_interrupted=lambda: self.interrupt,
+            on_copy=self.on_copy if verbose else None,
+        )
 
         self.interrupt = False
 
-    def interruptable_copy(self, src, dst, *, follow_symlinks=True):
-        if self.interrupt:
-            self.message.emit("\nBuild files copy stopped")
-            raise BuildProcessInterrupt
-        if self.verbose:
-            self.long_message.emit(f"Copying {src} to {dst}")
-        return shutil.copy2(src, dst, follow_symlinks=True)
+    def on_copy(self, src, dst):
+        self.long_message.emit(f"Copying {src} to {dst}")
+
+    @property
+    def manifest_path(self):
+        target_path = Path(self.target_path)
+        return target_path.with_name(f"{target_path.name}.manifest.json")
+
+    def load_manifest(self) -> dict[str, MirrorEntry]:
+        try:
+            with open(self.manifest_path, "rb") as file:
+                return msgspec.json.decode(file.read(), type=dict[str, MirrorEntry])
+        except (FileNotFoundError, msgspec.DecodeError):
+            return {}
+
+    def save_manifest(self, manifest: dict[str, MirrorEntry]):
+        temp_manifest_path = self.manifest_path.with_suffix(".tmp")
+        with open(temp_manifest_path, "wb") as file:
+            file.write(msgspec.json.encode(manifest))
+        os.replace(temp_manifest_path, self.manifest_path)
 
     @BuildStep.start_method
     @BuildStep.end_method
@@ -46,14 +120,119 @@ class CopyBuild(BuildStep):
         target_path.mkdir(exist_ok=True, parents=True)
         self.message.emit(f"Copy build from {self.build_path} to {target_path}")
         try:
-            shutil.copytree(
+            if self.sync:
+                self.sync_files(target_path)
+                return
+            copy_stats = self.copier.copytree(
                 self.build_path,
                 target_path,
                 dirs_exist_ok=True,
-                copy_function=self.interruptable_copy,
             )
+        except BuildProcessInterrupt:
+            self.message.emit("\nBuild files copy stopped")
+            raise
         except FileNotFoundError as e:
             raise BuildProcessError(e)
+        self.message.emit(str(copy_stats))
+
+    def is_unchanged(
+        self, entry: MirrorEntry | None, size: int, mtime_ns: int, target_file: Path
+    ):
+        try:
+            target_size = target_file.stat().st_size
+        except FileNotFoundError:
+            return False
+        return (
+            entry is not None
+            and (entry.size, entry.mtime_ns) == (size, mtime_ns)
+            and target_size == size
+        )
+
+    def sync_files(self, target_path: Path):
+        manifest = self.load_manifest()
+        build_files = scan_tree(self.build_path)
+        total_size = sum(size for size, _ in build_files.values())
+
+        to_check = [
+            relative_path
+            for relative_path, (size, mtime_ns) in build_files.items()
+            if not self.is_unchanged(
+                manifest.get(relative_path), size, mtime_ns, target_path / relative_path
+            )
+        ]
+
+        def check(relative_path: str):
+            if self.interrupt:
+                raise BuildProcessInterrupt
+            size, mtime_ns = build_files[relative_path]
+            digest = file_digest(self.build_path / relative_path)
+            target_file = target_path / relative_path
+            entry = manifest.get(relative_path)
+            if entry is None:
+                if target_file.exists() and target_file.stat().st_size == size:
+                    entry = MirrorEntry(size, mtime_ns, file_digest(target_file))
+            elif not target_file.exists():
+                entry = None
+            return MirrorEntry(size, mtime_ns, digest), (
+                entry is not None and entry.digest == digest
+            )
+
+        pending = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.copier.workers) as executor:
+                for relative_path, (entry, same_content) in zip(
+                    to_check, executor.map(check, to_check)
+                ):
+                    if same_content:
+                        manifest[relative_path] = entry
+                        continue
+                    target_file = target_path / relative_path
+                    target_file.parent.mkdir(parents=True, exist_ok=True)
+                    temp_file = target_file.with_name(
+                        f".{target_file.name}.{uuid.uuid4().hex}.tmp"
+                    )
+                    pending[str(temp_file)] = (relative_path, target_file, entry)
+
+            def on_done(src, dst):
+                relative_path, target_file, entry = pending.pop(dst)
+                os.replace(dst, target_file)
+                manifest[relative_path] = entry
+
+            copy_stats = self.copier.copy_files(
+                (
+                    (str(self.build_path / relative_path), temp_file, entry.size)
+                    for temp_file, (relative_path, _, entry) in list(pending.items())
+                ),
+                on_done=on_done,
+            )
+
+            removed = manifest.keys() - build_files.keys()
+            for relative_path in removed:
+                if self.interrupt:
+                    raise BuildProcessInterrupt
+                self.remove_file(target_path, relative_path)
+                del manifest[relative_path]
+        finally:
+            for temp_file in pending:
+                Path(temp_file).unlink(missing_ok=True)
+            self.save_manifest(manifest)
+
+        self.message.emit(
+            f"Transferred {format_size(copy_stats.bytes)} of {format_size(total_size)}"
+            f" ({copy_stats.files} of {len(build_files)} files changed, "
+            f"{len(removed)} removed) in {copy_stats.elapsed:.2f} seconds"
+        )
+
+    def remove_file(self, target_path: Path, relative_path: str):
+        path = target_path / relative_path
+        path.unlink(missing_ok=True)
+        parent = path.parent
+        while parent != target_path:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
 
     @BuildStep.end_method
     def stop(self):
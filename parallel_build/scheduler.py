@@ -0,0 +1,131 @@
+import heapq
+import itertools
+import os
+import threading
+
+from parallel_build.build_step import BuildStep
+from parallel_build.config import Config
+from parallel_build.main import BuildProcess, get_project
+from parallel_build.utils import get_available_memory
+
+
+def get_max_parallel_builds(config: Config):
+    if config.max_parallel_builds:
+        return config.max_parallel_builds
+    max_builds = max(1, (os.cpu_count() or 1) // max(1, config.build_cpus))
+    available_memory = get_available_memory()
+    if available_memory is not None:
+        max_builds = min(
+            max_builds,
+            available_memory // (max(1, config.build_memory_mb) * 1024 * 1024),
+        )
+    return max(1, max_builds)
+
+
+class BuildJob:
+    def __init__(self, project_name: str, priority: int = 0):
+        self.project_name = project_name
+        self.priority = priority
+        self.process: BuildProcess | None = None
+        self.finished_with_success: bool | None = None
+
+
+class BuildScheduler:
+    """Builds several projects at once on a bounded pool of workers."""
+
+    def __init__(self, max_workers: int | None = None):
+        self.config = Config.load()
+        self.max_workers = max_workers or get_max_parallel_builds(self.config)
+        self.jobs: list[BuildJob] = []
+        self.queue: list[tuple[int, int, BuildJob]] = []
+        self.counter = itertools.count()
+        self.running_projects: set[str] = set()
+        self.running_jobs: list[BuildJob] = []
+        self.condition = threading.Condition()
+        self.workers: list[threading.Thread] = []
+        self.interrupt = False
+
+    def submit(self, project_name: str, priority: int | None = None):
+        project = get_project(self.config, project_name)
+        if project is None:
+            raise Exception(f"Project '{project_name}' not found")
+        job = BuildJob(project_name, project.priority if priority is None else priority)
+        with self.condition:
+            self.jobs.append(job)
+            heapq.heappush(self.queue, (-job.priority, next(self.counter), job))
+            self.condition.notify_all()
+        return job
+
+    def next_job(self):
+        with self.condition:
+            while True:
+                if self.interrupt:
+                    return None
+                postponed = []
+                job = None
+                while self.queue:
+                    entry = heapq.heappop(self.queue)
+                    if entry[2].project_name in self.running_projects:
+                        postponed.append(entry)
+                    else:
+                        job = entry[2]
+                        break
+                for entry in postponed:
+                    heapq.heappush(self.queue, entry)
+                if job:
+                    self.running_projects.add(job.project_name)
+                    self.running_jobs.append(job)
+                    return job
+                if not self.queue and not self.running_jobs:
+                    return None
+                self.condition.wait()
+
+    def job_done(self, job: BuildJob):
+        with self.condition:
+            self.running_projects.discard(job.project_name)
+            self.running_jobs.remove(job)
+            self.condition.notify_all()
+
+    def work(self):
+        while job := self.next_job():
+            threading.current_thread().name = job.project_name
+
+            def on_build_end(finished_with_success: bool, job=job):
+                job.finished_with_success = finished_with_success
+
+            try:
+                job.process = BuildProcess(
+                    project_name=job.project_name, on_build_end=on_build_end
+                )
+                if not self.interrupt:
+                    job.process.run(continuous=False)
+            except Exception as e:
+                job.finished_with_success = False
+                BuildStep.error.emit(str(e))
+            finally:
+                self.job_done(job)
+
+    def run(self):
+        self.workers = [
+            threading.Thread(target=self.work, daemon=True)
+            for _ in range(min(self.max_workers, max(1, len(self.jobs))))
+        ]
+        for worker in self.workers:
+            worker.start()
+        self.join()
+        return self.jobs
+
+    def join(self):
+        for worker in self.workers:
+            while worker.is_alive():
+                worker.join(0.5)  # wake up periodically to allow KeyboardInterrupt
+
+    def stop(self):
+        with self.condition:
+            self.interrupt = True
+            self.queue.clear()
+            running_jobs = list(self.running_jobs)
+            self.condition.notify_all()
+        for job in running_jobs:
+            if job.process:
+                job.process.stop()
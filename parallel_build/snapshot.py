@@ -0,0 +1,125 @@
+import os
+import shutil
+import threading
+import uuid
+from enum import Enum
+from pathlib import Path
+
+from parallel_build.config import SnapshotMode
+from parallel_build.utils import reflink
+
+HARDLINK_DIRECTORIES = ("Assets", "Packages")
+HARDLINK_EXCLUDED_NAMES = ("manifest.json", "packages-lock.json")
+HARDLINK_EXCLUDED_SUFFIXES = (".meta",)
+
+
+class CopyStrategy(str, Enum):
+    reflink = "cloned"
+    hardlink = "hardlinked"
+    copy = "copied"
+
+
+_probed_strategies: dict[tuple[int, int], set[CopyStrategy]] = {}
+_probe_lock = threading.Lock()
+
+
+def probe_strategies(source_path: Path, target_path: Path):
+    source_device = os.stat(source_path).st_dev
+    target_device = os.stat(target_path).st_dev
+    with _probe_lock:
+        if (source_device, target_device) in _probed_strategies:
+            return _probed_strategies[(source_device, target_device)]
+
+        strategies = {CopyStrategy.copy}
+        if source_device == target_device:
+            probe_path = Path(target_path) / f".parallelbuild-probe-{uuid.uuid4().hex}"
+            probe_path.write_bytes(b"probe")
+            for strategy, function in (
+                (CopyStrategy.reflink, reflink),
+                (CopyStrategy.hardlink, os.link),
+            ):
+                probe_copy_path = probe_path.with_suffix(".copy")
+                try:
+                    function(probe_path, probe_copy_path)
+                    strategies.add(strategy)
+                except OSError:
+                    pass
+                finally:
+                    probe_copy_path.unlink(missing_ok=True)
+            probe_path.unlink(missing_ok=True)
+        _probed_strategies[(source_device, target_device)] = strategies
+        return strategies
+
+
+class SnapshotCopy:
+    def __init__(
+        self,
+        project_path: Path,
+        mode: SnapshotMode,
+        strategies: set[CopyStrategy],
+        build_path: str | None = None,
+    ):
+        self.project_path = Path(project_path)
+        self.use_reflink = (
+            mode != SnapshotMode.copy and CopyStrategy.reflink in strategies
+        )
+        self.use_hardlink = (
+            mode == SnapshotMode.link and CopyStrategy.hardlink in strategies
+        )
+        self.build_path = (
+            self.project_path / build_path
+            if build_path and not Path(build_path).is_absolute()
+            else None
+        )
+        self.counts = {strategy: 0 for strategy in CopyStrategy}
+        self.lock = threading.Lock()
+
+    @property
+    def avoids_byte_copies(self):
+        return self.use_reflink or self.use_hardlink
+
+    def can_hardlink(self, src):
+        path = Path(src)
+        relative_parts = path.relative_to(self.project_path).parts
+        if relative_parts[0] not in HARDLINK_DIRECTORIES:
+            return False
+        if self.build_path and path.is_relative_to(self.build_path):
+            return False
+        return (
+            path.name not in HARDLINK_EXCLUDED_NAMES
+            and path.suffix not in HARDLINK_EXCLUDED_SUFFIXES
+        )
+
+    def __call__(self, src, dst, *, follow_symlinks=True):
+        # never write through an existing file, it may be a hardlink
+        Path(dst).unlink(missing_ok=True)
+        strategy = CopyStrategy.copy
+        if self.use_reflink:
+            try:
+                reflink(src, dst)
+                strategy = CopyStrategy.reflink
+            except OSError:
+                pass
+        if (
+            strategy == CopyStrategy.copy
+            and self.use_hardlink
+            and self.can_hardlink(src)
+        ):
+            try:
+                os.link(src, dst)
+                strategy = CopyStrategy.hardlink
+            except OSError:
+                pass
+        if strategy == CopyStrategy.copy:
+            shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+        with self.lock:
+            self.counts[strategy] += 1
+        return dst
+
+    def report(self):
+        counts = [
+            f"{count} files {strategy.value}"
+            for strategy, count in self.counts.items()
+            if count > 0
+        ]
+        return f"Snapshot strategies: {', '.join(counts) if counts else 'no files'}"
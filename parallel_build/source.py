@@ -1,29 +1,56 @@
-import os
-import shutil
+import random
 import tempfile
 import time
-import uuid
 from contextlib import contextmanager
 from pathlib import Path
 
+import msgspec
+
 from parallel_build.build_step import BuildStep
-from parallel_build.config import ProjectSourceType
+from parallel_build.config import ProjectSource, ProjectSourceType, SnapshotMode
+from parallel_build.copier import ParallelCopier, format_size
+from parallel_build.disk_budget import disk_budget
 from parallel_build.exceptions import BuildProcessError, BuildProcessInterrupt
-from parallel_build.utils import better_rmtree
-
-TEMP_DIR_PREFIX = f"ParallelBuild_{uuid.getnode()}_"
+from parallel_build.git_mirror import GitMirror
+from parallel_build.mirror import WorkspaceMirror, scan_tree
+from parallel_build.snapshot import CopyStrategy, SnapshotCopy, probe_strategies
+from parallel_build.trash import trash
+from parallel_build.utils import get_directory_size
+from parallel_build.workspace import PROCESS_TEMP_DIR_PREFIX, WorkspaceRoot
 
 
 def get_source(
     project_name: str,
-    source_type: ProjectSourceType,
-    source_value: str,
+    source: ProjectSource,
     git_polling_interval: int,
+    copy_workers: int | None = None,
+    build_path: str | None = None,
+    git_polling_max_interval: int = 300,
+    workspace_root: WorkspaceRoot | None = None,
 ):
-    if source_type == ProjectSourceType.local:
-        return LocalSource(project_name, source_value)
-    elif source_type == ProjectSourceType.git:
-        return GitSource(project_name, source_value, git_polling_interval)
+    if source.type == ProjectSourceType.local:
+        return LocalSource(
+            project_name,
+            source.value,
+            mirror=source.mirror,
+            mirror_checksum=source.mirror_checksum,
+            copy_workers=copy_workers,
+            snapshot_mode=source.snapshot,
+            build_path=build_path,
+            workspace_root=workspace_root,
+        )
+    elif source.type == ProjectSourceType.git:
+        return GitSource(
+            project_name,
+            source.value,
+            git_polling_interval,
+            mirror=source.mirror,
+            clone_depth=source.clone_depth,
+            clone_filter=source.clone_filter,
+            sparse_checkout=source.sparse_checkout,
+            git_polling_max_interval=git_polling_max_interval,
+            workspace_root=workspace_root,
+        )
 
 
 def ignore_patterns(project_path: Path):
@@ -43,12 +70,45 @@ def ignore_patterns(project_path: Path):
 class LocalSource(BuildStep):
     name = "Local project"
 
-    def __init__(self, project_name: str, project_path: str, verbose: bool = False):
+    def __init__(
+        self,
+        project_name: str,
+        project_path: str,
+        verbose: bool = False,
+        mirror: bool = False,
+        mirror_checksum: bool = False,
+        copy_workers: int | None = None,
+        snapshot_mode: SnapshotMode = SnapshotMode.copy,
+        build_path: str | None = None,
+        workspace_root: WorkspaceRoot | None = None,
+    ):
         self.project_name = project_name
         self.project_path = Path(project_path)
+        self.workspace_root = workspace_root or WorkspaceRoot()
         self.interrupt = False
         self.verbose = verbose
+        self.snapshot_mode = snapshot_mode
+        self.build_path = build_path
         self.temp_dirs = []
+        self.copier = ParallelCopier(
+            workers=copy_workers,
+            is_interrupted=lambda: self.interrupt,
+            on_copy=self.on_copy if verbose else None,
+        )
+        self.mirror = (
+            WorkspaceMirror(
+                project_name,
+                self.project_path,
+                ignore=ignore_patterns(self.project_path),
+                checksum=mirror_checksum,
+            )
+            if mirror
+            else None
+        )
+
+    @property
+    def disposable_snapshots(self):
+        return self.mirror is None
 
     @BuildStep.start_method
     def __enter__(self):
@@ -57,60 +117,166 @@ class LocalSource(BuildStep):
     @BuildStep.end_method
     def __exit__(self, exc_type, exc_value, traceback):
         for temp_dir in self.temp_dirs:
-            if Path(temp_dir).exists():
-                better_rmtree(path=temp_dir)
+            trash.delete(temp_dir)
+
+    def on_copy(self, src, dst):
+        self.long_message.emit(f"Copying {src} to {dst}")
+
+    def prepare_snapshot_copy(self, target_path: Path):
+        strategies = (
+            probe_strategies(self.project_path, target_path)
+            if self.snapshot_mode != SnapshotMode.copy
+            else {CopyStrategy.copy}
+        )
+        snapshot_copy = SnapshotCopy(
+            self.project_path,
+            self.snapshot_mode,
+            strategies,
+            build_path=self.build_path,
+        )
+        self.copier.copy_function = snapshot_copy
+        self.copier.chunk_large_files = not snapshot_copy.avoids_byte_copies
+        return snapshot_copy
+
+    def snapshot_size(self):
+        files = scan_tree(self.project_path, ignore=ignore_patterns(self.project_path))
+        return sum(size for size, _ in files.values())
 
-    def interruptable_copy(self, src, dst, *, follow_symlinks=True):
-        if self.interrupt:
+    def check_snapshot_space(self, target_path: Path, size: int):
+        disk_budget.check(target_path, size, f"the {self.project_name} files")
+
+    def report_snapshot_copy(self, snapshot_copy: SnapshotCopy):
+        if self.snapshot_mode != SnapshotMode.copy:
+            self.message.emit(snapshot_copy.report())
+
+    @contextmanager
+    def interruptable_copy(self):
+        try:
+            yield
+        except BuildProcessInterrupt:
             self.message.emit("\nProject files copy stopped")
-            raise BuildProcessInterrupt
-        if self.verbose:
-            self.long_message.emit(f"Copying {src} to {dst}")
-        return shutil.copy2(src, dst, follow_symlinks=True)
+            raise
+        except FileNotFoundError as e:
+            raise BuildProcessError(e)
 
     @contextmanager
     def temporary_project(self):
-        with tempfile.TemporaryDirectory(
-            prefix=TEMP_DIR_PREFIX, ignore_cleanup_errors=True
-        ) as temp_dir:
-            self.temp_dirs.append(temp_dir)
+        if self.mirror:
+            with disk_budget.using(self.mirror.workspace_path), self.mirror.lock():
+                yield self.mirrored_project()
+            return
+
+        snapshot_size = self.snapshot_size() if self.workspace_root.ram_disk else None
+        temp_dir = self.workspace_root.mkdtemp(snapshot_size)
+        self.temp_dirs.append(temp_dir)
+        try:
             self.message.emit(f"Copying {self.project_name} files to {temp_dir}...")
             temp_project_path = Path(temp_dir) / self.project_name
-            try:
-                shutil.copytree(
+            snapshot_copy = self.prepare_snapshot_copy(Path(temp_dir))
+            if not snapshot_copy.avoids_byte_copies:
+                if snapshot_size is None:
+                    snapshot_size = self.snapshot_size()
+                self.check_snapshot_space(Path(temp_dir), snapshot_size)
+            with self.interruptable_copy():
+                copy_stats = self.copier.copytree(
                     self.project_path,
                     temp_project_path,
-                    copy_function=self.interruptable_copy,
                     ignore=ignore_patterns(self.project_path),
                 )
-            except FileNotFoundError as e:
-                raise BuildProcessError(e)
+            self.message.emit(str(copy_stats))
+            self.report_snapshot_copy(snapshot_copy)
             yield temp_project_path
             self.message.emit(f"\nCleaning temporary directory {temp_dir}...")
-        if Path(temp_dir).exists():
-            better_rmtree(path=temp_dir)
+        finally:
+            trash.delete(temp_dir)
+            self.temp_dirs.remove(temp_dir)
+
+    def mirrored_project(self):
+        self.message.emit(
+            f"Syncing {self.project_name} files to {self.mirror.project_path}..."
+        )
+        self.mirror.project_path.mkdir(parents=True, exist_ok=True)
+        snapshot_copy = self.prepare_snapshot_copy(self.mirror.project_path)
+        with self.interruptable_copy():
+            copied, renamed, deleted, copy_stats = self.mirror.sync(
+                copier=self.copier,
+                is_interrupted=lambda: self.interrupt,
+                check_space=lambda size: self.check_snapshot_space(
+                    self.mirror.project_path,
+                    0 if snapshot_copy.avoids_byte_copies else size,
+                ),
+            )
+        self.message.emit(
+            f"{copied} files copied, {renamed} renamed and {deleted} deleted"
+        )
+        self.message.emit(str(copy_stats))
+        self.report_snapshot_copy(snapshot_copy)
+        return self.mirror.project_path
 
     def stop(self):
         self.interrupt = True
 
 
+class GitPollingMetrics(msgspec.Struct):
+    polls: int = 0
+    fetches: int = 0
+    # distorted by a repack or gc between polls
+    estimated_bytes_fetched: int = 0
+    last_change_latency: float | None = None
+
+
+class AdaptiveInterval:
+    def __init__(self, min_interval: float, max_interval: float, jitter: float = 0.1):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.interval = min_interval
+
+    def reset(self):
+        self.interval = self.min_interval
+
+    def next(self):
+        interval = self.interval
+        self.interval = min(self.interval * 2, self.max_interval)
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
 class GitSource(BuildStep):
     name = "Git repository"
 
     def __init__(
-        self, project_name: str, git_repository: str, git_polling_interval: int = 30
+        self,
+        project_name: str,
+        git_repository: str,
+        git_polling_interval: int = 30,
+        mirror: bool = False,
+        clone_depth: int | None = None,
+        clone_filter: str | None = None,
+        sparse_checkout: list[str] | None = None,
+        git_polling_max_interval: int = 300,
+        workspace_root: WorkspaceRoot | None = None,
     ):
         self.project_name = project_name
         self.git_repository = git_repository
         self.git_polling_interval = git_polling_interval
-
-        self.temp_dir = tempfile.TemporaryDirectory(
-            prefix=TEMP_DIR_PREFIX, ignore_cleanup_errors=True
+        self.polling_interval = AdaptiveInterval(
+            git_polling_interval, max(git_polling_interval, git_polling_max_interval)
         )
-        self.temp_project_path = Path(self.temp_dir.name) / project_name
+        self.metrics = GitPollingMetrics()
+        self.mirror = GitMirror(git_repository) if mirror else None
+        self.clone_depth = clone_depth
+        self.clone_filter = clone_filter
+        self.sparse_checkout = sparse_checkout or []
+        self.branch = None
+
+        self.workspace_root = workspace_root or WorkspaceRoot()
+        self.temp_dir: tempfile.TemporaryDirectory | None = None
+        self.temp_project_path: Path | None = None
         self.build_count = 0
         self.interrupt = False
 
+    disposable_snapshots = False
+
     def run_git(self, git_command, *args, **kwargs):
         return self.command_executor.run(
             ["git", *git_command],
@@ -119,47 +285,134 @@ class GitSource(BuildStep):
             **kwargs,
         )
 
+    @property
+    def clone_options(self):
+        options = self.fetch_options
+        if self.clone_filter:
+            options += ["--filter", self.clone_filter]
+        return options
+
+    @property
+    def fetch_options(self):
+        return ["--depth", str(self.clone_depth)] if self.clone_depth else []
+
     @BuildStep.start_method
     def __enter__(self):
+        checkout_size = disk_budget.size_estimate(self.checkout_size_key)
+        self.temp_dir = tempfile.TemporaryDirectory(
+            prefix=PROCESS_TEMP_DIR_PREFIX,
+            dir=self.workspace_root.get_path(checkout_size or None),
+            ignore_cleanup_errors=True,
+        )
+        self.temp_project_path = Path(self.temp_dir.name) / self.project_name
         self.temp_project_path.mkdir()
+        disk_budget.check(
+            self.temp_project_path, checkout_size, f"the {self.project_name} checkout"
+        )
+        if self.mirror:
+            disk_budget.use(self.mirror.path)
+            try:
+                self.short_message.emit(
+                    f"Updating mirror of {self.git_repository} in {self.mirror.path}..."
+                )
+                self.mirror.update(
+                    self.run_git,
+                    clone_options=self.clone_options,
+                    fetch_options=self.fetch_options,
+                )
+                self.branch = self.mirror.default_branch(self.run_git)
+                self.short_message.emit(
+                    f"Checking out {self.project_name} to {self.temp_project_path}..."
+                )
+                self.mirror.add_worktree(
+                    self.run_git,
+                    self.temp_project_path,
+                    no_checkout=bool(self.sparse_checkout),
+                )
+                if self.sparse_checkout:
+                    self.checkout_sparse(["--detach", self.branch])
+                self.remember_checkout_size()
+            except BaseException:
+                disk_budget.release(self.mirror.path)
+                raise
+            return self
+
         self.short_message.emit(
             f"Cloning {self.project_name} to {self.temp_project_path}..."
         )
         self.run_git(
-            ["clone", self.git_repository, self.temp_project_path],
+            [
+                "clone",
+                *self.clone_options,
+                *(["--no-checkout"] if self.sparse_checkout else []),
+                self.git_repository,
+                self.temp_project_path,
+            ],
             error_message=f"Cannot clone {self.git_repository}",
             redirect_stderr_to_stdout=True,  # git clone sends all output to stderr
         )
+        self.branch = self.run_git(
+            ["symbolic-ref", "--short", "HEAD"],
+            cwd=self.temp_project_path,
+            return_output=True,
+        ).strip()
+        if self.sparse_checkout:
+            self.checkout_sparse([self.branch])
+        self.remember_checkout_size()
         return self
 
+    @property
+    def checkout_size_key(self):
+        return f"{self.project_name}/checkout"
+
+    def remember_checkout_size(self):
+        disk_budget.remember_size(
+            self.checkout_size_key, get_directory_size(self.temp_project_path)
+        )
+
+    def checkout_sparse(self, checkout_args: list[str]):
+        self.short_message.emit(
+            f"Restricting checkout to {', '.join(self.sparse_checkout)}..."
+        )
+        self.run_git(
+            ["sparse-checkout", "set", "--cone", *self.sparse_checkout],
+            cwd=self.temp_project_path,
+        )
+        self.run_git(
+            ["checkout", "--force", *checkout_args],
+            cwd=self.temp_project_path,
+            redirect_stderr_to_stdout=True,
+        )
+
     @BuildStep.end_method
     def __exit__(self, exc_type, exc_value, traceback):
         self.message.emit(f"\nCleaning temporary directory {self.temp_dir.name}...")
+        trash.delete(self.temp_dir.name)
         self.temp_dir.cleanup()
-        if Path(self.temp_dir.name).exists():
-            better_rmtree(path=self.temp_dir.name)
+        if self.mirror:
+            self.mirror.remove_worktree(self.run_git, self.temp_project_path)
+            disk_budget.release(self.mirror.path)
 
     @contextmanager
     def temporary_project(self):
-        previous_commit = self.run_git(
-            ["rev-parse", "HEAD"], cwd=self.temp_project_path, return_output=True
-        )
+        previous_commit = self.current_commit()
+        waiting_start_time = time.time()
         while self.build_count > 0 and not self.interrupt:
-            self.run_git(["pull"], cwd=self.temp_project_path)
-            current_commit = self.run_git(
-                ["rev-parse", "HEAD"],
-                cwd=self.temp_project_path,
-                return_output=True,
-            )
-            if current_commit != previous_commit or self.interrupt:
-                break
-            self.message.emit(
-                f"No new changes, waiting {self.git_polling_interval} seconds..."
-            )
-            for i in range(self.git_polling_interval):
-                if self.interrupt:
+            self.metrics.polls += 1
+            remote_commit = self.remote_commit()
+            if remote_commit is None or remote_commit != previous_commit:
+                self.pull()
+                current_commit = self.current_commit()
+                if current_commit != previous_commit:
+                    self.on_change_detected(waiting_start_time)
                     break
-                time.sleep(1)
+            if self.interrupt:
+                break
+            interval = self.polling_interval.next()
+            self.message.emit(f"No new changes, waiting {interval:.0f} seconds...")
+            interval_end_time = time.monotonic() + interval
+            while not self.interrupt and time.monotonic() < interval_end_time:
+                time.sleep(min(1, interval_end_time - time.monotonic()))
 
         yield self.temp_project_path
 
@@ -173,16 +426,95 @@ class GitSource(BuildStep):
         )
         self.build_count += 1
 
+    def current_commit(self):
+        return self.run_git(
+            ["rev-parse", "HEAD"], cwd=self.temp_project_path, return_output=True
+        ).strip()
+
+    def remote_commit(self):
+        branch_ref = (
+            self.branch
+            if self.branch.startswith("refs/")
+            else f"refs/heads/{self.branch}"
+        )
+        output = self.run_git(
+            [
+                *(self.mirror.git_command() if self.mirror else []),
+                "ls-remote",
+                "origin",
+                branch_ref,
+            ],
+            cwd=self.temp_project_path,
+            return_output=True,
+        )
+        for line in output.splitlines():
+            commit, _, ref = line.partition("\t")
+            if ref == branch_ref:
+                return commit
+        return None
+
+    def repository_size(self):
+        output = self.run_git(
+            [
+                *(self.mirror.git_command() if self.mirror else []),
+                "count-objects",
+                "-v",
+            ],
+            cwd=self.temp_project_path,
+            return_output=True,
+        )
+        counts = dict(
+            line.split(": ", 1) for line in output.splitlines() if ": " in line
+        )
+        return (int(counts.get("size", 0)) + int(counts.get("size-pack", 0))) * 1024
+
+    def on_change_detected(self, waiting_start_time: float):
+        commit_time = float(
+            self.run_git(
+                ["log", "-1", "--format=%ct"],
+                cwd=self.temp_project_path,
+                return_output=True,
+            )
+        )
+        self.metrics.last_change_latency = time.time() - max(
+            commit_time, waiting_start_time
+        )
+        self.polling_interval.reset()
+        self.message.emit(
+            f"New changes detected after {self.metrics.last_change_latency:.0f} "
+            f"seconds ({self.metrics.polls} polls, {self.metrics.fetches} fetches, "
+            f"about {format_size(self.metrics.estimated_bytes_fetched)} fetched "
+            "so far)"
+        )
+        self.git_polling_metrics.emit(self.metrics)
+
+    def pull(self):
+        size_before = self.repository_size()
+        self._pull()
+        self.metrics.fetches += 1
+        self.metrics.estimated_bytes_fetched += max(
+            0, self.repository_size() - size_before
+        )
+
+    def _pull(self):
+        if not self.mirror:
+            self.run_git(
+                ["fetch", *self.fetch_options, "origin", self.branch],
+                cwd=self.temp_project_path,
+                redirect_stderr_to_stdout=True,
+            )
+            self.run_git(
+                ["reset", "--hard", "FETCH_HEAD"],
+                cwd=self.temp_project_path,
+            )
+            return
+        self.mirror.update(self.run_git, fetch_options=self.fetch_options)
+        self.run_git(
+            ["checkout", "--force", "--detach", self.branch],
+            cwd=self.temp_project_path,
+            redirect_stderr_to_stdout=True,
+        )
+
     def stop(self):
         self.command_executor.stop()
         self.interrupt = True
-
-
-def clean_leftover_temp_dirs():
-    for leftover_path in [
-        file.path
-        for file in os.scandir(tempfile.gettempdir())
-        if file.is_dir() and file.name.startswith(TEMP_DIR_PREFIX)
-    ]:
-        print(f"Removing {leftover_path}")
-        shutil.rmtree(leftover_path, ignore_errors=True)
@@ -0,0 +1,168 @@
+import os
+import queue
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+
+from parallel_build.build_step import BuildStep
+from parallel_build.copier import get_default_workers
+from parallel_build.utils import (
+    FileLock,
+    better_rmtree,
+    get_app_dir,
+    set_low_io_priority,
+)
+
+TRASH_PATH = Path(tempfile.gettempdir()) / f"ParallelBuild_trash_{uuid.getnode()}"
+TRASH_PREFIX = ".parallel_build_trash_"
+TEMP_DIR_PREFIX = f"ParallelBuild_{uuid.getnode()}_"
+PROCESS_TEMP_DIR_PREFIX = f"{TEMP_DIR_PREFIX}{os.getpid()}_"
+PROCESS_LOCKS_PATH = Path(get_app_dir("ParallelBuild")) / "processes"
+process_lock: FileLock | None = None
+process_lock_guard = threading.Lock()
+
+
+def lock_process():
+    global process_lock
+    with process_lock_guard:
+        if process_lock is None:
+            PROCESS_LOCKS_PATH.mkdir(parents=True, exist_ok=True)
+            process_lock = FileLock(PROCESS_LOCKS_PATH / f"{os.getpid()}.lock")
+            process_lock.__enter__()
+
+
+def is_leftover_temp_dir(name: str):
+    if not name.startswith(TEMP_DIR_PREFIX):
+        return False
+    pid = name[len(TEMP_DIR_PREFIX) :].partition("_")[0]
+    if not pid.isdigit():
+        return True
+    if int(pid) == os.getpid():
+        return False
+    try:
+        with FileLock(PROCESS_LOCKS_PATH / f"{pid}.lock", blocking=False):
+            return True
+    except BlockingIOError:
+        return False
+
+
+class TrashItem:
+    def __init__(self, path: Path, entries: int):
+        self.path = path
+        self.remaining_entries = entries
+        self.lock = threading.Lock()
+
+    def entry_deleted(self):
+        with self.lock:
+            self.remaining_entries -= 1
+            return self.remaining_entries == 0
+
+
+class Trash:
+    """Deletes directories in the background."""
+
+    def __init__(self, workers: int | None = None):
+        self.workers = workers or min(4, get_default_workers())
+        self.queue: queue.Queue[tuple[Path, TrashItem | None]] = queue.Queue()
+        self.lock = threading.Lock()
+        self.threads: list[threading.Thread] = []
+        self.cleaned_directories: set[Path] = set()
+
+    def start(self):
+        with self.lock:
+            if self.threads:
+                return
+            self.threads = [
+                threading.Thread(target=self.work, name="Trash", daemon=True)
+                for _ in range(self.workers)
+            ]
+            for thread in self.threads:
+                thread.start()
+        lock_process()
+        if TRASH_PATH.exists():
+            for entry in os.scandir(TRASH_PATH):
+                self.enqueue(Path(entry.path))
+        self.clean_leftovers(TRASH_PATH.parent)
+
+    def clean_leftovers(self, directory: Path):
+        directory = Path(directory)
+        with self.lock:
+            if directory in self.cleaned_directories:
+                return
+            self.cleaned_directories.add(directory)
+        self.start()
+        for entry in os.scandir(directory):
+            if entry.name.startswith(TRASH_PREFIX):
+                self.enqueue(Path(entry.path))
+            elif entry.is_dir() and is_leftover_temp_dir(entry.name):
+                self.delete(entry.path)
+
+    def delete(self, path):
+        """Moves `path` to the trash, to be deleted in the background."""
+        path = Path(path)
+        if not path.exists():
+            return
+        self.start()
+        TRASH_PATH.mkdir(exist_ok=True)
+        trash_name = f"{path.name}_{uuid.uuid4().hex}"
+        try:
+            trashed_path = TRASH_PATH / trash_name
+            os.replace(path, trashed_path)
+        except OSError:
+            try:
+                trashed_path = path.with_name(f"{TRASH_PREFIX}{trash_name}")
+                os.replace(path, trashed_path)
+            except OSError:
+                better_rmtree(path=path)
+                return
+        self.enqueue(trashed_path)
+
+    def enqueue(self, trashed_path: Path):
+        if not trashed_path.is_dir() or trashed_path.is_symlink():
+            self.queue.put((trashed_path, None))
+            return
+        try:
+            entries = [Path(entry.path) for entry in os.scandir(trashed_path)]
+        except FileNotFoundError:
+            return  # emptied by another process
+        if not entries:
+            self.queue.put((trashed_path, None))
+            return
+        item = TrashItem(trashed_path, len(entries))
+        for entry in entries:
+            self.queue.put((entry, item))
+
+    def work(self):
+        set_low_io_priority()
+        while True:
+            path, item = self.queue.get()
+            try:
+                remove_path(path)
+                if item and item.entry_deleted():
+                    remove_path(item.path)
+            except OSError as e:
+                BuildStep.message.emit(f"Cannot delete {path}: {e}")
+            finally:
+                self.queue.task_done()
+
+    @property
+    def pending(self):
+        return self.queue.unfinished_tasks
+
+    def close(self, wait: bool = True):
+        if wait and self.threads:
+            self.queue.join()
+
+
+def remove_path(path: Path):
+    if path.is_dir() and not path.is_symlink():
+        better_rmtree(path=path)
+    else:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+trash = Trash()
@@ -1,16 +1,20 @@
+import os
 import platform
-import re
 import time
 from pathlib import Path
 
 import msgspec
 
+from parallel_build.build_history import BuildHistory, BuildProgressEstimator
 from parallel_build.build_step import BuildStep, BuildStepEvent
 from parallel_build.command import Command
 from parallel_build.config import BuildTarget
+from parallel_build.unity_log import UnityLogParser
+from parallel_build.unity_timeline import UnityPhaseTimeline
 from parallel_build.utils import OperatingSystem
 
 MAX_LINES = 3108
+EDITOR_PATH_VARIABLE = "PARALLEL_BUILD_UNITY_EDITOR"
 
 
 def get_build_path(project_path: Path, build_path: str):
@@ -21,12 +25,14 @@ def get_build_path(project_path: Path, build_path: str):
 
 
 def get_editor_path(editor_version: str):
+    if editor_path := os.environ.get(EDITOR_PATH_VARIABLE):
+        return editor_path
     if OperatingSystem.current == OperatingSystem.windows:
         return f'"C:\\Program Files\\Unity\\Hub\\Editor\\{editor_version}\\Editor\\Unity.exe"'
     elif OperatingSystem.current == OperatingSystem.macos:
         return f"/Applications/Unity/Hub/Editor/{editor_version}/Unity.app/Contents/MacOS/Unity"
     elif OperatingSystem.current == OperatingSystem.linux:
-        return f"/Applications/Unity/Hub/Editor/{editor_version}/Unity.app/Contents/Linux/Unity"
+        return os.path.expanduser(f"~/Unity/Hub/Editor/{editor_version}/Editor/Unity")
     else:
         raise Exception(f"Platform {platform.system()} not supported")
 
@@ -110,6 +116,7 @@ def get_build_args(
         case BuildTarget.webgl:
             editor_path = project_path / "Assets" / "Editor"
             editor_path.mkdir(exist_ok=True, parents=True)
+            (editor_path / "WebGLBuilder.cs").unlink(missing_ok=True)
             with open(editor_path / "WebGLBuilder.cs", "w") as f:
                 f.write(WEBGL_BUILDER)
             return f"-executeMethod ParallelBuild.WebGLBuilder.Build -buildpath {build_path}"
@@ -130,15 +137,13 @@ def compose_command(command: list[str]):
         case OperatingSystem.macos:
             # for some reason without this workaround Unity will fail with no output and error 1
             return ["bash", "-c", " ".join(command)]
+        case OperatingSystem.linux:
+            return ["bash", "-c", " ".join(command)]
 
 
 class UnityBuilder(BuildStep):
-    progress = BuildStepEvent()
-
     name = "Unity build"
 
-    log_parser_regex = re.compile(r"(\[.*?\d+\/\d+.*?\]|\[BUSY.*?\])")
-
     def __init__(
         self,
         project_name: str,
@@ -150,6 +155,7 @@ class UnityBuilder(BuildStep):
         self.project_name = project_name
         self.project_path = Path(project_path)
         self.build_path = get_build_path(project_path, build_path)
+        self.build_target = build_target
 
         editor_version = get_editor_version(self.project_path)
 
@@ -172,6 +178,8 @@ class UnityBuilder(BuildStep):
             ),
         )
 
+        self.phase = BuildStepEvent(str)
+        self.timeline: UnityPhaseTimeline | None = None
         self.stopped = False
         self.stop_count = 0
 
@@ -183,31 +191,39 @@ class UnityBuilder(BuildStep):
         )
         build_start_time = time.time()
         self.build_command.start()
-        error_message = ""
+        log_parser = UnityLogParser()
+        self.timeline = UnityPhaseTimeline(build_start_time)
+        history = BuildHistory.load(self.project_name, self.build_target.value)
+        estimator = BuildProgressEstimator(history, build_start_time)
 
-        inside_error_message = False
         for line in self.build_command.output_lines:
-            line = line.strip()
-            if inside_error_message:
-                if line == "":
-                    inside_error_message = False
-                else:
-                    error_message += line + "\n"
-            if line == "Aborting batchmode due to failure:":
-                inside_error_message = True
+            parsed_line = log_parser.parse(line)
             self.long_message.emit(line)
-            parsed_line = self.log_line_parser(line)
-            if parsed_line:
-                self.short_message.emit(parsed_line)
-            self.progress.emit()
+            if parsed_line.short_message:
+                self.short_message.emit(parsed_line.short_message)
+            if phase := self.timeline.add_line(line, parsed_line, time.time()):
+                self.phase.emit(phase)
+            if estimate := estimator.add_line(
+                line, parsed_line, self.timeline.current_phase
+            ):
+                self.progress_estimate.emit(estimate)
+        self.timeline.finish()
 
         return_value = self.build_command.return_value
         if return_value == 0:
             self.message.emit(
                 f"Build finished in {time.time() - build_start_time:.2f} seconds!"
             )
+            history.add_build(self.timeline, estimator.line_count)
+            history.save(self.project_name, self.build_target.value)
         else:
-            self.error.emit(error_message)
+            self.error.emit(log_parser.error_message)
+
+        self.long_message.emit(self.timeline.table())
+        trace_path = self.timeline.save_chrome_trace(
+            self.project_name, self.build_target.value
+        )
+        self.long_message.emit(f"Build timeline saved in {trace_path}")
 
         if self.stopped:
             self.message.emit("\nUnity build stopped")
@@ -224,15 +240,3 @@ class UnityBuilder(BuildStep):
         self.build_command.stop()
         self.stop_count += 1
         self.stopped = True
-
-    def log_line_parser(self, line: str):
-        if line.startswith("DisplayProgressbar: "):
-            return line[len("DisplayProgressbar: ") :]
-        if line.startswith("Compiling shader"):
-            return line
-        if line.startswith("Start importing "):
-            return line
-        if line.startswith("["):
-            match = re.search(self.log_parser_regex, line)
-            if match:
-                return line[len(match.group(0)) :]
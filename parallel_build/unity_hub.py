@@ -42,6 +42,15 @@ class WindowsUnityRecentlyUsedProjects:
                     break
         return False
 
+    def last_modified(self):
+        try:
+            with winreg.OpenKey(
+                winreg.HKEY_CURRENT_USER, self.REGISTRY_PATH
+            ) as unity_key:
+                return winreg.QueryInfoKey(unity_key)[2]
+        except OSError:
+            return None
+
     def delete(self, value_name: str):
         with winreg.OpenKey(
             winreg.HKEY_CURRENT_USER,
@@ -86,6 +95,12 @@ class MacOSUnityRecentlyUsedProjects:
                         private_key = key
             return (base_key, private_key) if base_key and private_key else False
 
+    def last_modified(self):
+        try:
+            return self.PLIST_PATH.stat().st_mtime_ns
+        except OSError:
+            return None
+
     def delete(self, keys: tuple[str, str]):
         if not self.PLIST_PATH.exists():
             return
@@ -119,7 +134,12 @@ class UnityRecentlyUsedProjects:
     def find(self, project_path: Path):
         if not self.handler:
             return
-        self.handler.find(project_path)
+        return self.handler.find(project_path)
+
+    def last_modified(self):
+        if not self.handler:
+            return
+        return self.handler.last_modified()
 
     def delete(self, value):
         if not self.handler:
@@ -131,15 +151,23 @@ class UnityRecentlyUsedProjectsObserver:
     """Since Unity Hub will show the temporary project at some point after we
     start the build, we will check when it does and remove it."""
 
+    interval = 1.0
+
     def __init__(self, temp_project_path: Path):
         self.handler = UnityRecentlyUsedProjects()
         self.temp_project_path = temp_project_path
         self.key_found = False
+        self.last_modified = None
 
     def find_and_remove(self):
-        if self.key_found:
-            return
+        if self.key_found or not self.handler.handler:
+            return True
+        last_modified = self.handler.last_modified()
+        if last_modified is not None and last_modified == self.last_modified:
+            return False
+        self.last_modified = last_modified
         key = self.handler.find(self.temp_project_path)
         if key:
             self.handler.delete(key)
             self.key_found = True
+        return self.key_found
@@ -0,0 +1,67 @@
+import re
+from enum import Enum
+from typing import NamedTuple
+
+
+class LineKind(Enum):
+    plain = "plain"
+    progress_bar = "progress_bar"
+    shader_compile = "shader_compile"
+    asset_import = "asset_import"
+    bracketed_progress = "bracketed_progress"
+    error_block_start = "error_block_start"
+    error_block_end = "error_block_end"
+    error = "error"
+    compiler_error = "compiler_error"
+
+
+class ParsedLine(NamedTuple):
+    kind: LineKind
+    short_message: str | None = None
+
+
+ERROR_BLOCK_START = "Aborting batchmode due to failure:"
+
+LINE_PATTERN = re.compile(
+    r"DisplayProgressbar: (?P<progress_bar>.*)"
+    r"|(?P<shader_compile>Compiling shader.*)"
+    r"|(?P<asset_import>Start importing .*)"
+    r"|(?:\[.*?\d+/\d+.*?\]|\[BUSY.*?\])(?P<bracketed_progress>.*)"
+    rf"|(?P<error_block_start>{re.escape(ERROR_BLOCK_START)}$)"
+    r"|(?P<compiler_error>.*?: error CS\d+: .*)",
+    re.DOTALL,
+)
+
+
+class UnityLogParser:
+    """Classifies the lines of a Unity log."""
+
+    def __init__(self):
+        self.inside_error_block = False
+        self.error_lines: list[str] = []
+        self.compiler_errors: list[str] = []
+
+    def parse(self, line: str) -> ParsedLine:
+        if self.inside_error_block:
+            if line == "":
+                self.inside_error_block = False
+                return ParsedLine(LineKind.error_block_end)
+            self.error_lines.append(line)
+            return ParsedLine(LineKind.error)
+
+        match = LINE_PATTERN.match(line)
+        if not match:
+            return ParsedLine(LineKind.plain)
+        kind = LineKind(match.lastgroup)
+        match kind:
+            case LineKind.error_block_start:
+                self.inside_error_block = True
+                return ParsedLine(kind)
+            case LineKind.compiler_error:
+                self.compiler_errors.append(line)
+                return ParsedLine(kind, line)
+        return ParsedLine(kind, match.group(match.lastgroup))
+
+    @property
+    def error_message(self):
+        return "\n".join(self.error_lines or self.compiler_errors)
@@ -0,0 +1,168 @@
+import re
+import time
+from pathlib import Path
+
+import msgspec
+
+from parallel_build.unity_log import LineKind, ParsedLine
+from parallel_build.utils import get_app_dir
+
+TRACES_PATH = Path(get_app_dir("ParallelBuild")) / "traces"
+MAX_MARKERS = 10000
+
+PHASES = {
+    "startup": "Editor startup",
+    "package_resolution": "Package resolution",
+    "asset_import": "Asset import",
+    "script_compilation": "Script compilation",
+    "shader_compilation": "Shader compilation",
+    "il2cpp": "IL2CPP",
+    "webgl_linking": "WebGL linking",
+    "compression": "Compression",
+    "bee": "Bee build",
+}
+
+PHASE_PATTERN = re.compile(
+    r"(?P<package_resolution>Package Manager|Resolving packages"
+    r"|Registered \d+ packages)"
+    r"|(?P<compression>[Cc]ompress|Brotli|brotli|gzip)"
+    r"|(?P<webgl_linking>Link_WebGL|wasm-ld|emcc|[Ll]inking)"
+    r"|(?P<il2cpp>il2cpp|Il2Cpp|IL2CPP)"
+    r"|(?P<shader_compilation>Compiling shader|[Ss]hader variants)"
+    r"|(?P<script_compilation>[Ss]cript [Cc]ompilation|Compiling C#|ScriptCompilation)"
+    r"|(?P<asset_import>Start importing|Asset Pipeline Refresh|Importing assets"
+    r"|Refreshing native plugins)"
+)
+PLAIN_PHASE_PATTERN = re.compile(rf"\[?(?:{PHASE_PATTERN.pattern})")
+
+KIND_PHASES = {
+    LineKind.shader_compile: "shader_compilation",
+    LineKind.asset_import: "asset_import",
+    LineKind.compiler_error: "script_compilation",
+}
+
+
+class PhaseSpan(msgspec.Struct):
+    phase: str
+    start: float
+    end: float | None = None
+    lines: int = 0
+
+    @property
+    def duration(self):
+        return (self.end or time.time()) - self.start
+
+
+class UnityPhaseTimeline:
+    """Splits a Unity build in phases, following the lines of its log."""
+
+    def __init__(self, start_time: float | None = None):
+        self.start_time = start_time or time.time()
+        self.spans = [PhaseSpan(phase="startup", start=self.start_time)]
+        self.markers: list[tuple[float, str]] = []
+
+    @property
+    def current_phase(self):
+        return self.spans[-1].phase
+
+    def classify(self, line: str, parsed_line: ParsedLine):
+        if phase := KIND_PHASES.get(parsed_line.kind):
+            return phase
+        match parsed_line.kind:
+            case LineKind.progress_bar | LineKind.bracketed_progress:
+                phase_match = PHASE_PATTERN.search(parsed_line.short_message)
+            case LineKind.plain:
+                phase_match = PLAIN_PHASE_PATTERN.match(line)
+            case _:
+                return None
+        if phase_match:
+            return phase_match.lastgroup
+        if parsed_line.kind == LineKind.bracketed_progress:
+            return "bee"
+        return None
+
+    def add_line(self, line: str, parsed_line: ParsedLine, line_time: float):
+        """Returns the name of the new phase, if the line starts one."""
+        if parsed_line.kind in (LineKind.progress_bar, LineKind.bracketed_progress):
+            if len(self.markers) < MAX_MARKERS:
+                self.markers.append((line_time, parsed_line.short_message))
+        phase = self.classify(line, parsed_line)
+        new_phase = None
+        if phase is not None and phase != self.current_phase:
+            self.spans[-1].end = line_time
+            self.spans.append(PhaseSpan(phase=phase, start=line_time))
+            new_phase = PHASES[phase]
+        self.spans[-1].lines += 1
+        return new_phase
+
+    def finish(self, end_time: float | None = None):
+        if self.spans[-1].end is None:
+            self.spans[-1].end = end_time or time.time()
+
+    def durations(self):
+        durations = {}
+        for span in self.spans:
+            durations[span.phase] = durations.get(span.phase, 0) + span.duration
+        return sorted(durations.items(), key=lambda item: item[1], reverse=True)
+
+    def table(self):
+        total = sum(duration for _, duration in self.durations()) or 1e-6
+        rows = [f"{'Phase':<20} {'Duration':>10} {'Share':>6}"]
+        for phase, duration in self.durations():
+            rows.append(
+                f"{PHASES[phase]:<20} {duration:>9.2f}s {duration / total:>6.1%}"
+            )
+        return "\n".join(rows)
+
+    def to_chrome_trace(self, name: str):
+        """Returns the timeline as Chrome trace events."""
+
+        def microseconds(timestamp: float):
+            return round((timestamp - self.start_time) * 1_000_000)
+
+        events = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": 1,
+                "tid": 1,
+                "args": {"name": name},
+            }
+        ]
+        for span in self.spans:
+            events.append(
+                {
+                    "name": PHASES[span.phase],
+                    "cat": "phase",
+                    "ph": "X",
+                    "ts": microseconds(span.start),
+                    "dur": round(span.duration * 1_000_000),
+                    "pid": 1,
+                    "tid": 1,
+                    "args": {"lines": span.lines},
+                }
+            )
+        for marker_time, marker in self.markers:
+            events.append(
+                {
+                    "name": marker,
+                    "cat": "progress",
+                    "ph": "i",
+                    "s": "t",
+                    "ts": microseconds(marker_time),
+                    "pid": 1,
+                    "tid": 2,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, project_name: str, build_target: str):
+        trace_path = TRACES_PATH / project_name
+        trace_path.mkdir(parents=True, exist_ok=True)
+        trace_path /= (
+            time.strftime("%Y%m%d-%H%M%S", time.localtime(self.start_time))
+            + f"_{build_target}.json"
+        )
+        trace = self.to_chrome_trace(f"{project_name} ({build_target})")
+        trace_path.write_bytes(msgspec.json.encode(trace))
+        return trace_path
@@ -1,13 +1,19 @@
+import ctypes
 import os
 import platform
 import shutil
 import subprocess
+import threading
+import time
 from enum import Enum
 
+FICLONE = 0x40049409
+
 
 class OperatingSystem(Enum):
     windows = "Windows"
     macos = "MacOS"
+    linux = "Linux"
     unkwnow = "Unknown"
 
     @classmethod
@@ -18,6 +24,8 @@ class OperatingSystem(Enum):
                 return cls.windows
             case "Darwin":
                 return cls.macos
+            case "Linux":
+                return cls.linux
             case _:
                 return cls.unkwnow
 
@@ -51,6 +59,10 @@ def get_app_dir(app_name: str) -> str:
         return os.path.join(
             os.path.expanduser("~/Library/Application Support"), app_name
         )
+    return os.path.join(
+        os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config")),
+        "-".join(app_name.split()).lower(),
+    )
 
 
 def better_rmtree(path):
@@ -71,3 +83,193 @@ def better_rmtree(path):
                 pass
 
     shutil.rmtree(path=path, onerror=onerror)
+
+
+def reflink(src, dst):
+    """Clones `src` as `dst`, raising `OSError` if it is not supported."""
+    match platform.system():
+        case "Linux":
+            import fcntl
+
+            with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+                try:
+                    fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+                except OSError:
+                    dst_file.close()
+                    os.unlink(dst)
+                    raise
+        case "Darwin":
+            clonefile = getattr(ctypes.CDLL(None, use_errno=True), "clonefile", None)
+            if clonefile is None:
+                raise OSError("clonefile is not available")
+            if clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno), str(src))
+        case _:
+            raise OSError(f"Reflinks are not supported on {platform.system()}")
+    shutil.copystat(src, dst)
+
+
+def clone_or_copy(src, dst, *, follow_symlinks=True):
+    try:
+        reflink(src, dst)
+        return dst
+    except OSError:
+        return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+
+
+def link_or_copy(src, dst, *, follow_symlinks=True):
+    try:
+        os.link(src, dst)
+        return dst
+    except OSError:
+        return clone_or_copy(src, dst, follow_symlinks=follow_symlinks)
+
+
+def get_available_memory() -> int | None:
+    try:
+        match OperatingSystem.current:
+            case OperatingSystem.windows:
+
+                class MemoryStatus(ctypes.Structure):
+                    _fields_ = [
+                        ("dwLength", ctypes.c_ulong),
+                        ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong),
+                        ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong),
+                        ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong),
+                        ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+                    ]
+
+                memory_status = MemoryStatus()
+                memory_status.dwLength = ctypes.sizeof(MemoryStatus)
+                ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(memory_status))
+                return memory_status.ullAvailPhys
+            case OperatingSystem.macos:
+                vm_stat = run_subprocess(["vm_stat"])
+                page_size = int(vm_stat.split("page size of ")[1].split()[0])
+                pages = {
+                    key.strip(): int(value.strip(" ."))
+                    for key, value in (
+                        line.split(":", 1) for line in vm_stat.splitlines()[1:]
+                    )
+                }
+                return page_size * (
+                    pages["Pages free"]
+                    + pages["Pages inactive"]
+                    + pages.get("Pages speculative", 0)
+                )
+            case _:
+                with open("/proc/meminfo") as meminfo:
+                    for line in meminfo:
+                        if line.startswith("MemAvailable:"):
+                            return int(line.split()[1]) * 1024
+    except (OSError, ValueError, KeyError, IndexError, subprocess.SubprocessError):
+        pass
+    return None
+
+
+def set_low_io_priority():
+    try:
+        match OperatingSystem.current:
+            case OperatingSystem.windows:
+                THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+                kernel32 = ctypes.windll.kernel32
+                return bool(
+                    kernel32.SetThreadPriority(
+                        kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN
+                    )
+                )
+            case OperatingSystem.macos:
+                IOPOL_TYPE_DISK, IOPOL_SCOPE_THREAD, IOPOL_THROTTLE = 0, 1, 3
+                libc = ctypes.CDLL(None, use_errno=True)
+                return (
+                    libc.setiopolicy_np(
+                        IOPOL_TYPE_DISK, IOPOL_SCOPE_THREAD, IOPOL_THROTTLE
+                    )
+                    == 0
+                )
+            case OperatingSystem.linux:
+                IOPRIO_WHO_PROCESS, IOPRIO_CLASS_IDLE, IOPRIO_CLASS_SHIFT = 1, 3, 13
+                ioprio_set = {"x86_64": 251, "aarch64": 30}.get(platform.machine())
+                thread_id = threading.get_native_id()
+                os.setpriority(os.PRIO_PROCESS, thread_id, 19)
+                if ioprio_set is None:
+                    return False
+                libc = ctypes.CDLL(None, use_errno=True)
+                return (
+                    libc.syscall(
+                        ioprio_set,
+                        IOPRIO_WHO_PROCESS,
+                        thread_id,
+                        IOPRIO_CLASS_IDLE << IOPRIO_CLASS_SHIFT,
+                    )
+                    == 0
+                )
+    except (OSError, AttributeError):
+        pass
+    return False
+
+
+def get_directory_size(path) -> int:
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return size
+
+
+class FileLock:
+    def __init__(self, path, poll_interval: float = 0.1, blocking: bool = True):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.blocking = blocking
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, "a+b")
+        try:
+            self.acquire()
+        except BaseException:
+            self.file.close()
+            self.file = None
+            raise
+        return self
+
+    def acquire(self):
+        if OperatingSystem.current == OperatingSystem.windows:
+            import msvcrt
+
+            while True:
+                try:
+                    self.file.seek(0)
+                    msvcrt.locking(self.file.fileno(), msvcrt.LK_NBLCK, 1)
+                    return
+                except OSError:
+                    if not self.blocking:
+                        raise BlockingIOError(f"{self.path} is locked")
+                    time.sleep(self.poll_interval)
+        else:
+            import fcntl
+
+            flags = fcntl.LOCK_EX if self.blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            fcntl.flock(self.file.fileno(), flags)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if OperatingSystem.current == OperatingSystem.windows:
+            import msvcrt
+
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        self.file.close()
+        self.file = None
@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from parallel_build.build_step import BuildStep
+from parallel_build.copier import format_size
+from parallel_build.disk_budget import disk_budget
+from parallel_build.trash import PROCESS_TEMP_DIR_PREFIX, trash
+from parallel_build.utils import OperatingSystem, get_available_memory
+
+DEFAULT_RAM_DISK_PATHS = {OperatingSystem.linux: "/dev/shm"}
+
+
+def get_ram_disk_path(ram_disk_path: str | None = None):
+    ram_disk_path = ram_disk_path or DEFAULT_RAM_DISK_PATHS.get(OperatingSystem.current)
+    if ram_disk_path and os.path.isdir(ram_disk_path):
+        return Path(ram_disk_path)
+    return None
+
+
+class WorkspaceRoot:
+    """Where the temporary projects are built."""
+
+    def __init__(
+        self,
+        path: str | None = None,
+        ram_disk: bool = False,
+        ram_disk_path: str | None = None,
+        build_memory_mb: int = 0,
+        copies: int = 1,
+        size_estimate_keys: list[str] | None = None,
+    ):
+        self.disk_path = Path(path).expanduser() if path else None
+        self.ram_disk = ram_disk
+        self.ram_disk_path = get_ram_disk_path(ram_disk_path) if ram_disk else None
+        self.build_memory = build_memory_mb * 1024 * 1024
+        self.copies = max(1, copies)
+        self.size_estimate_keys = size_estimate_keys or []
+
+    @property
+    def persistent_path(self):
+        path = self.disk_path or Path(tempfile.gettempdir())
+        path.mkdir(parents=True, exist_ok=True)
+        trash.clean_leftovers(path)
+        return path
+
+    def is_in_ram(self, path: Path):
+        return self.ram_disk_path is not None and Path(path).is_relative_to(
+            self.ram_disk_path
+        )
+
+    def ram_disk_shortage(self, snapshot_size: int):
+        size = self.copies * snapshot_size + sum(
+            disk_budget.size_estimate(key) for key in self.size_estimate_keys
+        )
+        ram_disk_free = (
+            shutil.disk_usage(self.ram_disk_path).free - disk_budget.min_free
+        )
+        if size > ram_disk_free:
+            return (
+                f"about {format_size(size)} needed, "
+                f"{format_size(ram_disk_free)} free in {self.ram_disk_path}"
+            )
+        available_memory = get_available_memory()
+        if available_memory is None:
+            return "the available memory is unknown"
+        needed_memory = size + self.copies * self.build_memory
+        if needed_memory > available_memory:
+            return (
+                f"about {format_size(needed_memory)} needed with the Unity "
+                f"instances, {format_size(available_memory)} available"
+            )
+        return None
+
+    def get_path(self, snapshot_size: int | None):
+        if not self.ram_disk:
+            return self.persistent_path
+        if self.ram_disk_path is None:
+            BuildStep.message.emit("No RAM disk found, building on the disk")
+            return self.persistent_path
+        if snapshot_size is None:
+            BuildStep.message.emit("Project size unknown yet, building on the disk")
+            return self.persistent_path
+        shortage = self.ram_disk_shortage(snapshot_size)
+        if shortage:
+            BuildStep.message.emit(
+                f"Not enough memory to build in the RAM disk ({shortage}), "
+                "building on the disk"
+            )
+            return self.persistent_path
+        BuildStep.message.emit(f"Building in the RAM disk {self.ram_disk_path}")
+        trash.clean_leftovers(self.ram_disk_path)
+        return self.ram_disk_path
+
+    def mkdtemp(self, snapshot_size: int | None = None):
+        return tempfile.mkdtemp(
+            prefix=PROCESS_TEMP_DIR_PREFIX, dir=self.get_path(snapshot_size)
+        )
@@ -0,0 +1,68 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# the caches, logs and state of the tests go in their own app folder, set before
+# the modules compute their paths from it
+APP_PATH = tempfile.mkdtemp(prefix="parallel_build_tests_")
+for variable in ("APPDATA", "XDG_CONFIG_HOME", "HOME"):
+    os.environ[variable] = APP_PATH
+
+FAKE_UNITY_PATH = Path(__file__).parents[1] / "benchmarks" / "fake_unity.py"
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(APP_PATH, ignore_errors=True)
+
+
+@pytest.fixture
+def fake_unity(monkeypatch):
+    """Builds with the fake Unity editor of the benchmarks."""
+    from parallel_build.unity_builder import EDITOR_PATH_VARIABLE
+
+    monkeypatch.setenv(EDITOR_PATH_VARIABLE, f'"{sys.executable}" "{FAKE_UNITY_PATH}"')
+    monkeypatch.setenv("FAKE_UNITY_LINES", "100")
+    monkeypatch.setenv("FAKE_UNITY_BUILD_MB", "1")
+
+
+@pytest.fixture
+def unity_project(tmp_path):
+    project_path = tmp_path / "Project"
+    (project_path / "ProjectSettings").mkdir(parents=True)
+    (project_path / "ProjectSettings" / "ProjectVersion.txt").write_text(
+        "m_EditorVersion: 2022.3.10f1\n"
+    )
+    (project_path / "Assets").mkdir()
+    (project_path / "Assets" / "scene.unity").write_bytes(b"scene")
+    return project_path
+
+
+def git(path, *args):
+    subprocess.run(["git", *args], cwd=path, check=True, capture_output=True)
+
+
+@pytest.fixture
+def git_commit():
+    def _git_commit(path, name: str, content: bytes):
+        (path / name).write_bytes(content)
+        git(path, "add", name)
+        git(path, "commit", "-m", f"Update {name}")
+
+    return _git_commit
+
+
+@pytest.fixture
+def git_repository(tmp_path, monkeypatch, git_commit):
+    for variable in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{variable}_NAME", "Parallel Build")
+        monkeypatch.setenv(f"GIT_{variable}_EMAIL", "parallel@build")
+    path = tmp_path / "repository"
+    path.mkdir()
+    git(path, "init", "--initial-branch=main")
+    git_commit(path, "scene.unity", b"scene")
+    return path
@@ -0,0 +1,84 @@
+import pytest
+
+from parallel_build import build_cache as build_cache_module
+from parallel_build.build_cache import BuildCache
+from parallel_build.config import ProjectBuildConfig
+
+
+@pytest.fixture(autouse=True)
+def cache_path(tmp_path, monkeypatch):
+    cache_path = tmp_path / "build_cache"
+    monkeypatch.setattr(build_cache_module, "BUILD_CACHE_PATH", cache_path)
+    monkeypatch.setattr(build_cache_module, "ENTRIES_PATH", cache_path / "entries")
+    monkeypatch.setattr(build_cache_module, "HASHES_PATH", cache_path / "hashes")
+    monkeypatch.setattr(build_cache_module, "LOCK_PATH", cache_path / "cache.lock")
+    monkeypatch.setattr(build_cache_module.disk_budget, "track", lambda *args: None)
+    monkeypatch.setattr(build_cache_module.disk_budget, "touch", lambda *args: None)
+    return cache_path
+
+
+@pytest.fixture
+def project_path(tmp_path):
+    project_path = tmp_path / "Project"
+    (project_path / "ProjectSettings").mkdir(parents=True)
+    (project_path / "ProjectSettings" / "ProjectVersion.txt").write_text(
+        "m_EditorVersion: 2022.3.10f1\n"
+    )
+    (project_path / "Assets").mkdir()
+    (project_path / "Assets" / "scene.unity").write_bytes(b"scene")
+    return project_path
+
+
+def make_build(cache: BuildCache):
+    cache.build_path.mkdir(parents=True)
+    (cache.build_path / "index.html").write_bytes(b"build")
+    return cache.build_path / "index.html"
+
+
+def cached_file(cache: BuildCache):
+    return cache.entry_path / build_cache_module.BUILD_NAME / "index.html"
+
+
+def test_store_and_restore(tmp_path, project_path):
+    cache = BuildCache("Project", project_path, ProjectBuildConfig())
+    assert not cache.restore()
+    make_build(cache)
+    cache.store()
+
+    cache = BuildCache("Project", project_path, ProjectBuildConfig())
+    (cache.build_path / "index.html").unlink()
+    assert cache.restore()
+    assert (cache.build_path / "index.html").read_bytes() == b"build"
+
+
+def test_project_change_misses(project_path):
+    cache = BuildCache("Project", project_path, ProjectBuildConfig())
+    cache.restore()
+    make_build(cache)
+    cache.store()
+
+    (project_path / "Assets" / "scene.unity").write_bytes(b"changed scene")
+    cache = BuildCache("Project", project_path, ProjectBuildConfig())
+    assert not cache.restore()
+
+
+def test_build_of_disposable_project_is_linked(project_path):
+    cache = BuildCache("Project", project_path, ProjectBuildConfig())
+    cache.restore()
+    build_file = make_build(cache)
+    cache.store(disposable_project=True)
+
+    assert cached_file(cache).stat().st_ino == build_file.stat().st_ino
+
+
+def test_build_outside_disposable_project_is_copied(tmp_path, project_path):
+    build_config = ProjectBuildConfig(path=str(tmp_path / "Output"))
+    cache = BuildCache("Project", project_path, build_config)
+    cache.restore()
+    build_file = make_build(cache)
+    cache.store(disposable_project=True)
+
+    assert cached_file(cache).stat().st_ino != build_file.stat().st_ino
+    # the next build overwrites it in place
+    build_file.write_bytes(b"next build")
+    assert cached_file(cache).read_bytes() == b"build"
@@ -0,0 +1,81 @@
+from parallel_build import build_history
+from parallel_build.build_history import (
+    BuildHistory,
+    BuildProgressEstimator,
+    ProgressEstimate,
+)
+from parallel_build.unity_log import UnityLogParser
+from parallel_build.unity_timeline import UnityPhaseTimeline
+
+LOG = [
+    "Initialize engine version: 2022.3.10f1",
+    "[Package Manager] Registered 42 packages",
+    *(f"Start importing Assets/texture_{index}.png" for index in range(10)),
+    *(f"[{index}/4] Compiling WebAssembly (il2cpp)" for index in range(1, 5)),
+    "Brotli compressing Build/WebGL.data",
+    "Build succeeded",
+]
+
+
+def make_timeline(seconds_per_line: float):
+    parser = UnityLogParser()
+    timeline = UnityPhaseTimeline(start_time=1000)
+    for index, line in enumerate(LOG):
+        timeline.add_line(line, parser.parse(line), 1000 + index * seconds_per_line)
+    timeline.finish(1000 + len(LOG) * seconds_per_line)
+    return timeline
+
+
+def test_add_build(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_history, "BUILD_HISTORY_PATH", tmp_path)
+    history = BuildHistory.load("Project", "WebGL")
+    history.add_build(make_timeline(1), len(LOG))
+    history.add_build(make_timeline(3), len(LOG))
+    history.save("Project", "WebGL")
+
+    history = BuildHistory.load("Project", "WebGL")
+    assert history.builds == 2
+    assert history.duration == 2 * len(LOG)
+    assert history.lines == len(LOG)
+    asset_import = history.phases["asset_import"]
+    assert (asset_import.start, asset_import.lines) == (2 / len(LOG), 10)
+    assert asset_import.is_contiguous
+
+
+def estimate_percents(history: BuildHistory, log: list[str]):
+    parser = UnityLogParser()
+    timeline = UnityPhaseTimeline()
+    estimator = BuildProgressEstimator(history)
+    percents = []
+    for line in log:
+        parsed_line = parser.parse(line)
+        timeline.add_line(line, parsed_line, timeline.start_time)
+        estimate = estimator.add_line(line, parsed_line, timeline.current_phase)
+        percents.append(estimate and estimate.percent)
+    return percents
+
+
+def test_progress_estimate():
+    history = BuildHistory()
+    history.add_build(make_timeline(1), len(LOG))
+
+    percents = estimate_percents(history, LOG)
+    assert percents[:3] == [5, 11, 16]
+    assert percents[-1] == 99
+
+    # the counters give the progress within their phase, which is 12/18 to 16/18
+    percents = estimate_percents(history, [*LOG[:12], "[3/4] Compiling (il2cpp)"])
+    assert percents[-1] == 83
+
+
+def test_no_estimate_without_history():
+    estimator = BuildProgressEstimator(BuildHistory())
+    parsed_line = UnityLogParser().parse(LOG[0])
+    assert estimator.add_line(LOG[0], parsed_line, "startup") is None
+
+
+def test_progress_estimate_text():
+    assert str(ProgressEstimate(progress=0.5, remaining=None)) == "50%"
+    assert str(ProgressEstimate(progress=0.25, remaining=3725)) == (
+        "25%, about 1h 02m left"
+    )
@@ -0,0 +1,78 @@
+from parallel_build.build_step import BuildStep
+from parallel_build.config import (
+    BuildTarget,
+    Config,
+    Project,
+    ProjectPostBuildAction,
+    ProjectSource,
+    ProjectSourceType,
+    ProjectTargetConfig,
+)
+from parallel_build.disk_budget import disk_budget
+from parallel_build.main import BuildProcess
+
+
+def make_config(project_path, **project_options):
+    return Config(
+        projects=[
+            Project(
+                name="Project",
+                source=ProjectSource(
+                    type=ProjectSourceType.local, value=str(project_path)
+                ),
+                **project_options,
+            )
+        ]
+    )
+
+
+def test_build(fake_unity, unity_project):
+    results = []
+    build_process = BuildProcess(
+        "Project", on_build_end=results.append, config=make_config(unity_project)
+    )
+    build_process.run(continuous=False)
+
+    assert results == [True]
+    # the build of the fake editor, and no Library growth
+    size_estimate = disk_budget.size_estimate("Project/WebGL/build")
+    assert 1024 * 1024 <= size_estimate < 2 * 1024 * 1024
+
+
+def test_matrix_build(fake_unity, unity_project, tmp_path):
+    targets = [
+        ProjectTargetConfig(
+            target=target,
+            path=f"Build/{target.value}",
+            post_build=[
+                ProjectPostBuildAction(
+                    action="copy",
+                    params={"target": str(tmp_path / "builds" / target.value)},
+                )
+            ],
+        )
+        for target in (BuildTarget.webgl, BuildTarget.linux)
+    ]
+    messages = []
+    BuildStep.long_message.set(messages.append)
+    results = []
+    try:
+        build_process = BuildProcess(
+            "Project",
+            on_build_end=results.append,
+            config=make_config(unity_project, targets=targets),
+        )
+        build_process.run(continuous=False)
+    finally:
+        BuildStep.long_message.clear()
+
+    assert results == [True]
+    assert sorted(path.name for path in (tmp_path / "builds").iterdir()) == [
+        "Linux64",
+        "WebGL",
+    ]
+    assert all(any(path.iterdir()) for path in (tmp_path / "builds").iterdir())
+    for target in ("WebGL", "Linux64"):
+        assert any(
+            message.startswith(f"[✓] {target}: built in") for message in messages
+        )
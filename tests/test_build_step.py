@@ -0,0 +1,57 @@
+import threading
+
+from parallel_build.build_step import BuildStepEvent, EventBatcher
+
+
+def test_batched_values_keep_their_order():
+    delivered = []
+    batcher = EventBatcher(max_lines=1000)
+    lines = batcher.batched(lambda values: delivered.append(("lines", values)))
+    errors = batcher.immediate(lambda value: delivered.append(("error", value)))
+    for line in ("a", "b"):
+        lines(line)
+    errors("failed")
+    lines("c")
+
+    assert delivered == [("lines", ["a", "b"]), ("error", "failed")]
+    batcher.close()
+    assert delivered[-1] == ("lines", ["c"])
+
+
+def test_batched_values_are_flushed_every_max_lines():
+    delivered = []
+    batcher = EventBatcher(max_lines=3)
+    lines = batcher.batched(delivered.append)
+    for line in range(7):
+        lines(line)
+
+    assert delivered == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_latest():
+    delivered = []
+    batcher = EventBatcher()
+    progress = batcher.latest(delivered.append)
+    for value in range(5):
+        progress(value)
+    batcher.flush()
+
+    assert delivered == [4]
+
+
+def test_event_flush():
+    delivered = []
+    event = BuildStepEvent(str)
+    batcher = EventBatcher()
+    event.set(batcher.batched(delivered.append))
+    event.emit("a")
+    event.flush()
+
+    assert delivered == [["a"]]
+
+
+def test_timer():
+    delivered = threading.Event()
+    with EventBatcher(interval=0.01) as batcher:
+        batcher.batched(lambda values: delivered.set())("a")
+        assert delivered.wait(5)
@@ -0,0 +1,93 @@
+import subprocess
+import sys
+
+import pytest
+
+from parallel_build.command import (
+    MAX_LINE_LENGTH,
+    CommandExecutor,
+    LineSplitter,
+    Origin,
+    OutputTail,
+    read_pipes_with_threads,
+)
+from parallel_build.exceptions import BuildProcessError
+
+# writes more than a pipe buffer to both streams before exiting
+CHATTY_SCRIPT = """
+import sys
+for index in range(20000):
+    print(f"out {index}")
+    print(f"err {index}", file=sys.stderr)
+sys.exit(int(sys.argv[1]))
+"""
+
+
+def python(script: str, *args):
+    return [sys.executable, "-c", script, *args]
+
+
+def test_line_splitter():
+    splitter = LineSplitter(Origin.stdout)
+    text = "café\r\nnaïve\n".encode("utf-8")
+    lines = [
+        line.text
+        for index in range(len(text))
+        for line in splitter.feed(text[index : index + 1])
+    ]
+    assert lines == ["café", "naïve"]
+    assert splitter.feed(b"x" * (MAX_LINE_LENGTH + 10)) == [
+        (Origin.stdout, "x" * MAX_LINE_LENGTH)
+    ]
+    assert splitter.close() == [(Origin.stdout, "x" * 10)]
+
+
+def test_output_tail():
+    tail = OutputTail(max_size=10)
+    for line in ("first", "second", "third"):
+        tail.append(line)
+    assert str(tail) == "[...]\nthird"
+
+
+def test_run():
+    lines = []
+    errors = []
+    executor = CommandExecutor(lines.append, errors.append)
+    executor.run(python(CHATTY_SCRIPT, "0"))
+
+    assert lines == [f"out {index}" for index in range(20000)]
+    assert errors == []
+
+
+def test_run_failure():
+    errors = []
+    executor = CommandExecutor(lambda line: None, errors.append)
+    with pytest.raises(BuildProcessError, match="Error running"):
+        executor.run(python(CHATTY_SCRIPT, "1"))
+
+    # only the last part of stderr is reported
+    assert errors[0].startswith("[...]\n")
+    assert errors[0].endswith("err 19999")
+
+
+def test_return_output():
+    executor = CommandExecutor(lambda line: None, lambda line: None)
+    output = executor.run(python("print('a'); print('b')"), return_output=True)
+    assert output == "a\nb\n"
+
+
+def test_read_pipes_with_threads():
+    process = subprocess.Popen(
+        python(CHATTY_SCRIPT, "0"), stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    lines = list(
+        read_pipes_with_threads(
+            {Origin.stdout: process.stdout, Origin.stderr: process.stderr}
+        )
+    )
+    process.wait()
+
+    for origin, prefix in ((Origin.stdout, "out"), (Origin.stderr, "err")):
+        assert [line.text for line in lines if line.origin == origin] == [
+            f"{prefix} {index}" for index in range(20000)
+        ]
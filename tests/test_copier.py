@@ -0,0 +1,79 @@
+import os
+import shutil
+
+import pytest
+
+from parallel_build.copier import ParallelCopier
+from parallel_build.exceptions import BuildProcessInterrupt
+
+
+def make_tree(path):
+    (path / "Assets" / "Scenes").mkdir(parents=True)
+    (path / "Assets" / "Scenes" / "scene.unity").write_bytes(b"scene")
+    (path / "Assets" / "texture.png").write_bytes(os.urandom(10_000))
+    (path / "Library").mkdir()
+    (path / "Library" / "cache.bin").write_bytes(b"cache")
+    (path / "Packages").mkdir()
+    return path
+
+
+def tree_contents(path):
+    return {
+        file.relative_to(path).as_posix(): file.read_bytes()
+        for file in path.rglob("*")
+        if file.is_file()
+    }
+
+
+def test_copytree(tmp_path):
+    src = make_tree(tmp_path / "src")
+    stats = ParallelCopier(workers=4).copytree(
+        src, tmp_path / "dst", ignore=shutil.ignore_patterns("Library")
+    )
+
+    expected = tree_contents(src)
+    del expected["Library/cache.bin"]
+    assert tree_contents(tmp_path / "dst") == expected
+    assert (tmp_path / "dst" / "Packages").is_dir()
+    assert stats.files == 2
+    assert stats.bytes == 10_005
+
+
+def test_large_files_are_copied_in_chunks(tmp_path):
+    src = make_tree(tmp_path / "src")
+    copied = []
+
+    def copy_function(src, dst):
+        copied.append(os.path.basename(src))
+        shutil.copy2(src, dst)
+
+    copier = ParallelCopier(
+        workers=3,
+        copy_function=copy_function,
+        large_file_threshold=1000,
+        chunk_size=3000,
+    )
+    copier.copytree(src, tmp_path / "dst")
+
+    assert tree_contents(tmp_path / "dst") == tree_contents(src)
+    assert sorted(copied) == ["cache.bin", "scene.unity"]
+    assert (tmp_path / "dst" / "Assets" / "texture.png").stat().st_mtime_ns == (
+        src / "Assets" / "texture.png"
+    ).stat().st_mtime_ns
+
+
+def test_copy_error(tmp_path):
+    def copy_function(src, dst):
+        raise PermissionError(src)
+
+    with pytest.raises(PermissionError):
+        ParallelCopier(copy_function=copy_function).copytree(
+            make_tree(tmp_path / "src"), tmp_path / "dst"
+        )
+
+
+def test_interrupt(tmp_path):
+    copier = ParallelCopier(workers=2, is_interrupted=lambda: True)
+    with pytest.raises(BuildProcessInterrupt):
+        copier.copytree(make_tree(tmp_path / "src"), tmp_path / "dst")
+    assert not (tmp_path / "dst" / "Assets" / "texture.png").exists()
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from parallel_build.build_step import BuildStep
+from parallel_build.post_build import CopyBuild
+
+
+@pytest.fixture
+def messages():
+    messages = []
+    BuildStep.short_message.set(messages.append)
+    yield messages
+    BuildStep.short_message.clear()
+
+
+def make_build(path):
+    (path / "Data" / "Managed").mkdir(parents=True)
+    (path / "game.exe").write_bytes(b"game")
+    (path / "Data" / "level0").write_bytes(b"level")
+    (path / "Data" / "Managed" / "Assembly.dll").write_bytes(b"assembly")
+    return path
+
+
+def tree_contents(path):
+    return {
+        file.relative_to(path).as_posix(): file.read_bytes()
+        for file in path.rglob("*")
+        if file.is_file()
+    }
+
+
+def test_sync(tmp_path, messages):
+    build_path = make_build(tmp_path / "Build")
+    target_path = tmp_path / "target" / "Game"
+    CopyBuild(build_path, str(target_path), sync=True).run()
+    assert tree_contents(target_path) == tree_contents(build_path)
+    assert (tmp_path / "target" / "Game.manifest.json").exists()
+
+    (build_path / "game.exe").write_bytes(b"new game")
+    # rebuilt with the same content
+    os.utime(build_path / "Data" / "level0", ns=(0, 0))
+    (build_path / "Data" / "Managed" / "Assembly.dll").unlink()
+    (build_path / "Data" / "Managed").rmdir()
+    level_inode = (target_path / "Data" / "level0").stat().st_ino
+    CopyBuild(build_path, str(target_path), sync=True).run()
+
+    assert tree_contents(target_path) == tree_contents(build_path)
+    assert not (target_path / "Data" / "Managed").exists()
+    assert (target_path / "Data" / "level0").stat().st_ino == level_inode
+    assert "(1 of 2 files changed, 1 removed)" in messages[-1]
+    assert [path.name for path in target_path.rglob("*.tmp")] == []
+
+
+def test_sync_over_a_plain_copy(tmp_path, messages):
+    build_path = make_build(tmp_path / "Build")
+    target_path = tmp_path / "Game"
+    CopyBuild(build_path, str(target_path)).run()
+    (build_path / "game.exe").write_bytes(b"new game")
+    CopyBuild(build_path, str(target_path), sync=True).run()
+
+    assert tree_contents(target_path) == tree_contents(build_path)
+    assert "(1 of 3 files changed, 0 removed)" in messages[-1]
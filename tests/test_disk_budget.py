@@ -0,0 +1,83 @@
+import pytest
+
+from parallel_build import disk_budget as disk_budget_module
+from parallel_build.disk_budget import DiskBudget, register_evictor
+from parallel_build.exceptions import BuildProcessError
+
+
+@pytest.fixture(autouse=True)
+def state_path(tmp_path, monkeypatch):
+    state_path = tmp_path / "state" / "disk_budget.json"
+    monkeypatch.setattr(disk_budget_module, "DISK_BUDGET_PATH", state_path)
+    monkeypatch.setattr(
+        disk_budget_module, "DISK_BUDGET_LOCK_PATH", state_path.with_suffix(".lock")
+    )
+    monkeypatch.setattr(disk_budget_module, "evictors", {})
+    return state_path
+
+
+def make_cache(path, size: int):
+    path.mkdir(parents=True)
+    (path / "data").write_bytes(b"0" * size)
+    return path
+
+
+def test_size_estimate_does_not_write(state_path):
+    disk_budget = DiskBudget()
+    assert disk_budget.size_estimate("Project/WebGL/build") == 0
+    assert not state_path.exists()
+
+    disk_budget.remember_size("Project/WebGL/build", 1000)
+    state = state_path.read_bytes()
+    assert disk_budget.size_estimate("Project/WebGL/build") == 1000
+    assert state_path.read_bytes() == state
+
+
+def test_least_recently_used_caches_evicted_over_budget(tmp_path):
+    disk_budget = DiskBudget(max_size_mb=1)
+    old_path = make_cache(tmp_path / "old", 600 * 1024)
+    used_path = make_cache(tmp_path / "used", 300 * 1024)
+    disk_budget.track(old_path, "cache", 600 * 1024)
+    disk_budget.track(used_path, "cache", 300 * 1024)
+    disk_budget.touch(old_path)
+    disk_budget.touch(used_path)
+
+    new_path = make_cache(tmp_path / "new", 300 * 1024)
+    disk_budget.track(new_path, "cache", 300 * 1024)
+
+    assert not old_path.exists()
+    assert used_path.exists()
+    assert new_path.exists()
+
+
+def test_caches_in_use_are_not_evicted(tmp_path):
+    disk_budget = DiskBudget(max_size_mb=1)
+    old_path = make_cache(tmp_path / "old", 600 * 1024)
+    disk_budget.track(old_path, "cache", 600 * 1024)
+    locked_path = make_cache(tmp_path / "locked", 300 * 1024)
+    disk_budget.track(locked_path, "locked cache", 300 * 1024)
+    register_evictor("locked cache", lambda path: False)
+
+    with disk_budget.using(old_path):
+        disk_budget.track(make_cache(tmp_path / "new", 300 * 1024), "cache", 300)
+
+    assert old_path.exists()
+    assert locked_path.exists()
+    # evicted once released
+    disk_budget.track(tmp_path / "new", "cache", 300 * 1024)
+    assert not old_path.exists()
+
+
+def test_check_evicts_for_space(tmp_path, monkeypatch):
+    disk_budget = DiskBudget()
+    cache_path = make_cache(tmp_path / "cache", 1024)
+    disk_budget.track(cache_path, "cache", 1024)
+    free = disk_budget_module.shutil.disk_usage(tmp_path).free
+    disk_budget.configure(None, free // (1024 * 1024) - 64)
+
+    disk_budget.check(tmp_path, 0, "the test")
+    assert cache_path.exists()
+
+    with pytest.raises(BuildProcessError, match="Not enough disk space for the test"):
+        disk_budget.check(tmp_path, 128 * 1024 * 1024, "the test")
+    assert not cache_path.exists()
@@ -0,0 +1,46 @@
+import pytest
+
+from parallel_build import git_mirror
+from parallel_build.git_mirror import GitMirror, evict_mirror
+from parallel_build.source import GitSource
+
+
+@pytest.fixture(autouse=True)
+def mirrors_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(git_mirror, "GIT_MIRRORS_PATH", tmp_path / "git_mirrors")
+    return tmp_path / "git_mirrors"
+
+
+def test_sessions_share_the_mirror(git_repository, git_commit):
+    source = GitSource("Project", str(git_repository), mirror=True)
+    other_source = GitSource("Project", str(git_repository), mirror=True)
+    with source, other_source:
+        assert source.mirror.path == other_source.mirror.path
+        assert len(source.mirror.worktrees) == 2
+        # a worktree in use keeps the mirror from being evicted
+        assert not evict_mirror(source.mirror.path)
+
+        for session in (source, other_source):
+            with session.temporary_project():
+                pass
+        git_commit(git_repository, "texture.png", b"texture")
+        for session in (source, other_source):
+            with session.temporary_project() as project_path:
+                assert (project_path / "texture.png").read_bytes() == b"texture"
+
+    mirror = GitMirror(str(git_repository))
+    assert mirror.worktrees == []
+    assert [mirror.name for mirror in GitMirror.list_all()] == [mirror.name]
+    assert mirror.info.last_fetch is not None
+
+
+def test_evict_mirror(git_repository):
+    with GitSource("Project", str(git_repository), mirror=True):
+        pass
+    mirror = GitMirror(str(git_repository))
+
+    with mirror.lock():
+        assert not evict_mirror(mirror.path)
+    assert evict_mirror(mirror.path)
+    assert not mirror.path.exists()
+    assert GitMirror.list_all() == []
@@ -0,0 +1,76 @@
+import pytest
+
+from parallel_build import library_cache as library_cache_module
+from parallel_build.config import BuildTarget
+from parallel_build.library_cache import LibraryCache
+
+
+@pytest.fixture(autouse=True)
+def disk_checks(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        library_cache_module, "LIBRARY_CACHE_PATH", tmp_path / "library_cache"
+    )
+    monkeypatch.setattr(library_cache_module.disk_budget, "track", lambda *args: None)
+    monkeypatch.setattr(library_cache_module.disk_budget, "touch", lambda *args: None)
+    disk_checks = []
+    monkeypatch.setattr(
+        library_cache_module.disk_budget,
+        "check",
+        lambda path, size, description: disk_checks.append(size),
+    )
+    return disk_checks
+
+
+def make_library(project_path, content: bytes = b"imported"):
+    library_path = project_path / "Library"
+    library_path.mkdir(exist_ok=True)
+    (library_path / "ArtifactDB").write_bytes(content)
+    return library_path
+
+
+def new_cache(project_path):
+    return LibraryCache("Project", project_path, BuildTarget.webgl)
+
+
+def test_store_and_seed(unity_project, disk_checks):
+    new_cache(unity_project).seed()
+    make_library(unity_project)
+    new_cache(unity_project).store()
+
+    library_path = unity_project / "Library"
+    library_path.rename(unity_project / "Library.old")
+    new_cache(unity_project).seed()
+    assert (library_path / "ArtifactDB").read_bytes() == b"imported"
+    # checked before copying, unless the files are cloned
+    assert disk_checks in ([], [8, 8])
+    assert not (unity_project / "Library.parallelbuild-seed").exists()
+
+
+def test_unchanged_library_is_not_stored_again(unity_project):
+    make_library(unity_project)
+    cache = new_cache(unity_project)
+    cache.store()
+    cache_inode = cache.cache_path.stat().st_ino
+
+    new_cache(unity_project).store()
+    assert cache.cache_path.stat().st_ino == cache_inode
+
+    make_library(unity_project, b"imported again")
+    new_cache(unity_project).store()
+    assert cache.cache_path.stat().st_ino != cache_inode
+    assert (cache.cache_path / "Library" / "ArtifactDB").read_bytes() == (
+        b"imported again"
+    )
+
+
+def test_changed_packages_discard_the_cache(unity_project):
+    make_library(unity_project)
+    new_cache(unity_project).store()
+    (unity_project / "Packages").mkdir()
+    (unity_project / "Packages" / "manifest.json").write_text("{}")
+    (unity_project / "Library").rename(unity_project / "Library.old")
+
+    cache = new_cache(unity_project)
+    cache.seed()
+    assert not (unity_project / "Library").exists()
+    assert not cache.cache_path.exists()
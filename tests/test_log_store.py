@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+
+from parallel_build import log_store
+from parallel_build.build_step import BuildStep
+from parallel_build.log_store import BLOCK_LINES, BuildLog, BuildLogWriter
+
+
+@pytest.fixture(autouse=True)
+def logs_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_store, "BUILD_LOGS_PATH", tmp_path / "build_logs")
+    return tmp_path / "build_logs"
+
+
+def in_thread(function):
+    thread = threading.Thread(target=function)
+    thread.start()
+    thread.join()
+
+
+def test_write_and_read():
+    writer = BuildLogWriter("Project")
+    writer.subscribe()
+    BuildStep.start.emit("Unity build")
+    for i in range(BLOCK_LINES + 10):
+        BuildStep.long_message.emit(f"line {i}")
+    BuildStep.error.emit("Build failed")
+    writer.close(success=False)
+
+    build_log = BuildLog.find("Project")
+    assert build_log.build_id == writer.build_log.build_id
+    lines = [text for _, text in build_log.read_lines()]
+    assert lines[0] == "// Unity build"
+    assert lines[-1] == "Build failed"
+    assert len(lines) == BLOCK_LINES + 12
+    # read from the member closest to the line
+    assert list(build_log.read_lines(BLOCK_LINES + 5, BLOCK_LINES + 7)) == [
+        (BLOCK_LINES + 5, f"line {BLOCK_LINES + 4}"),
+        (BLOCK_LINES + 6, f"line {BLOCK_LINES + 5}"),
+    ]
+    assert build_log.phases() == [("Unity build", 0, BLOCK_LINES + 12)]
+    assert [entry.kind for entry in build_log.index] == [
+        "start",
+        "phase",
+        "block",
+        "error",
+        "end",
+    ]
+    assert build_log.index[-1].success is False
+
+
+def test_only_the_added_threads_are_written():
+    writer = BuildLogWriter("Project")
+    writer.subscribe()
+
+    def added_thread():
+        writer.add_thread()
+        BuildStep.long_message.emit("added")
+
+    in_thread(added_thread)
+    # e.g. a thread of another build, even one that got the ident of a thread gone
+    in_thread(lambda: BuildStep.long_message.emit("other build"))
+    BuildStep.long_message.emit("creator")
+    writer.close(success=True)
+
+    assert [text for _, text in writer.build_log.read_lines()] == [
+        "added",
+        "creator",
+    ]
+
+
+def test_hold():
+    writer = BuildLogWriter("Project")
+    writer.subscribe()
+    writer.hold()
+    writer.close(success=True)
+
+    def post_build():
+        # in the background, after the build
+        writer.add_thread()
+        BuildStep.long_message.emit("post")
+
+    in_thread(post_build)
+    BuildStep.long_message.emit("next build")
+    writer.release(success=True)
+
+    assert [text for _, text in writer.build_log.read_lines()] == ["post"]
+    assert writer.build_log.index[-1].success is True
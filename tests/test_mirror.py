@@ -0,0 +1,111 @@
+import os
+
+import pytest
+
+from parallel_build import mirror
+from parallel_build.copier import ParallelCopier
+from parallel_build.mirror import WorkspaceMirror
+from parallel_build.source import ignore_patterns
+
+
+@pytest.fixture
+def workspace_mirror(tmp_path, monkeypatch):
+    monkeypatch.setattr(mirror, "WORKSPACES_PATH", tmp_path / "workspaces")
+    monkeypatch.setattr(mirror.disk_budget, "track", lambda *args: None)
+    source_path = tmp_path / "source"
+    (source_path / "Assets" / "Textures").mkdir(parents=True)
+    (source_path / "Assets" / "Textures" / "hero.png").write_bytes(b"hero" * 1000)
+    (source_path / "Assets" / "scene.unity").write_bytes(b"scene")
+    return WorkspaceMirror("Project", source_path)
+
+
+def sync(workspace_mirror: WorkspaceMirror):
+    copied, renamed, deleted, _ = workspace_mirror.sync(ParallelCopier(workers=2))
+    return copied, renamed, deleted
+
+
+def test_first_sync_copies_everything(workspace_mirror):
+    assert sync(workspace_mirror) == (2, 0, 0)
+    assert (workspace_mirror.project_path / "Assets" / "scene.unity").read_bytes() == (
+        b"scene"
+    )
+    assert sync(workspace_mirror) == (0, 0, 0)
+
+
+def test_renamed_file_is_moved_instead_of_copied(workspace_mirror):
+    sync(workspace_mirror)
+    source_path = workspace_mirror.source_path
+    (source_path / "Assets" / "Characters").mkdir()
+    os.replace(
+        source_path / "Assets" / "Textures" / "hero.png",
+        source_path / "Assets" / "Characters" / "hero.png",
+    )
+
+    assert sync(workspace_mirror) == (0, 1, 0)
+    project_path = workspace_mirror.project_path
+    assert (project_path / "Assets" / "Characters" / "hero.png").read_bytes() == (
+        b"hero" * 1000
+    )
+    # the emptied folder goes away with the file
+    assert not (project_path / "Assets" / "Textures").exists()
+    assert set(workspace_mirror.load_manifest()) == {
+        "Assets/Characters/hero.png",
+        "Assets/scene.unity",
+    }
+
+
+def test_renamed_file_changed_in_workspace_is_copied(workspace_mirror):
+    sync(workspace_mirror)
+    # e.g. rewritten by a build in the workspace
+    (workspace_mirror.project_path / "Assets" / "Textures" / "hero.png").write_bytes(
+        b"villain"
+    )
+    source_path = workspace_mirror.source_path
+    os.replace(
+        source_path / "Assets" / "Textures" / "hero.png",
+        source_path / "Assets" / "hero.png",
+    )
+
+    assert sync(workspace_mirror) == (1, 0, 1)
+    assert (workspace_mirror.project_path / "Assets" / "hero.png").read_bytes() == (
+        b"hero" * 1000
+    )
+
+
+def test_renamed_file_with_other_content_is_copied_with_checksum(workspace_mirror):
+    workspace_mirror.checksum = True
+    sync(workspace_mirror)
+    source_path = workspace_mirror.source_path
+    old_path = source_path / "Assets" / "Textures" / "hero.png"
+    stat = old_path.stat()
+    new_path = source_path / "Assets" / "villain.png"
+    # same size and modification time, different content
+    new_path.write_bytes(b"evil" * 1000)
+    os.utime(new_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    old_path.unlink()
+
+    assert sync(workspace_mirror) == (1, 0, 1)
+    assert (workspace_mirror.project_path / "Assets" / "villain.png").read_bytes() == (
+        b"evil" * 1000
+    )
+
+
+def test_files_written_by_the_build_are_deleted(workspace_mirror):
+    workspace_mirror.ignore = ignore_patterns(workspace_mirror.source_path)
+    (workspace_mirror.source_path / "Library").mkdir()
+    (workspace_mirror.source_path / "Library" / "ArtifactDB").write_bytes(b"db")
+    sync(workspace_mirror)
+    project_path = workspace_mirror.project_path
+    assert not (project_path / "Library").exists()
+    (project_path / "Library").mkdir()
+    (project_path / "Library" / "ArtifactDB").write_bytes(b"imported")
+    (project_path / "Assets" / "Editor").mkdir()
+    (project_path / "Assets" / "Editor" / "WebGLBuilder.cs").write_text("builder")
+    (project_path / "Build" / "WebGL").mkdir(parents=True)
+    (project_path / "Build" / "WebGL" / "index.html").write_text("build")
+
+    assert sync(workspace_mirror) == (0, 0, 2)
+    assert not (project_path / "Assets" / "Editor").exists()
+    assert not (project_path / "Build").exists()
+    assert (project_path / "Library" / "ArtifactDB").read_bytes() == b"imported"
+    assert (project_path / "Assets" / "scene.unity").exists()
@@ -0,0 +1,105 @@
+import threading
+
+import pytest
+
+from parallel_build import pipeline as pipeline_module
+from parallel_build import trash as trash_module
+from parallel_build.build_step import BuildStep
+from parallel_build.exceptions import BuildProcessError, BuildProcessInterrupt
+from parallel_build.pipeline import PostBuildPipeline, stage_build
+from parallel_build.trash import Trash
+
+
+@pytest.fixture
+def trash(tmp_path, monkeypatch):
+    monkeypatch.setattr(trash_module, "TRASH_PATH", tmp_path / "trash")
+    monkeypatch.setattr(trash_module, "PROCESS_LOCKS_PATH", tmp_path / "processes")
+    trash = Trash(workers=1)
+    monkeypatch.setattr(pipeline_module, "trash", trash)
+    yield trash
+    trash.close()
+
+
+@pytest.fixture
+def errors():
+    errors = []
+    BuildStep.error.set(errors.append)
+    yield errors
+    BuildStep.error.clear()
+
+
+def make_build(path):
+    path.mkdir(parents=True)
+    (path / "game.exe").write_bytes(b"game")
+    return path
+
+
+def test_stage_a_build_inside_the_project(tmp_path):
+    project_path = tmp_path / "project"
+    build_path = make_build(project_path / "Build")
+    staging_dir, staged_path = stage_build(build_path, project_path, tmp_path)
+
+    assert not build_path.exists()
+    assert staged_path == staging_dir / "Build"
+    assert (staged_path / "game.exe").read_bytes() == b"game"
+
+
+def test_stage_a_build_outside_the_project(tmp_path):
+    build_path = make_build(tmp_path / "Build")
+    staging_dir, staged_path = stage_build(
+        build_path / "game.exe", tmp_path / "project", tmp_path
+    )
+
+    assert (build_path / "game.exe").exists()
+    assert staged_path == staging_dir / "Build" / "game.exe"
+    assert staged_path.read_bytes() == b"game"
+
+
+def test_failed_post_build_is_reported_once(tmp_path, trash, errors):
+    def run_post_build(post_build, build_path):
+        raise BuildProcessError("upload failed")
+
+    project_path = tmp_path / "project"
+    with PostBuildPipeline(run_post_build, staging_root=tmp_path) as pipeline:
+        pipeline.check()
+        pipeline.submit(
+            "Post build", [], make_build(project_path / "Build"), project_path
+        )
+    trash.close()
+
+    assert errors == ["upload failed"]
+    with pytest.raises(BuildProcessInterrupt):
+        pipeline.check()
+    assert errors == ["upload failed"]
+    assert list(tmp_path.glob(f"{pipeline_module.PROCESS_TEMP_DIR_PREFIX}*")) == []
+
+
+def test_max_pending(tmp_path, trash):
+    running = threading.Semaphore(0)
+    finish = threading.Event()
+
+    def run_post_build(post_build, build_path):
+        running.release()
+        finish.wait()
+
+    project_path = tmp_path / "project"
+    interrupted = False
+    with PostBuildPipeline(
+        run_post_build,
+        max_pending=2,
+        is_interrupted=lambda: interrupted,
+        staging_root=tmp_path,
+    ) as pipeline:
+        for index in range(2):
+            build_path = make_build(project_path / f"Build{index}")
+            pipeline.submit(f"Post build {index}", [], build_path, project_path)
+        assert running.acquire(timeout=5) and running.acquire(timeout=5)
+
+        # a third build waits for a slot, until the builds are stopped
+        interrupted = True
+        with pytest.raises(BuildProcessInterrupt):
+            pipeline.submit(
+                "Post build 2", [], make_build(project_path / "Build2"), project_path
+            )
+        assert (project_path / "Build2").exists()
+        finish.set()
@@ -0,0 +1,71 @@
+import pytest
+
+from parallel_build.config import (
+    Config,
+    Project,
+    ProjectPostBuildAction,
+    ProjectSource,
+    ProjectSourceType,
+)
+from parallel_build.exceptions import BuildProcessError
+from parallel_build.main import BuildProcess
+from parallel_build.post_build import get_post_build_dependencies
+
+
+def action(name: str | None = None, after: list[str] | None = None):
+    return ProjectPostBuildAction(action="copy", params={}, name=name, after=after)
+
+
+def test_actions_without_after_keep_their_order():
+    assert get_post_build_dependencies([action(), action(), action()]) == [
+        set(),
+        {0},
+        {1},
+    ]
+
+
+def test_after():
+    post_build = [
+        action("copy"),
+        action("upload", after=[]),
+        action("publish", after=["copy", "upload"]),
+        action("notify"),
+    ]
+    assert get_post_build_dependencies(post_build) == [set(), set(), {0, 1}, {2}]
+
+
+def test_after_a_name_shared_by_several_actions():
+    post_build = [action(), action(after=[]), action("report", after=["copy"])]
+    assert get_post_build_dependencies(post_build) == [set(), set(), {0, 1}]
+
+
+def test_after_unknown_action():
+    with pytest.raises(BuildProcessError, match="'deploy', which does not exist"):
+        get_post_build_dependencies([action("copy"), action(after=["deploy"])])
+
+
+@pytest.mark.parametrize(
+    "post_build",
+    [
+        [action("copy", after=["copy"])],
+        [action("a", after=["b"]), action("b", after=["a"])],
+        [action("a", after=["c"]), action("b"), action("c")],
+    ],
+)
+def test_cycle(post_build):
+    with pytest.raises(BuildProcessError, match="wait for each other"):
+        get_post_build_dependencies(post_build)
+
+
+def test_wrong_order_fails_before_building():
+    config = Config(
+        projects=[
+            Project(
+                name="Project",
+                source=ProjectSource(type=ProjectSourceType.local, value="Project"),
+                post_build=[action("copy", after=["publish"])],
+            )
+        ]
+    )
+    with pytest.raises(BuildProcessError, match="'publish', which does not exist"):
+        BuildProcess("Project", config=config)
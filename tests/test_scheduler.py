@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+
+from parallel_build import scheduler
+from parallel_build.config import Config, Project, ProjectSource, ProjectSourceType
+from parallel_build.scheduler import BuildScheduler, get_max_parallel_builds
+
+
+class FakeBuildProcess:
+    """Records the builds instead of running them."""
+
+    lock = threading.Lock()
+    started: list[str] = []
+    running: list[str] = []
+    overlaps: list[str] = []
+    failing: set[str] = set()
+
+    def __init__(self, project_name: str, on_build_end):
+        self.project_name = project_name
+        self.on_build_end = on_build_end
+
+    def run(self, continuous: bool):
+        with self.lock:
+            if self.project_name in self.running:
+                self.overlaps.append(self.project_name)
+            self.started.append(self.project_name)
+            self.running.append(self.project_name)
+        time.sleep(0.02)
+        with self.lock:
+            self.running.remove(self.project_name)
+        self.on_build_end(self.project_name not in self.failing)
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def config(monkeypatch):
+    config = Config(
+        projects=[
+            Project(
+                name=name,
+                source=ProjectSource(type=ProjectSourceType.local, value=name),
+                priority=priority,
+            )
+            for name, priority in [("low", 0), ("high", 10), ("other", 0)]
+        ]
+    )
+    monkeypatch.setattr(scheduler.Config, "load", lambda: config)
+    monkeypatch.setattr(FakeBuildProcess, "started", [])
+    monkeypatch.setattr(FakeBuildProcess, "running", [])
+    monkeypatch.setattr(FakeBuildProcess, "overlaps", [])
+    monkeypatch.setattr(FakeBuildProcess, "failing", set())
+    monkeypatch.setattr(scheduler, "BuildProcess", FakeBuildProcess)
+    return config
+
+
+def test_higher_priority_first_then_submission_order(config):
+    build_scheduler = BuildScheduler(max_workers=1)
+    for project_name in ["low", "other", "high"]:
+        build_scheduler.submit(project_name)
+    jobs = build_scheduler.run()
+
+    assert FakeBuildProcess.started == ["high", "low", "other"]
+    assert [job.finished_with_success for job in jobs] == [True, True, True]
+
+
+def test_priority_override(config):
+    build_scheduler = BuildScheduler(max_workers=1)
+    build_scheduler.submit("high")
+    build_scheduler.submit("low", priority=20)
+    build_scheduler.run()
+
+    assert FakeBuildProcess.started == ["low", "high"]
+
+
+def test_same_project_never_built_twice_at_once(config):
+    build_scheduler = BuildScheduler(max_workers=4)
+    for project_name in ["low", "low", "low", "other"]:
+        build_scheduler.submit(project_name)
+    build_scheduler.run()
+
+    assert sorted(FakeBuildProcess.started) == ["low", "low", "low", "other"]
+    assert FakeBuildProcess.overlaps == []
+
+
+def test_failed_build(config):
+    FakeBuildProcess.failing.add("other")
+    build_scheduler = BuildScheduler(max_workers=2)
+    build_scheduler.submit("low")
+    build_scheduler.submit("other")
+    jobs = build_scheduler.run()
+
+    assert [job.finished_with_success for job in jobs] == [True, False]
+
+
+def test_unknown_project(config):
+    with pytest.raises(Exception, match="'missing' not found"):
+        BuildScheduler(max_workers=1).submit("missing")
+
+
+def test_stop_skips_the_queued_jobs(config):
+    build_scheduler = BuildScheduler(max_workers=1)
+    for project_name in ["low", "other", "high"]:
+        build_scheduler.submit(project_name)
+    build_scheduler.stop()
+    jobs = build_scheduler.run()
+
+    assert FakeBuildProcess.started == []
+    assert [job.finished_with_success for job in jobs] == [None, None, None]
+
+
+def test_max_parallel_builds(monkeypatch):
+    monkeypatch.setattr(scheduler.os, "cpu_count", lambda: 16)
+    monkeypatch.setattr(scheduler, "get_available_memory", lambda: 8 * 1024**3)
+
+    assert get_max_parallel_builds(Config(max_parallel_builds=3)) == 3
+    assert get_max_parallel_builds(Config(build_cpus=4, build_memory_mb=1024)) == 4
+    assert get_max_parallel_builds(Config(build_cpus=2, build_memory_mb=4096)) == 2
+    assert get_max_parallel_builds(Config(build_cpus=0, build_memory_mb=0)) == 16
+    assert get_max_parallel_builds(Config(build_memory_mb=16384)) == 1
@@ -0,0 +1,79 @@
+import os
+
+from parallel_build.config import SnapshotMode
+from parallel_build.copier import ParallelCopier
+from parallel_build.snapshot import CopyStrategy, SnapshotCopy, probe_strategies
+
+
+def make_project(path):
+    for name in ("Assets", "Packages", "ProjectSettings", "Assets/Build"):
+        (path / name).mkdir(parents=True)
+    (path / "Assets" / "scene.unity").write_bytes(b"scene")
+    (path / "Assets" / "scene.unity.meta").write_bytes(b"meta")
+    (path / "Assets" / "Build" / "game.exe").write_bytes(b"game")
+    (path / "Packages" / "manifest.json").write_bytes(b"{}")
+    (path / "ProjectSettings" / "ProjectVersion.txt").write_bytes(b"version")
+    return path
+
+
+def snapshot(tmp_path, mode: SnapshotMode, strategies: set[CopyStrategy]):
+    project_path = make_project(tmp_path / "project")
+    snapshot_copy = SnapshotCopy(
+        project_path, mode, strategies, build_path="Assets/Build"
+    )
+    ParallelCopier(copy_function=snapshot_copy).copytree(
+        project_path, tmp_path / "snapshot"
+    )
+    linked = {
+        path.relative_to(project_path).as_posix()
+        for path in project_path.rglob("*")
+        if path.is_file()
+        and os.path.samefile(
+            path, tmp_path / "snapshot" / path.relative_to(project_path)
+        )
+    }
+    return snapshot_copy, linked
+
+
+def test_probe_strategies(tmp_path):
+    strategies = probe_strategies(tmp_path, tmp_path)
+    assert CopyStrategy.copy in strategies
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_link_mode(tmp_path):
+    snapshot_copy, linked = snapshot(
+        tmp_path, SnapshotMode.link, {CopyStrategy.copy, CopyStrategy.hardlink}
+    )
+
+    # only the assets that Unity does not write are shared with the project
+    assert linked == {"Assets/scene.unity"}
+    assert snapshot_copy.report() == (
+        "Snapshot strategies: 1 files hardlinked, 4 files copied"
+    )
+
+
+def test_copy_mode(tmp_path):
+    snapshot_copy, linked = snapshot(
+        tmp_path,
+        SnapshotMode.copy,
+        {CopyStrategy.copy, CopyStrategy.hardlink, CopyStrategy.reflink},
+    )
+
+    assert linked == set()
+    assert not snapshot_copy.avoids_byte_copies
+    assert snapshot_copy.report() == "Snapshot strategies: 5 files copied"
+
+
+def test_copy_replaces_a_hardlink(tmp_path):
+    src = tmp_path / "src.txt"
+    src.write_bytes(b"new")
+    original = tmp_path / "original.txt"
+    original.write_bytes(b"original")
+    dst = tmp_path / "dst.txt"
+    os.link(original, dst)
+
+    SnapshotCopy(tmp_path, SnapshotMode.copy, {CopyStrategy.copy})(src, dst)
+
+    assert dst.read_bytes() == b"new"
+    assert original.read_bytes() == b"original"
@@ -0,0 +1,36 @@
+from parallel_build.build_step import BuildStep
+from parallel_build.source import AdaptiveInterval, GitSource
+
+
+def test_adaptive_interval():
+    interval = AdaptiveInterval(10, 35, jitter=0)
+    assert [interval.next() for _ in range(4)] == [10, 20, 35, 35]
+    interval.reset()
+    assert interval.next() == 10
+
+
+def test_adaptive_interval_jitter():
+    interval = AdaptiveInterval(10, 10, jitter=0.1)
+    assert all(9 <= interval.next() <= 11 for _ in range(100))
+
+
+def test_git_polling_metrics(git_repository, git_commit):
+    metrics = []
+    BuildStep.git_polling_metrics.set(metrics.append)
+    try:
+        with GitSource(
+            "Project", str(git_repository), git_polling_interval=0
+        ) as source:
+            with source.temporary_project() as project_path:
+                assert (project_path / "scene.unity").read_bytes() == b"scene"
+            git_commit(git_repository, "texture.png", b"texture" * 1000)
+            with source.temporary_project() as project_path:
+                assert (project_path / "texture.png").exists()
+    finally:
+        BuildStep.git_polling_metrics.clear()
+
+    assert len(metrics) == 1
+    assert metrics[0].polls == 1
+    assert metrics[0].fetches == 1
+    assert metrics[0].estimated_bytes_fetched > 0
+    assert metrics[0].last_change_latency >= 0
@@ -0,0 +1,84 @@
+import pytest
+
+from parallel_build import trash as trash_module
+from parallel_build.trash import TEMP_DIR_PREFIX, Trash
+from parallel_build.utils import FileLock
+
+
+@pytest.fixture
+def temp_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(trash_module, "TRASH_PATH", tmp_path / "trash")
+    monkeypatch.setattr(trash_module, "PROCESS_LOCKS_PATH", tmp_path / "processes")
+    return tmp_path
+
+
+def make_project(path):
+    (path / "Assets").mkdir(parents=True)
+    (path / "Assets" / "scene.unity").write_bytes(b"scene")
+    (path / "locked.bin").write_bytes(b"locked")
+    return path
+
+
+def trash_contents():
+    return sorted(
+        path.relative_to(trash_module.TRASH_PATH).parts[1:]
+        for path in trash_module.TRASH_PATH.rglob("*")
+    )
+
+
+def test_delete(temp_path):
+    trash = Trash(workers=2)
+    project_path = make_project(temp_path / "project")
+    trash.delete(project_path)
+
+    assert not project_path.exists()
+    trash.close()
+    assert trash_contents() == []
+
+
+def test_failed_deletion_is_left_in_the_trash(temp_path, monkeypatch):
+    remove_path = trash_module.remove_path
+
+    def remove_path_but_locked(path):
+        if path.name == "locked.bin":
+            raise PermissionError("in use")
+        remove_path(path)
+
+    monkeypatch.setattr(trash_module, "remove_path", remove_path_but_locked)
+    trash = Trash(workers=1)
+    trash.delete(make_project(temp_path / "project"))
+    trash.delete(make_project(temp_path / "other"))
+    trash.close()
+
+    # the worker went on with the other entries, and the next process retries
+    assert trash_contents() == [(), (), ("locked.bin",), ("locked.bin",)]
+    monkeypatch.setattr(trash_module, "remove_path", remove_path)
+    trash = Trash(workers=1)
+    trash.start()
+    trash.close()
+    assert trash_contents() == []
+
+
+def test_leftover_temp_dirs(temp_path):
+    dead_path = make_project(temp_path / f"{TEMP_DIR_PREFIX}1000001_abcdefgh")
+    alive_path = make_project(temp_path / f"{TEMP_DIR_PREFIX}1000002_abcdefgh")
+    other_path = make_project(temp_path / "OtherApp_1000001_abcdefgh")
+    trash_module.PROCESS_LOCKS_PATH.mkdir()
+    with FileLock(trash_module.PROCESS_LOCKS_PATH / "1000002.lock"):
+        trash = Trash(workers=1)
+        trash.start()
+        trash.close()
+
+    assert not dead_path.exists()
+    assert alive_path.exists()
+    assert other_path.exists()
+    assert trash_contents() == []
+
+
+def test_own_temp_dirs_are_not_leftovers(temp_path):
+    path = make_project(temp_path / f"{trash_module.PROCESS_TEMP_DIR_PREFIX}abcdefgh")
+    trash = Trash(workers=1)
+    trash.start()
+    trash.close()
+
+    assert path.exists()
@@ -0,0 +1,67 @@
+import msgspec
+
+from parallel_build import unity_timeline
+from parallel_build.unity_log import UnityLogParser
+from parallel_build.unity_timeline import UnityPhaseTimeline
+
+LOG = [
+    "Initialize engine version: 2022.3.10f1",
+    "[Package Manager] Registered 42 packages",
+    "Start importing Assets/Textures/texture.png using Guid(a1b2c3)",
+    "Refreshing native plugins compatible for Editor in 3.00 ms",
+    "UnityEngine.Debug:Log (object)",
+    "[ScriptCompilation] Compiling C# Assets/Scripts/Player.cs",
+    'Compiling shader "Universal Render Pipeline/Lit" pass "ForwardLit"',
+    "[1/2] Compiling WebAssembly (il2cpp) 0.1s",
+    "[2/2] C_WebGL_wasm artifacts/WebGL/build/game.cpp",
+    "Start importing Assets/Textures/other.png using Guid(d4e5f6)",
+    "Brotli compressing Build/WebGL.data",
+    "Build succeeded",
+]
+
+
+def make_timeline(log: list[str]):
+    parser = UnityLogParser()
+    timeline = UnityPhaseTimeline(start_time=1000)
+    new_phases = [
+        timeline.add_line(line, parser.parse(line), 1000 + index)
+        for index, line in enumerate(log)
+    ]
+    timeline.finish(1000 + len(log))
+    return timeline, new_phases
+
+
+def test_phases():
+    timeline, new_phases = make_timeline(LOG)
+
+    assert [(span.phase, span.start - 1000, span.lines) for span in timeline.spans] == [
+        ("startup", 0, 1),
+        ("package_resolution", 1, 1),
+        ("asset_import", 2, 3),
+        ("script_compilation", 5, 1),
+        ("shader_compilation", 6, 1),
+        ("il2cpp", 7, 1),
+        ("bee", 8, 1),
+        ("asset_import", 9, 1),
+        ("compression", 10, 2),
+    ]
+    assert new_phases[:3] == [None, "Package resolution", "Asset import"]
+    assert timeline.durations()[0] == ("asset_import", 4)
+    assert timeline.table().splitlines()[1].startswith("Asset import")
+
+
+def test_chrome_trace(tmp_path, monkeypatch):
+    monkeypatch.setattr(unity_timeline, "TRACES_PATH", tmp_path)
+    timeline, _ = make_timeline(LOG)
+    trace_path = timeline.save_chrome_trace("Project", "WebGL")
+    trace = msgspec.json.decode(trace_path.read_bytes())
+
+    events = trace["traceEvents"]
+    assert events[0]["args"] == {"name": "Project (WebGL)"}
+    phases = [event for event in events if event.get("cat") == "phase"]
+    assert [(event["ts"], event["dur"]) for event in phases[:2]] == [
+        (0, 1_000_000),
+        (1_000_000, 1_000_000),
+    ]
+    markers = [event for event in events if event.get("cat") == "progress"]
+    assert [event["ts"] for event in markers] == [7_000_000, 8_000_000]
@@ -0,0 +1,81 @@
+import shutil
+
+import pytest
+
+from parallel_build import workspace
+from parallel_build.build_step import BuildStep
+from parallel_build.disk_budget import disk_budget
+from parallel_build.trash import PROCESS_TEMP_DIR_PREFIX
+from parallel_build.workspace import WorkspaceRoot
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def ram_disk_path(tmp_path, monkeypatch):
+    path = tmp_path / "ram_disk"
+    path.mkdir()
+    monkeypatch.setattr(workspace, "get_available_memory", lambda: 1000 * MB)
+    monkeypatch.setattr(
+        shutil, "disk_usage", lambda path: shutil._ntuple_diskusage(0, 0, 500 * MB)
+    )
+    monkeypatch.setattr(disk_budget, "min_free", 100 * MB)
+    monkeypatch.setattr(
+        disk_budget, "size_estimate", {"Project/WebGL/build": 50 * MB}.get
+    )
+    return path
+
+
+@pytest.fixture
+def messages():
+    messages = []
+    BuildStep.short_message.set(messages.append)
+    yield messages
+    BuildStep.short_message.clear()
+
+
+def test_disk_path(tmp_path):
+    root = WorkspaceRoot(path=str(tmp_path / "workspaces"))
+    temp_path = root.mkdtemp()
+    assert temp_path.startswith(str(tmp_path / "workspaces" / PROCESS_TEMP_DIR_PREFIX))
+
+
+def test_ram_disk(tmp_path, ram_disk_path, messages):
+    root = WorkspaceRoot(
+        path=str(tmp_path),
+        ram_disk=True,
+        ram_disk_path=str(ram_disk_path),
+        build_memory_mb=200,
+        size_estimate_keys=["Project/WebGL/build"],
+    )
+    assert root.get_path(300 * MB) == ram_disk_path
+    assert root.is_in_ram(ram_disk_path / "Project")
+    assert root.get_path(None) == tmp_path
+    assert messages[-1] == "Project size unknown yet, building on the disk"
+
+
+def test_ram_disk_shortage(tmp_path, ram_disk_path, messages):
+    root = WorkspaceRoot(
+        path=str(tmp_path),
+        ram_disk=True,
+        ram_disk_path=str(ram_disk_path),
+        copies=2,
+        size_estimate_keys=["Project/WebGL/build"],
+    )
+    assert root.ram_disk_shortage(100 * MB) is None
+    # 2 copies of the snapshot and the build do not fit, leaving 100 MB free
+    assert root.get_path(200 * MB) == tmp_path
+    assert "450.00 MB needed, 400.00 MB free" in messages[-1]
+
+    root.build_memory = 400 * MB
+    assert root.ram_disk_shortage(100 * MB) == (
+        "about 1.03 GB needed with the Unity instances, 1000.00 MB available"
+    )
+
+
+def test_missing_ram_disk(tmp_path, messages):
+    root = WorkspaceRoot(
+        path=str(tmp_path), ram_disk=True, ram_disk_path=str(tmp_path / "missing")
+    )
+    assert root.get_path(MB) == tmp_path
+    assert messages[-1] == "No RAM disk found, building on the disk"